@@ -1,16 +1,13 @@
-from minizinc import Model, Solver, Instance, Status
+from minizinc import Status
+from CP.fzn_cache import solve_model, cp_results
 import time
 from datetime import timedelta
 from pathlib import Path
 
 def tournament_CP_scheduler(n):
     model_path = Path(__file__).parent / "basic_gecode.mzn"
-    model = Model(str(model_path.resolve()))    
-    solver = Solver.lookup("gecode")
-    instance = Instance(solver, model)
-    instance["n"] = n
     start = time.time()
-    result = instance.solve(timeout=timedelta(seconds=300))
+    result = solve_model(model_path.resolve(), "gecode", n, timeout=timedelta(seconds=300))
     elapsed = int(time.time()-start)
     if result.status.has_solution():
         schedule = []
@@ -28,16 +25,16 @@ def tournament_CP_scheduler(n):
         obj_val = None
         if result.status == Status.SATISFIED:
             #print("Feasible solution found:")
-            return {"time":elapsed, "optimal":True, "obj":obj_val, "sol":schedule}
+            return cp_results(result, elapsed, True, obj_val, schedule)
         elif result.status == Status.OPTIMAL_SOLUTION:
             #print("Optimal solution found:")
-            return {"time":elapsed, "optimal":True, "obj":obj_val, "sol":schedule}
+            return cp_results(result, elapsed, True, obj_val, schedule)
     if result.status == Status.UNSATISFIABLE:
         #print("The problem is unsat.")
-        return {"time":elapsed, "optimal":True, "obj":None, "sol":[]}
+        return cp_results(result, elapsed, True)
     else: #solver timed out
         #print("The solver has timed out without finding a feasible solution.")
-        return {"time":300, "optimal":False, "obj":None, "sol":[]}
+        return cp_results(result, 300, False)
 
 
 if __name__=="__main__":
@@ -0,0 +1,41 @@
+from minizinc import Status
+from CP.fzn_cache import solve_model, cp_results
+import time
+from datetime import timedelta
+from pathlib import Path
+
+def tournament_CP_scheduler(n):
+    model_path = Path(__file__).parent / "channeled_gecode.mzn"
+    start = time.time()
+    result = solve_model(model_path.resolve(), "gecode", n, timeout=timedelta(seconds=300))
+    elapsed = int(time.time()-start)
+    if result.status.has_solution():
+        schedule = []
+        weeks = n -1
+        periods = n//2
+        tHome = result["tHome"]
+        tAway = result["tAway"]
+        for i in range(periods):
+            period_list = []
+            for j in range(weeks):
+                home_team = int(tHome[i][j])
+                away_team = int(tAway[i][j])
+                period_list.append([home_team, away_team])
+            schedule.append(period_list)
+        obj_val = None
+        if result.status == Status.SATISFIED:
+            #print("Feasible solution found:")
+            return cp_results(result, elapsed, True, obj_val, schedule)
+        elif result.status == Status.OPTIMAL_SOLUTION:
+            #print("Optimal solution found:")
+            return cp_results(result, elapsed, True, obj_val, schedule)
+    if result.status == Status.UNSATISFIABLE:
+        #print("The problem is unsat.")
+        return cp_results(result, elapsed, True)
+    else: #solver timed out
+        #print("The solver has timed out without finding a feasible solution.")
+        return cp_results(result, 300, False)
+
+if __name__=="__main__":
+    n = int(input())
+    results = tournament_CP_scheduler(n)
\ No newline at end of file
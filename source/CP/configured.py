@@ -0,0 +1,49 @@
+import os
+import time
+from datetime import timedelta
+from pathlib import Path
+from minizinc import Status
+from CP.fzn_cache import solve_model, cp_results
+
+# Configurable runs of the CP models: number of processes (Gecode parallel search), free search (Chuffed),
+# random seed and flattening optimisation level. The defaults can be set from the environment
+# (CP_PROCESSES, CP_RANDOM_SEED, CP_OPTIMISATION_LEVEL), so the registered keys can be run with different
+# configurations without changing the code; the configuration used is recorded in the results under "config".
+# The parallel and free-search keys have no valid_teams.json entry until their sizes are measured with discover.py
+# against a MiniZinc install.
+
+
+def _env_int(name):
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+# Processes used by the parallel keys: CP_PROCESSES, or all the cores of the machine
+def default_processes():
+    return _env_int("CP_PROCESSES") or os.cpu_count()
+
+def configured_scheduler(n, model_file, solver, processes=None, free_search=False, random_seed=None,
+                         optimisation_level=None):
+    random_seed = random_seed if random_seed is not None else _env_int("CP_RANDOM_SEED")
+    optimisation_level = optimisation_level if optimisation_level is not None else _env_int("CP_OPTIMISATION_LEVEL")
+    config = {"solver": solver, "processes": processes or 1, "free_search": free_search,
+              "random_seed": random_seed, "optimisation_level": optimisation_level}
+
+    model_path = Path(__file__).parent / model_file
+    start = time.time()
+    result = solve_model(model_path.resolve(), solver, n, timeout=timedelta(seconds=300), processes=processes,
+                         free_search=free_search, random_seed=random_seed, optimisation_level=optimisation_level)
+    elapsed = int(time.time()-start)
+    if result.status.has_solution():
+        weeks = n-1
+        periods = n//2
+        schedule = [[[int(result["tHome"][i][j]), int(result["tAway"][i][j])] for j in range(weeks)]
+                    for i in range(periods)]
+        obj_val = int(result["totDistance"]) if "totDistance" in result.solution else None
+        if obj_val is not None and result.status == Status.SATISFIED:
+            # optimization model stopped by the time limit before proving optimality
+            return cp_results(result, 300, False, obj_val, schedule, config=config)
+        return cp_results(result, elapsed, True, obj_val, schedule, config=config)
+    if result.status == Status.UNSATISFIABLE:
+        return cp_results(result, elapsed, True, config=config)
+    #solver timed out
+    return cp_results(result, 300, False, config=config)
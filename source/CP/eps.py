@@ -0,0 +1,227 @@
+import re
+import time
+import tempfile
+import threading
+import subprocess
+from itertools import permutations
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from minizinc import Status
+from utils import trace
+from utils import incumbent_bus
+from utils import bounds
+from CP.fzn_cache import MINIZINC, flatten, parse_flatzinc_output, parse_statistics, solver_flags, objective, \
+    bound_constraint, add_constraints
+from CP.configured import default_processes
+
+# Embarrassingly parallel search (EPS) for the MiniZinc models.
+# The model is flattened once (through the FlatZinc cache), then split into many subproblems by fixing the first
+# entries of tHome/tAway that the flattening left unfixed (week 1 is already fixed by the symbreak models): week by
+# week and period by period, every choice of a home and an away team not yet playing in that week gives one
+# subproblem, until there are at least SUBPROBLEMS_PER_WORKER per worker. Only the choices allowed by the symmetry
+# breaking of the model are enumerated (home < away, or home columns in lexicographic order from week 2 on), so
+# no subproblem is refuted by it right away. Each subproblem is the cached FlatZinc with a few int_eq constraints
+# added, so it is not flattened again.
+# The subproblems are solved by a pool of concurrent minizinc processes sharing the deadline of the whole run:
+#  - satisfaction models stop every worker on the first solution, and are unsatisfiable once every subproblem is;
+#  - optimization models share the best totDistance found so far (by the workers, or published on the incumbent
+#    bus by other running models, see utils/incumbent_bus.py): every subproblem started after it is constrained to
+#    improve on it, and the best solution is optimal once every subproblem is solved or refuted, or as soon as it
+#    reaches the lower bound of the objective (utils/bounds.py), which stops every worker.
+# The _eps model keys have no entry in valid_teams.json until their sizes are measured against a MiniZinc install
+# (python discover.py local_symbreak_gecode_eps global_symbreak_opt_gecode_eps).
+
+SUBPROBLEMS_PER_WORKER = 30
+
+
+# FlatZinc names of the entries of the output arrays tHome and tAway ([period][week]; fixed entries are integers)
+def output_arrays(fzn_text):
+    arrays = {}
+    for name, weeks_range, elements in re.findall(r"^array \[[^\]]*\] of var int: (tHome|tAway)\s*::\s*"
+                                                  r"output_array\(\[[^,\]]*,([^\]]*)\]\)\s*=\s*\[(.*)\];$",
+                                                  fzn_text, re.M):
+        lo, hi = weeks_range.split("..")
+        weeks = int(hi)-int(lo)+1
+        values = [int(v) if re.fullmatch(r"-?\d+", v) else v for v in (v.strip() for v in elements.split(","))]
+        arrays[name] = [values[i:i+weeks] for i in range(0, len(values), weeks)]
+    return arrays
+
+# Subproblems as lists of (FlatZinc variable, value) assignments: the first unfixed (period, week) entries, in week
+# order, get a home and an away team not yet playing in that week, until there are at least target subproblems.
+# home_below_away and week_lex restrict the choices to the ones the model allows: tHome < tAway, and each home
+# column from week 3 on lexicographically not smaller than the previous one (while the periods above are equal,
+# the home team is at least the one of the previous week)
+def split(n, arrays, target, home_below_away=False, week_lex=False):
+    home, away = arrays["tHome"], arrays["tAway"]
+    free = [(i, j) for j in range(n-1) for i in range(n//2)
+            if isinstance(home[i][j], str) and isinstance(away[i][j], str)]
+    # (assignments, {week: teams playing in the fixed entries}, {(period, week): home team assigned here})
+    subproblems = [([], {}, {})]
+    for i, j in free:
+        if len(subproblems) >= target:
+            break
+        extended = []
+        for assignments, busy, homes in subproblems:
+            playing = busy[j] if j in busy else {team for p in range(n//2) for team in (home[p][j], away[p][j])
+                                                  if isinstance(team, int)}
+            lowest = 1
+            if week_lex and j >= 2:
+                value = lambda p, w: home[p][w] if isinstance(home[p][w], int) else homes.get((p, w))
+                if value(i, j-1) is not None and all(value(p, j) is not None and value(p, j) == value(p, j-1)
+                                                     for p in range(i)):
+                    lowest = value(i, j-1)
+            for h, a in permutations(range(1, n+1), 2):
+                if h < lowest or (home_below_away and h > a):
+                    continue
+                if h not in playing and a not in playing:
+                    extended.append((assignments + [(home[i][j], h), (away[i][j], a)], {**busy, j: playing | {h, a}},
+                                     {**homes, (i, j): h}))
+        subproblems = extended
+    return [assignments for assignments, _, _ in subproblems]
+
+# FlatZinc of a subproblem: the assignments and the bound (objective, value) on the objective
+def subproblem_fzn(fzn_text, assignments, bound=None):
+    constraints = [f"constraint int_eq({var}, {value});" for var, value in assignments]
+    if bound is not None:
+        constraints.append(bound_constraint(*bound))
+    return add_constraints(fzn_text, constraints)
+
+
+def _schedule(solution):
+    return [[[int(h), int(a)] for h, a in zip(home, away)] for home, away in zip(solution["tHome"], solution["tAway"])]
+
+
+class _Search:
+    def __init__(self, n, fzn_text, solver, flags, deadline):
+        self.n = n
+        self.fzn_text = fzn_text
+        self.solver = solver
+        self.flags = flags
+        self.deadline = deadline
+        self.objective = objective(fzn_text)
+        self.lock = threading.Lock()
+        self.running = set()
+        self.stopped = False
+        self.best = None # (objective value, schedule)
+        self.from_bus = None # model that published best on the incumbent bus, None if found here
+        self.proven = False # best reached the lower bound
+        self.incomplete = 0
+        self.statistics = {}
+
+    def stop(self):
+        with self.lock:
+            self.stopped = True
+            for process in self.running:
+                process.kill()
+
+    def solve(self, assignments, folder, index):
+        with self.lock:
+            if self.stopped:
+                return
+            if self.objective and self.objective[0] == "minimize":
+                # a better schedule published on the incumbent bus by another running model is adopted
+                shared = incumbent_bus.better_bound(self.n, "totDistance", self.best[0] if self.best else None)
+                if shared is not None:
+                    value, schedule, self.from_bus = shared
+                    self.best = (value, schedule)
+                    self.proven = bounds.reached(self.n, value)
+            bound = (self.objective, self.best[0]) if self.objective and self.best else None
+        if self.proven:
+            self.stop()
+            return
+        path = Path(folder) / f"sub{index}.fzn"
+        path.write_text(subproblem_fzn(self.fzn_text, assignments, bound))
+        remaining = self.deadline-time.time()
+        if remaining < 1:
+            with self.lock:
+                self.incomplete += 1
+            return
+        process = subprocess.Popen([MINIZINC, "--solver", self.solver, "--time-limit", str(int(remaining*1000)),
+                                    "--statistics"] + self.flags + [str(path)],
+                                   stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        with self.lock:
+            self.running.add(process)
+            if self.stopped:
+                process.kill()
+        try:
+            output, _ = process.communicate(timeout=remaining+30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            output, _ = process.communicate()
+        with self.lock:
+            self.running.discard(process)
+            if self.stopped:
+                return
+            status, solution = parse_flatzinc_output(output, self.objective is not None)
+            for key, value in parse_statistics(output).items():
+                self.statistics[key] = self.statistics.get(key, 0) + value
+            if status not in (Status.UNSATISFIABLE, Status.OPTIMAL_SOLUTION) and \
+               not (status == Status.SATISFIED and self.objective is None):
+                self.incomplete += 1
+            if solution is None:
+                return
+            if self.objective is None:
+                self.best = (None, _schedule(solution))
+            else:
+                value = solution["totDistance"]
+                improves = self.best is None or \
+                    (value < self.best[0] if self.objective[0] == "minimize" else value > self.best[0])
+                if improves:
+                    self.best = (value, _schedule(solution))
+                    self.from_bus = None
+                    incumbent_bus.publish(self.n, self.best[1], "CP")
+                    self.proven = self.objective[0] == "minimize" and bounds.reached(self.n, value)
+        if self.objective is None or self.proven:
+            # first solution of a satisfaction model, or optimal one: the other workers are not needed anymore
+            self.stop()
+
+
+# home_below_away and week_lex: symmetry breaking of the model, see split
+def eps_scheduler(n, model_file, solver, workers=None, timeout=timedelta(seconds=300), random_seed=None,
+                  home_below_away=False, week_lex=False):
+    workers = workers or default_processes()
+    config = {"solver": solver, "processes": workers, "eps": True, "random_seed": random_seed}
+    model_path = (Path(__file__).parent / model_file).resolve()
+    start = time.time()
+    deadline = start+timeout.total_seconds()
+
+    with trace.span("flatten"):
+        fzn_path, flatten_time = flatten(model_path, solver, n)
+    fzn_text = fzn_path.read_text()
+    subproblems = split(n, output_arrays(fzn_text), SUBPROBLEMS_PER_WORKER*workers, home_below_away, week_lex)
+    config["subproblems"] = len(subproblems)
+    trace.counts({"subproblems": len(subproblems), "workers": workers})
+
+    trace.phase("solve")
+    search = _Search(n, fzn_text, solver, solver_flags(random_seed=random_seed), deadline)
+    solve_start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as folder:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(search.solve, assignments, folder, index)
+                       for index, assignments in enumerate(subproblems)]
+        for future in futures:
+            future.result()
+    solve_time = round(time.perf_counter()-solve_start, 3)
+    elapsed = int(time.time()-start)
+    trace.counts(search.statistics)
+    trace.phase("decode")
+
+    if search.best is not None:
+        value, schedule = search.best
+        # a satisfaction model is solved by any solution; an optimization one once every subproblem is closed or
+        # the lower bound is reached
+        optimal = search.objective is None or search.incomplete == 0 or search.proven
+        results = {"time":elapsed if optimal else 300, "optimal":optimal, "obj":value, "sol":schedule,
+                   "flatten_time":round(flatten_time, 3), "solve_time":solve_time, "config":config}
+        if search.from_bus is not None:
+            # the schedule is the one published on the incumbent bus by another model
+            results["from_bus"] = search.from_bus
+        return results
+    if search.incomplete == 0:
+        # every subproblem refuted
+        return {"time":elapsed, "optimal":True, "obj":None, "sol":[], "flatten_time":round(flatten_time, 3),
+                "solve_time":solve_time, "config":config}
+    #solver timed out
+    return {"time":300, "optimal":False, "obj":None, "sol":[], "flatten_time":round(flatten_time, 3),
+            "solve_time":solve_time, "config":config}
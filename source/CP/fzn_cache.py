@@ -0,0 +1,277 @@
+import os
+import re
+import time
+import hashlib
+import tempfile
+import threading
+import subprocess
+from functools import lru_cache
+from datetime import timedelta
+from pathlib import Path
+from minizinc import Model, Solver, Instance, Method, Status
+from utils import trace
+from utils import incumbent_bus
+
+# Compilation cache for the MiniZinc models.
+# Flattening a .mzn to FlatZinc is done once per (model file hash, solver, n, MiniZinc version): the .fzn file is
+# stored in the cache folder and the solver is then run on the cached FlatZinc directly, so the flattening time is
+# only paid on the first run and is reported separately from the solving time. The solver output is parsed from
+# the FlatZinc variables themselves, so no .ozn is generated.
+# The cached path has not been run against a MiniZinc install yet, so it is opt-in (CP_FZN_CACHE=1): by default
+# solve_model solves the model with the minizinc Python API, as the CP wrappers did before the cache existed.
+
+CACHE_DIR = Path(os.environ.get("FZN_CACHE_DIR", Path(__file__).resolve().parent.parent.parent / ".fzn_cache"))
+MINIZINC = os.environ.get("MINIZINC", "minizinc")
+USE_CACHE = os.environ.get("CP_FZN_CACHE") == "1"
+
+
+# Solution of a CP run, with the same interface used by the CP wrappers on minizinc.Result
+class CachedResult:
+    def __init__(self, status, solution, flatten_time, solve_time, cached, statistics=None):
+        self.status = status
+        self.solution = solution
+        self.flatten_time = flatten_time
+        self.solve_time = solve_time
+        self.cached = cached
+        self.statistics = statistics or {}
+
+    def __getitem__(self, key):
+        return self.solution[key]
+
+# Result dict of a CP wrapper, with the flattening and solving times of the run
+def cp_results(result, time, optimal, obj=None, sol=None, **extra):
+    return {"time":time, "optimal":optimal, "obj":obj, "sol":sol if sol is not None else [],
+            "flatten_time":result.flatten_time, "solve_time":result.solve_time, **extra}
+
+
+# Queried once per process: it is part of every cache key
+@lru_cache(maxsize=None)
+def _minizinc_version():
+    return subprocess.run([MINIZINC, "--version"], capture_output=True, text=True, check=True).stdout.strip()
+
+# Path of the cached .fzn file of a model for a solver, a number of teams and an optimisation level
+def cache_path(model_path, solver, n, optimisation_level=None):
+    model_path = Path(model_path)
+    digest = hashlib.sha256()
+    digest.update(model_path.read_bytes())
+    digest.update(f"{solver}|{n}|{optimisation_level}|{_minizinc_version()}".encode())
+    level = "" if optimisation_level is None else f"-O{optimisation_level}"
+    return CACHE_DIR / f"{model_path.stem}-{solver}-n{n}{level}-{digest.hexdigest()[:16]}.fzn"
+
+# Flatten the model if it is not cached yet; returns the .fzn path and the flattening time (0 on a hit)
+def flatten(model_path, solver, n, optimisation_level=None):
+    fzn_path = cache_path(model_path, solver, n, optimisation_level)
+    if fzn_path.exists():
+        return fzn_path, 0.0
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # write to a temporary name first, so that an interrupted compilation never leaves a partial cache entry
+    tmp_fzn = fzn_path.with_suffix(f".fzn.{os.getpid()}")
+    command = [MINIZINC, "--solver", solver, "-c", str(model_path), "-D", f"n={n};",
+               "--fzn", str(tmp_fzn), "--no-output-ozn"]
+    if optimisation_level is not None:
+        command.append(f"-O{optimisation_level}")
+    start = time.perf_counter()
+    subprocess.run(command, capture_output=True, text=True, check=True)
+    flatten_time = time.perf_counter()-start
+    os.replace(tmp_fzn, fzn_path)
+    return fzn_path, flatten_time
+
+
+# Parse one FlatZinc output value: integers, Booleans and arrayNd(ranges..., [values])
+def _parse_value(text):
+    text = text.strip()
+    array = re.match(r"array(\d)d\((.*)\)$", text, re.S)
+    if array:
+        dims = int(array.group(1))
+        ranges = re.findall(r"(-?\d+)\.\.(-?\d+)", array.group(2))[:dims]
+        values = [_parse_value(v) for v in re.search(r"\[(.*)\]", array.group(2), re.S).group(1).split(",") if v.strip()]
+        for lo, hi in reversed(ranges[1:]):
+            size = int(hi)-int(lo)+1
+            values = [values[i:i+size] for i in range(0, len(values), size)]
+        return values
+    if text.startswith("["):
+        return [_parse_value(v) for v in text[1:-1].split(",") if v.strip()]
+    if text in ("true", "false"):
+        return text == "true"
+    return int(text)
+
+# Number of variables and constraints of a FlatZinc file
+def flatzinc_size(fzn_path):
+    variables = constraints = 0
+    with open(fzn_path, "r") as f:
+        for line in f:
+            if line.startswith("var ") or (line.startswith("array") and " of var " in line):
+                variables += 1
+            elif line.startswith("constraint "):
+                constraints += 1
+    return variables, constraints
+
+# Numeric solver statistics printed with --statistics ("%%%mzn-stat: nodes=1234")
+def parse_statistics(output):
+    statistics = {}
+    for key, value in re.findall(r"^%%%mzn-stat:\s*(\w+)=(-?[\d.]+)\s*$", output, re.M):
+        statistics[key] = float(value) if "." in value else int(value)
+    return statistics
+
+# Parse the solution stream of a FlatZinc solver: the last complete solution and the final status
+def parse_flatzinc_output(output, optimization):
+    solution = None
+    current = {}
+    complete = False
+    for line in output.splitlines():
+        line = line.strip()
+        if line == "----------":
+            solution = current
+            current = {}
+        elif line == "==========":
+            complete = True
+        elif line == "=====UNSATISFIABLE=====":
+            return Status.UNSATISFIABLE, None
+        elif line == "=====ERROR=====":
+            return Status.ERROR, None
+        else:
+            assignment = re.match(r"^(\w+)\s*=\s*(.*);$", line)
+            if assignment:
+                current[assignment.group(1)] = _parse_value(assignment.group(2))
+    if solution is None:
+        return Status.UNKNOWN, None
+    if optimization and complete:
+        return Status.OPTIMAL_SOLUTION, solution
+    return Status.SATISFIED, solution
+
+
+# Objective of an optimization FlatZinc as ("minimize" or "maximize", variable), None for satisfaction
+def objective(fzn_text):
+    match = re.search(r"^solve\b.*\b(minimize|maximize)\s+(\w+)\s*;", fzn_text, re.M)
+    return (match.group(1), match.group(2)) if match else None
+
+# FlatZinc constraint bounding the objective by value: strictly better, or at least as good
+def bound_constraint(objective, value, strict=True):
+    sense, var = objective
+    if sense == "minimize":
+        return f"constraint int_lt({var}, {value});" if strict else f"constraint int_le({var}, {value});"
+    return f"constraint int_lt({value}, {var});" if strict else f"constraint int_le({value}, {var});"
+
+# FlatZinc with constraints added before the solve item
+def add_constraints(fzn_text, constraints):
+    solve = re.search(r"^solve\b", fzn_text, re.M).start()
+    return fzn_text[:solve] + "\n".join(constraints) + "\n" + fzn_text[solve:]
+
+# Run a FlatZinc solver command and return its output; on_solution is called with every solution as soon as it is
+# printed. The process is killed after timeout seconds (killed is then True)
+def run_streaming(command, timeout, on_solution=None):
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    expired = threading.Event()
+    def kill():
+        expired.set()
+        process.kill()
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+    lines = []
+    block = []
+    for line in process.stdout:
+        lines.append(line)
+        block.append(line)
+        if line.strip() == "----------":
+            if on_solution is not None:
+                on_solution(parse_flatzinc_output("".join(block), False)[1])
+            block = []
+    process.wait()
+    timer.cancel()
+    return "".join(lines), expired.is_set()
+
+# Solver options of a run: processes (parallel search, Gecode), free_search (Chuffed alternates between the model's
+# search annotation and its own activity-based search), random_seed, and the optimisation_level of the flattening
+def solver_flags(processes=None, free_search=False, random_seed=None):
+    flags = []
+    if processes is not None:
+        flags += ["-p", str(processes)]
+    if free_search:
+        flags.append("-f")
+    if random_seed is not None:
+        flags += ["-r", str(random_seed)]
+    return flags
+
+# Flatten (or reuse the cached FlatZinc of) a model and solve it with the given solver
+def solve_cached(model_path, solver, n, timeout=timedelta(seconds=300), processes=None, free_search=False,
+                 random_seed=None, optimisation_level=None):
+    with trace.span("flatten"):
+        fzn_path, flatten_time = flatten(model_path, solver, n, optimisation_level)
+    variables, constraints = flatzinc_size(fzn_path)
+    trace.counts({"vars": variables, "constraints": constraints, "cached": int(flatten_time == 0.0)})
+    with open(fzn_path, "r") as f:
+        fzn_text = f.read()
+    optimization = objective(fzn_text)
+    remaining = max(timeout.total_seconds()-flatten_time, 1)
+
+    # Incumbent bus (utils/incumbent_bus.py): the objective is bounded by the best total distance published by the
+    # other running models, and every solution found is published as soon as the solver prints it
+    shared = incumbent_bus.best(n, "totDistance") if optimization else None
+    run_path = fzn_path
+    if shared is not None:
+        fd, name = tempfile.mkstemp(suffix=".fzn")
+        os.close(fd)
+        run_path = Path(name)
+        run_path.write_text(add_constraints(fzn_text, [bound_constraint(optimization, shared[0], strict=False)]))
+    def publish(solution):
+        if optimization and "tHome" in solution and "tAway" in solution:
+            incumbent_bus.publish(n, [[[int(h), int(a)] for h, a in zip(home, away)]
+                                      for home, away in zip(solution["tHome"], solution["tAway"])], "CP")
+
+    start = time.perf_counter()
+    try:
+        trace.phase("solve")
+        output, killed = run_streaming([MINIZINC, "--solver", solver, "--time-limit", str(int(remaining*1000)),
+                                        "--statistics"] + solver_flags(processes, free_search, random_seed) +
+                                       [str(run_path)], remaining+30, publish if incumbent_bus.enabled() else None)
+    finally:
+        if run_path != fzn_path:
+            run_path.unlink()
+    trace.phase("decode")
+    status, solution = parse_flatzinc_output(output, optimization is not None and not killed)
+    solve_time = time.perf_counter()-start
+    statistics = parse_statistics(output)
+    trace.counts(statistics)
+    return CachedResult(status, solution, round(flatten_time, 3), round(solve_time, 3), cached=flatten_time == 0.0,
+                        statistics=statistics)
+
+# Seconds of a minizinc statistics entry (a timedelta, or a number of milliseconds), None if it is not reported
+def _seconds(value):
+    if value is None:
+        return None
+    return round(value.total_seconds() if isinstance(value, timedelta) else value/1000, 3)
+
+# Solve a model with the minizinc Python API (flattening included in every run); the objective is bounded by the
+# best total distance published on the incumbent bus, and the final solution is published
+def solve_api(model_path, solver, n, timeout=timedelta(seconds=300), processes=None, free_search=False,
+              random_seed=None, optimisation_level=None):
+    instance = Instance(Solver.lookup(solver), Model(str(model_path)))
+    instance["n"] = n
+    optimization = instance.method != Method.SATISFY
+    shared = incumbent_bus.best(n, "totDistance") if optimization else None
+    if shared is not None:
+        instance.add_string(f"constraint totDistance <= {shared[0]};")
+    start = time.perf_counter()
+    trace.phase("solve")
+    result = instance.solve(timeout=timeout, processes=processes, free_search=free_search, random_seed=random_seed,
+                            optimisation_level=optimisation_level)
+    solve_time = time.perf_counter()-start
+    trace.phase("decode")
+    solution = None
+    if result.status.has_solution():
+        solution = {"tHome": result["tHome"], "tAway": result["tAway"]}
+        if optimization:
+            solution["totDistance"] = result["totDistance"]
+            incumbent_bus.publish(n, [[[int(h), int(a)] for h, a in zip(home, away)]
+                                      for home, away in zip(solution["tHome"], solution["tAway"])], "CP")
+    flatten_time = _seconds(result.statistics.get("flatTime"))
+    if flatten_time is not None:
+        solve_time -= flatten_time
+    return CachedResult(result.status, solution, flatten_time, round(solve_time, 3), cached=False,
+                        statistics=result.statistics)
+
+# Solve a model through the FlatZinc cache if CP_FZN_CACHE=1, else with the minizinc Python API
+def solve_model(model_path, solver, n, timeout=timedelta(seconds=300), **options):
+    if USE_CACHE:
+        return solve_cached(model_path, solver, n, timeout, **options)
+    return solve_api(model_path, solver, n, timeout, **options)
@@ -0,0 +1,10 @@
+from CP.configured import configured_scheduler
+
+# global_symbreak_opt_chuffed.mzn with Chuffed free search (alternating the model's search strategy and activity-based search)
+def tournament_CP_scheduler(n, random_seed=None, optimisation_level=None):
+    return configured_scheduler(n, "global_symbreak_opt_chuffed.mzn", "chuffed", free_search=True,
+                                random_seed=random_seed, optimisation_level=optimisation_level)
+
+if __name__=="__main__":
+    n = int(input())
+    results = tournament_CP_scheduler(n)
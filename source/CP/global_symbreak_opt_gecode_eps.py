@@ -0,0 +1,10 @@
+from CP.eps import eps_scheduler
+
+# global_symbreak_opt_gecode.mzn with embarrassingly parallel search on default_processes() concurrent Gecode runs
+def tournament_CP_scheduler(n, workers=None, random_seed=None):
+    return eps_scheduler(n, "global_symbreak_opt_gecode.mzn", "gecode", workers=workers, random_seed=random_seed,
+                         week_lex=True)
+
+if __name__=="__main__":
+    n = int(input())
+    results = tournament_CP_scheduler(n)
@@ -0,0 +1,10 @@
+from CP.configured import configured_scheduler, default_processes
+
+# global_symbreak_opt_gecode.mzn with Gecode parallel search on default_processes() cores
+def tournament_CP_scheduler(n, processes=None, random_seed=None, optimisation_level=None):
+    return configured_scheduler(n, "global_symbreak_opt_gecode.mzn", "gecode", processes=processes or default_processes(),
+                                random_seed=random_seed, optimisation_level=optimisation_level)
+
+if __name__=="__main__":
+    n = int(input())
+    results = tournament_CP_scheduler(n)
@@ -0,0 +1,10 @@
+from CP.local_symbreak_gecode import tournament_CP_scheduler as feasibility_scheduler
+from utils.orientation import balanced_result
+
+# Optimization model: solve local_symbreak_gecode, then re-orient the matches to an optimal home/away balance (totDistance = n)
+def tournament_CP_scheduler(n):
+    return balanced_result(feasibility_scheduler(n))
+
+if __name__=="__main__":
+    n = int(input())
+    results = tournament_CP_scheduler(n)
@@ -0,0 +1,162 @@
+import time
+import random
+from datetime import timedelta
+from pathlib import Path
+
+from utils.schedule import total_distance, is_valid_schedule
+from utils import trace
+from utils import bounds
+
+# Large neighbourhood search for the fairness objective (sum over the teams of |home games - away games|).
+# Starting from a feasible schedule, a subset of weeks or periods is freed while every other slot keeps its
+# current match, and the neighbourhood is re-optimized by an existing model with the constraint that the objective
+# must strictly improve. The size of the neighbourhood grows when a neighbourhood is proven to have no better
+# schedule and shrinks when its sub-problem times out.
+
+# Each team plays n-1 games, which is odd, so |home - away| >= 1 for every team and the objective is at least n
+def objective_lower_bound(n):
+    return bounds.lower_bound(n)
+
+# Bring a schedule to the form required by the symmetry breaking of global_symbreak_opt_*.mzn:
+# week 1 plays (i, i+periods) in period i and the weeks 2.. are sorted lexicographically by home teams.
+# Relabeling teams and reordering weeks does not change the objective.
+def symbreak_form(sol):
+    periods = len(sol)
+    weeks = len(sol[0])
+    label = {}
+    for p in range(periods):
+        h, a = sol[p][0]
+        label[h] = p+1
+        label[a] = p+1+periods
+    columns = [[[label[sol[p][w][0]], label[sol[p][w][1]]] for p in range(periods)] for w in range(1, weeks)]
+    columns.sort(key=lambda column: [match[0] for match in column])
+    columns = [[[p+1, p+1+periods] for p in range(periods)]] + columns
+    return [[columns[w][p] for w in range(weeks)] for p in range(periods)]
+
+# Set of (period, week) slots freed by a neighbourhood of the given kind and size
+def choose_neighbourhood(rng, sol, kind, size, frozen_weeks=()):
+    periods = len(sol)
+    weeks = len(sol[0])
+    if kind == "weeks":
+        candidates = [w for w in range(weeks) if w not in frozen_weeks]
+        chosen = rng.sample(candidates, min(size, len(candidates)))
+        return {(p, w) for p in range(periods) for w in chosen}
+    chosen = rng.sample(range(periods), min(size, periods))
+    return {(p, w) for p in chosen for w in range(weeks) if w not in frozen_weeks}
+
+
+# Re-optimize a neighbourhood with one of the MiniZinc optimization models
+class MiniZincNeighbourhood:
+    def __init__(self, n, model_file, solver_name):
+        from minizinc import Model, Solver, Instance
+        model_path = Path(__file__).resolve().parent.parent / "CP" / model_file
+        self.instance = Instance(Solver.lookup(solver_name), Model(str(model_path)))
+        self.instance["n"] = n
+        # the first week is fixed by the symmetry breaking of the model
+        self.frozen_weeks = (0,)
+
+    def prepare(self, sol):
+        return symbreak_form(sol)
+
+    def improve(self, sol, free, bound, timeout):
+        from minizinc import Status
+        fixed = [f"tHome[{p+1},{w+1}] = {h} /\\ tAway[{p+1},{w+1}] = {a}"
+                 for p, row in enumerate(sol) for w, (h, a) in enumerate(row) if (p, w) not in free]
+        with self.instance.branch() as child:
+            if fixed:
+                child.add_string("constraint " + " /\\ ".join(fixed) + ";\n")
+            child.add_string(f"constraint totDistance < {bound};\n")
+            result = child.solve(timeout=timedelta(seconds=timeout))
+        if result.status.has_solution():
+            tHome = result["tHome"]
+            tAway = result["tAway"]
+            schedule = [[[int(tHome[p][w]), int(tAway[p][w])] for w in range(len(sol[0]))] for p in range(len(sol))]
+            return "improved", schedule
+        if result.status == Status.UNSATISFIABLE:
+            return "no_improvement", None
+        return "timeout", None
+
+
+# Re-optimize a neighbourhood with the base MIP optimization model solved by HiGHS.
+# The model stays loaded in the persistent solver: each step only changes the fixed variables and tightens the
+# objective cut, which only decreases during the search.
+class HighsNeighbourhood:
+    def __init__(self, n):
+        from MIP.mip_base_model_opt_highs import build_model
+        from MIP.persistent import PersistentHighs
+        self.model = build_model(n)
+        self.persistent = PersistentHighs(self.model)
+        self.frozen_weeks = ()
+
+    def prepare(self, sol):
+        return sol
+
+    def improve(self, sol, free, bound, timeout):
+        from pyomo.contrib.appsi.base import TerminationCondition
+        model = self.model
+        for var in model.x.values():
+            var.unfix()
+        # fixing the match of a slot fixes all the other variables of the slot through single_match_per_slot
+        for p, row in enumerate(sol):
+            for w, (h, a) in enumerate(row):
+                if (p, w) not in free:
+                    model.x[h, a, w+1, p+1].fix(1)
+        self.persistent.tighten(bound-1)
+        tc, objective = self.persistent.solve(timeout)
+        if objective is not None and objective < bound:
+            return "improved", self.persistent.schedule()
+        if tc == TerminationCondition.infeasible:
+            return "no_improvement", None
+        return "timeout", None
+
+
+# Run the LNS from a feasible schedule until the time limit or the objective lower bound is reached
+def lns_search(n, neighbourhood, initial, time_limit=300, step_timeout=10, seed=None):
+    rng = random.Random(seed)
+    start = time.time()
+    sol = neighbourhood.prepare(initial)
+    best = total_distance(sol)
+    curve = [[round(time.time()-start, 3), best]]
+    lower_bound = objective_lower_bound(n)
+    size = 2
+    max_size = n//2
+
+    while best > lower_bound:
+        remaining = time_limit - (time.time()-start)
+        if remaining < 1:
+            break
+        kind = rng.choice(("weeks", "periods"))
+        free = choose_neighbourhood(rng, sol, kind, size, neighbourhood.frozen_weeks)
+        status, candidate = neighbourhood.improve(sol, free, best, min(step_timeout, remaining))
+        if status == "improved" and is_valid_schedule(candidate, n) and total_distance(candidate) < best:
+            sol = candidate
+            best = total_distance(sol)
+            curve.append([round(time.time()-start, 3), best])
+        elif status == "no_improvement":
+            size = min(size+1, max_size)
+        elif status == "timeout":
+            size = max(size-1, 1)
+
+    elapsed = int(time.time()-start)
+    optimal = best == lower_bound
+    return {"time": elapsed if optimal else time_limit, "optimal": optimal, "obj": best, "sol": sol, "curve": curve}
+
+# Solve with a feasibility model to get the starting schedule, then improve it with the LNS in the remaining time
+def run_lns(n, neighbourhood_factory, start_model, time_limit=300):
+    start = time.time()
+    first = start_model(n)
+    if not first["sol"]:
+        # no starting schedule: report the outcome of the feasibility model (unsat or timeout)
+        return first
+    trace.phase("encode")
+    neighbourhood = neighbourhood_factory(n)
+    offset = time.time()-start
+    trace.phase("lns")
+    results = lns_search(n, neighbourhood, first["sol"], time_limit=max(int(time_limit-offset), 1))
+    trace.counts({"improvements": len(results["curve"])-1, "objective": results["obj"]})
+    results["curve"] = [[round(t+offset, 3), obj] for t, obj in results["curve"]]
+    if results["optimal"]:
+        results["time"] = int(time.time()-start)
+    else:
+        results["time"] = time_limit
+    return results
@@ -0,0 +1,14 @@
+from CP.local_symbreak_gecode import tournament_CP_scheduler as start_model
+from LNS.lns import MiniZincNeighbourhood, run_lns
+
+# LNS on the fairness objective: the neighbourhoods are re-optimized with global_symbreak_opt_gecode.mzn,
+# starting from the schedule found by local_symbreak_gecode
+def neighbourhood(n):
+    return MiniZincNeighbourhood(n, "global_symbreak_opt_gecode.mzn", "gecode")
+
+def tournament_LNS_scheduler(n):
+    return run_lns(n, neighbourhood, start_model)
+
+if __name__ == "__main__":
+    n = int(input())
+    results = tournament_LNS_scheduler(n)
@@ -0,0 +1,14 @@
+from SAT.SAT2_Z3_symbreak import tournament_SAT_scheduler as start_model
+from LNS.lns import HighsNeighbourhood, run_lns
+
+# LNS on the fairness objective: the neighbourhoods are re-optimized with the base MIP optimization model on HiGHS,
+# starting from the schedule found by the fastest pure-Python feasibility model (Z3_2_symbreak)
+def neighbourhood(n):
+    return HighsNeighbourhood(n)
+
+def tournament_LNS_scheduler(n):
+    return run_lns(n, neighbourhood, start_model)
+
+if __name__ == "__main__":
+    n = int(input())
+    results = tournament_LNS_scheduler(n)
@@ -0,0 +1,221 @@
+import time
+import numpy as np
+
+from utils import trace
+
+# Local search model for feasibility (not a general large-n solver, see the last paragraph).
+# The state is the period x week matrix of (home, away) pairs. It starts from a round robin built with the circle
+# method, so "each team plays once a week" and "each pair plays once" hold by construction and are preserved by
+# every move; only the "at most twice in the same period" constraint can be violated.
+#  - swap move: exchange the periods of two matches of the same week (tabu search on the conflicting matches)
+#  - Kempe-chain move: exchange an alternating cycle of matches between two weeks (simulated annealing acceptance),
+#    used to escape when the tabu search stagnates
+# The cost is the number of excess appearances, sum over (period, team) of max(0, count - 2). The count matrix is
+# kept up to date, so the cost change of a move only reads the counts of the teams it touches.
+# The periods of the initial round robin are assigned with a structured pattern that is already feasible when
+# n mod 6 != 4, so those n (up to 100 and beyond) are solved by the construction alone. For n mod 6 == 4 it leaves
+# about 2n/3 violations, which the search repairs only for small n: 10 and 16 are solved within the time limit,
+# 22 and larger are not (valid_teams.json lists only the n that were measured).
+
+
+# Period assignment of the circle method round robin (teams 0..n-2 in Z_{n-1} plus the fixed team).
+# In week w the match {w+k, w-k} goes to the period of its difference class min(2k, n-1-2k), and the match of
+# the fixed team goes to period 0; then, in every week but the first, the fixed team's match exchanges its period
+# with the match whose difference class is the class of 4w. Each class is exchanged in exactly two weeks, which
+# spreads the fixed team over the periods.
+def structured_round_robin(n):
+    weeks = n-1
+    periods = n//2
+    home = np.zeros((periods, weeks), dtype=np.int32)
+    away = np.zeros((periods, weeks), dtype=np.int32)
+    difference_class = lambda r: min(r % weeks, -r % weeks)
+    for w in range(weeks):
+        exchanged = difference_class(4*w)
+        for k in range(periods):
+            if k == 0:
+                h, a, p = n, w+1, exchanged
+            else:
+                h, a, p = (w+k) % weeks + 1, (w-k) % weeks + 1, difference_class(2*k)
+                if p == exchanged:
+                    p = 0
+            home[p, w] = h
+            away[p, w] = a
+    return home, away
+
+
+class TabuState:
+    def __init__(self, n):
+        self.n = n
+        self.periods = n//2
+        self.weeks = n-1
+        self.home, self.away = structured_round_robin(n)
+        self.counts = np.zeros((self.periods, n+1), dtype=np.int32)
+        for p in range(self.periods):
+            np.add.at(self.counts[p], self.home[p], 1)
+            np.add.at(self.counts[p], self.away[p], 1)
+        self.cost = int(np.maximum(self.counts-2, 0).sum())
+        # tabu_until[p, a, b]: iteration until which the match {a, b} cannot be moved back to period p
+        self.tabu_until = np.zeros((self.periods, n+1, n+1), dtype=np.int64)
+        self.iterations = 0
+
+    # Slots (p, w) whose match involves a team playing more than twice in period p
+    def conflicting_slots(self):
+        bad = self.counts > 2
+        rows = np.arange(self.periods)[:, None]
+        return np.nonzero(bad[rows, self.home] | bad[rows, self.away])
+
+    # Cost change of swapping the match in each slot (ps[k], ws[k]) with the match of every period q of the same
+    # week: a K x periods matrix, computed from the counts of the four teams involved in each swap
+    def swap_deltas(self, ps, ws):
+        counts = self.counts
+        a, b = self.home[ps, ws][:, None], self.away[ps, ws][:, None]
+        c, d = self.home[:, ws].T, self.away[:, ws].T
+        p = ps[:, None]
+        q = np.arange(self.periods)[None, :]
+        gain = (counts[p, c] >= 2).astype(np.int32) + (counts[p, d] >= 2) + (counts[q, a] >= 2) + (counts[q, b] >= 2)
+        loss = (counts[q, c] > 2).astype(np.int32) + (counts[q, d] > 2) + (counts[p, a] > 2) + (counts[p, b] > 2)
+        return gain - loss
+
+    # Swap the matches in (p, w) and (q, w), updating the counts of the four teams in the two periods
+    def swap(self, p, q, w):
+        a, b = self.home[p, w], self.away[p, w]
+        c, d = self.home[q, w], self.away[q, w]
+        before = self._local_cost((p, q), (a, b, c, d))
+        self.counts[p, a] -= 1; self.counts[p, b] -= 1; self.counts[p, c] += 1; self.counts[p, d] += 1
+        self.counts[q, c] -= 1; self.counts[q, d] -= 1; self.counts[q, a] += 1; self.counts[q, b] += 1
+        self.home[p, w], self.home[q, w] = c, a
+        self.away[p, w], self.away[q, w] = d, b
+        self.cost += self._local_cost((p, q), (a, b, c, d)) - before
+
+    def _local_cost(self, periods, teams):
+        rows = np.array(periods)[:, None]
+        cols = np.array(teams)[None, :]
+        return int(np.maximum(self.counts[rows, cols]-2, 0).sum())
+
+    # Kempe-chain move: the matches of weeks w1 and w2 form alternating cycles; exchanging one cycle keeps both
+    # weeks perfect matchings. Each moved match takes the slot of the match that leaves the other week next to it.
+    def kempe_chain(self, w1, w2, team):
+        opponent = {}
+        slot = {}
+        for w in (w1, w2):
+            for p in range(self.periods):
+                h, a = int(self.home[p, w]), int(self.away[p, w])
+                opponent[(w, h)] = a
+                opponent[(w, a)] = h
+                slot[(w, h)] = slot[(w, a)] = p
+        cycle = []
+        t, w = team, w1
+        while True:
+            cycle.append((w, slot[(w, t)]))
+            t = opponent[(w, t)]
+            w = w2 if w == w1 else w1
+            if t == team and w == w1:
+                break
+        if len(cycle) == 2*self.periods:
+            # exchanging the whole weeks does not change the periods of the matches
+            return 0
+        moves = []
+        for i in range(0, len(cycle), 2):
+            src_w, src_p = cycle[i]
+            dst_w, dst_p = cycle[i+1]
+            moves.append((src_w, src_p, dst_w, dst_p))
+            moves.append((dst_w, dst_p, src_w, src_p))
+        touched_periods = sorted({p for _, p, _, _ in moves})
+        old = {(w, p): (int(self.home[p, w]), int(self.away[p, w])) for w, p, _, _ in moves}
+        before = int(np.maximum(self.counts[touched_periods]-2, 0).sum())
+        for (w, p), (h, a) in old.items():
+            self.counts[p, h] -= 1
+            self.counts[p, a] -= 1
+        for src_w, src_p, dst_w, dst_p in moves:
+            h, a = old[(src_w, src_p)]
+            self.home[dst_p, dst_w] = h
+            self.away[dst_p, dst_w] = a
+            self.counts[dst_p, h] += 1
+            self.counts[dst_p, a] += 1
+        delta = int(np.maximum(self.counts[touched_periods]-2, 0).sum()) - before
+        self.cost += delta
+        return delta
+
+    def snapshot(self):
+        return self.home.copy(), self.away.copy(), self.counts.copy(), self.cost
+
+    def restore(self, snapshot):
+        home, away, counts, cost = snapshot
+        self.home, self.away, self.counts, self.cost = home.copy(), away.copy(), counts.copy(), cost
+
+    def schedule(self):
+        return [[[int(self.home[p, w]), int(self.away[p, w])] for w in range(self.weeks)] for p in range(self.periods)]
+
+
+# Tabu search on the swap moves, with simulated annealing on Kempe-chain moves when it stagnates
+def tabu_search(n, time_limit=300, seed=None, tenure=None, stagnation=None, temperature=2.0, cooling=0.995):
+    rng = np.random.default_rng(seed)
+    start = time.time()
+    state = TabuState(n)
+    periods = state.periods
+    tenure = tenure or max(4, periods//2)
+    stagnation = stagnation or 20*n
+    best_cost = state.cost
+    iteration = 0
+    last_improvement = 0
+
+    while state.cost > 0 and time.time()-start < time_limit:
+        iteration += 1
+        if iteration - last_improvement > stagnation:
+            # escape: Kempe-chain perturbation accepted with the Metropolis rule
+            snapshot = state.snapshot()
+            w1, w2 = rng.choice(state.weeks, 2, replace=False)
+            delta = state.kempe_chain(int(w1), int(w2), int(rng.integers(1, n+1)))
+            if delta > 0 and rng.random() >= np.exp(-delta/temperature):
+                state.restore(snapshot)
+            temperature = max(temperature*cooling, 0.05)
+            last_improvement = iteration
+            continue
+
+        # best non-tabu swap over all the conflicting matches (aspiration if it improves the best cost)
+        ps, ws = state.conflicting_slots()
+        delta = state.swap_deltas(ps, ws)
+        a, b = state.home[ps, ws][:, None], state.away[ps, ws][:, None]
+        c, d = state.home[:, ws].T, state.away[:, ws].T
+        # a swap is tabu if it moves either match back to a period it recently left
+        tabu = (state.tabu_until[np.arange(periods)[None, :], np.minimum(a, b), np.maximum(a, b)] > iteration) | \
+               (state.tabu_until[ps[:, None], np.minimum(c, d), np.maximum(c, d)] > iteration)
+        allowed = ~tabu | (state.cost + delta < best_cost)
+        allowed[np.arange(len(ps)), ps] = False
+        if not allowed.any():
+            continue
+        best_delta = delta[allowed].min()
+        ties = np.argwhere(allowed & (delta == best_delta))
+        k, q = ties[rng.integers(len(ties))]
+        p, w = int(ps[k]), int(ws[k])
+
+        state.tabu_until[p, min(a[k, 0], b[k, 0]), max(a[k, 0], b[k, 0])] = iteration + tenure + rng.integers(tenure)
+        state.tabu_until[q, min(c[k, q], d[k, q]), max(c[k, q], d[k, q])] = iteration + tenure + rng.integers(tenure)
+        state.swap(p, int(q), w)
+        if state.cost < best_cost:
+            best_cost = state.cost
+            last_improvement = iteration
+
+    state.iterations = iteration
+    return state
+
+
+def tournament_LS_scheduler(n, time_limit=300):
+    if n % 2 != 0:
+        print("Input error: n must be even.")
+        return None
+    start = time.time()
+    trace.phase("solve")
+    state = tabu_search(n, time_limit=time_limit)
+    elapsed = int(time.time()-start)
+    trace.counts({"iterations": state.iterations, "violations": state.cost})
+    trace.phase("decode")
+    if state.cost == 0:
+        return {"time": elapsed, "optimal": True, "obj": None, "sol": state.schedule()}
+    # local search cannot prove unsatisfiability (n=4): treated as a timeout
+    return {"time": 300, "optimal": False, "obj": None, "sol": []}
+
+
+if __name__ == "__main__":
+    n = int(input())
+    results = tournament_LS_scheduler(n)
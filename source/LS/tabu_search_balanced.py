@@ -0,0 +1,10 @@
+from LS.tabu_search import tournament_LS_scheduler as feasibility_scheduler
+from utils.orientation import balanced_result
+
+# Optimization model: local search for a feasible schedule, then optimal home/away re-orientation (totDistance = n)
+def tournament_LS_scheduler(n):
+    return balanced_result(feasibility_scheduler(n))
+
+if __name__ == "__main__":
+    n = int(input())
+    results = tournament_LS_scheduler(n)
@@ -0,0 +1,27 @@
+import math
+import pyomo.environ as pyo
+from utils import bounds
+
+# Objective lower bounds of the MIP optimization models (total distance, see utils/bounds.py).
+#  - apply: the analytical bound is given to the solver as the variable bound abs_diff[t] >= 1 of every team
+#    (|home - away| is odd); the LP relaxation then has value n, so the solver closes the gap and stops as soon as
+#    its incumbent reaches n, instead of searching for a proof. Variable bounds add no rows (an objective cut row
+#    slows HiGHS down, see MIP/incumbent.py)
+#  - lp_bound: lower bound from the LP relaxation of a model, rounded up to an even value (the total distance is a
+#    sum of n odd numbers)
+
+# Set the per-team bounds on model.abs_diff; returns the lower bound of the objective
+def apply(model, n):
+  for var in model.abs_diff.values():
+    var.setlb(1)
+  return bounds.lower_bound(n)
+
+# Lower bound of the objective from the LP relaxation of a copy of the model
+def lp_bound(model):
+  relaxed = model.clone()
+  pyo.TransformationFactory('core.relax_integer_vars').apply_to(relaxed)
+  solver = pyo.SolverFactory('highs')
+  solver.options['threads'] = 1
+  solver.solve(relaxed)
+  value = math.ceil(pyo.value(relaxed.obj)-1e-6)
+  return value + value % 2
@@ -0,0 +1,86 @@
+from utils import incumbent_bus
+
+# Use of the cross-paradigm incumbent bus (utils/incumbent_bus.py) by the MIP optimization models, whose objective is
+# the total distance (sum of |home - away| over the teams).
+#  - shared_cutoff: the best published total distance is given to the solver as an objective bound, so it prunes
+#    with it from the start (used with the pyomo HiGHS interface, which takes no MIP start)
+#  - shared_start: the best published schedule becomes the MIP start of the T1 x T2 x W x P models (CBC warmstart);
+#    it is first brought to the form required by the first_diag_match symmetry breaking
+#  - shared_fallback: a model that runs out of time without a solution of its own returns the best published one
+#  - publish: improving schedules found by the MIP models are sent to the bus
+
+# Relabel the teams and reorder the weeks and periods of a schedule so that week p, period p holds the match
+# (2p-1, 2p), as required by the first_diag_match symmetry breaking; the objective is unchanged.
+# Looks for one match per period, in distinct weeks, covering every team once; None if there is none
+def diagonal_form(sol):
+  periods = len(sol)
+  weeks = len(sol[0])
+
+  def extend(chosen, used_periods, used_teams):
+    if len(chosen) == periods:
+      return chosen
+    first_week = chosen[-1][0]+1 if chosen else 0
+    for w in range(first_week, weeks-(periods-len(chosen))+1):
+      for p in range(periods):
+        h, a = sol[p][w]
+        if p not in used_periods and h not in used_teams and a not in used_teams:
+          found = extend(chosen+[(w, p)], used_periods | {p}, used_teams | {h, a})
+          if found:
+            return found
+    return None
+
+  diagonal = extend([], set(), set())
+  if diagonal is None:
+    return None
+  label = {}
+  for k, (w, p) in enumerate(diagonal):
+    h, a = sol[p][w]
+    label[h], label[a] = 2*k+1, 2*k+2
+  week_order = [w for w, _ in diagonal] + [w for w in range(weeks) if w not in {w for w, _ in diagonal}]
+  return [[[label[sol[p][w][0]], label[sol[p][w][1]]] for w in week_order] for _, p in diagonal]
+
+# Objective bound for the solver from the best published total distance (None if nothing was published): the
+# solver prunes the nodes that cannot match it, as if it had that incumbent. It is set as a solver option rather
+# than an objective cut, since a cut row on the objective slows the HiGHS search down by orders of magnitude;
+# the bound is best + 1 so that schedules as good as the published one (the objective is even) stay feasible
+def shared_cutoff(solver, n, solver_name):
+  shared = incumbent_bus.best(n, "totDistance")
+  if shared is None:
+    return None
+  solver.options['objective_bound' if solver_name == 'highs' else 'cutoff'] = shared[0]+1
+  return shared[0]
+
+# Load the best published schedule as the values of model.x (and of the auxiliary variables defined by it);
+# returns its total distance, None if there is no usable schedule
+def shared_start(model, n):
+  shared = incumbent_bus.best(n, "totDistance")
+  sol = diagonal_form(shared[1]) if shared else None
+  if sol is None:
+    return None
+  for var in model.x.values():
+    var.set_value(0)
+  if hasattr(model, "tp"):
+    for var in model.tp.values():
+      var.set_value(0)
+  home = {t: 0 for t in model.T1}
+  away = {t: 0 for t in model.T1}
+  for p, row in enumerate(sol, start=1):
+    for w, (h, a) in enumerate(row, start=1):
+      model.x[h, a, w, p].set_value(1)
+      home[h] += 1
+      away[a] += 1
+      if hasattr(model, "tp"):
+        for t in (h, a):
+          model.tp[t, p].set_value(model.tp[t, p].value + 1)
+  for t in model.T1:
+    model.abs_diff[t].set_value(abs(home[t]-away[t]))
+  return shared[0]
+
+# Best published schedule for a model that timed out without a solution (the shared_cutoff bound prunes every
+# schedule that is not better than it): (total distance, schedule, model that published it), None if there is none
+def shared_fallback(n):
+  return incumbent_bus.better_bound(n, "totDistance")
+
+def publish(n, schedule, source="MIP"):
+  if schedule:
+    incumbent_bus.publish(n, schedule, source)
@@ -2,9 +2,12 @@ import time
 import pyomo.environ as pyo
 from pyomo.environ import SolverStatus, TerminationCondition
 from pyomo.contrib.solver.common.util import NoFeasibleSolutionError, NoOptimalSolutionError
+from utils import trace
+from utils import timing
 
 
 def tournament_MIP_scheduler(n):
+  trace.phase("encode")
 
   weeks = n-1
   WEEK = [w for w in range(1, weeks+1)]
@@ -66,10 +69,14 @@ def tournament_MIP_scheduler(n):
   solver_c = pyo.SolverFactory('cbc')
   solver_c.options['threads'] = 1 
   solver_c.options['seconds'] = 300
+  trace.counts({"vars": model.nvariables(), "constraints": model.nconstraints()})
+  trace.phase("solve")
   try:
     start = time.time()
     result_c = solver_c.solve(model)
+    timing.report_solver_time(timing.pyomo_time(result_c))
     elapsed = int(time.time()-start)
+    trace.phase("decode")
   except NoFeasibleSolutionError:
     elapsed = int(time.time()-start) #unsat case (before timeout)
     #print("The problem is infeasible.")
@@ -126,7 +133,7 @@ def tournament_MIP_scheduler(n):
   else:
       # Any other termination → treat as timeout without solution
       print("Warning: TerminationCondition = ", tc)
-      if elapsed > 300: elapsed = 300
+      elapsed = 300
       optimal = False
       schedule = []
 
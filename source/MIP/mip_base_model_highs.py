@@ -2,9 +2,12 @@ import time
 from pyomo.environ import SolverStatus, TerminationCondition
 import pyomo.environ as pyo
 from pyomo.contrib.solver.common.util import NoFeasibleSolutionError, NoOptimalSolutionError
+from utils import trace
+from utils import timing
 
 
 def tournament_MIP_scheduler(n):
+  trace.phase("encode")
 
   weeks = n-1
   WEEK = [w for w in range(1, weeks+1)]
@@ -61,10 +64,14 @@ def tournament_MIP_scheduler(n):
   solver_h = pyo.SolverFactory('highs')
   solver_h.options['threads'] = 1
   solver_h.options['time_limit'] = 300
+  trace.counts({"vars": model.nvariables(), "constraints": model.nconstraints()})
+  trace.phase("solve")
   try:
     start = time.time()
     result_h = solver_h.solve(model)
+    timing.report_solver_time(timing.pyomo_time(result_h))
     elapsed = int(time.time()-start)
+    trace.phase("decode")
   except NoFeasibleSolutionError:
     elapsed = int(time.time()-start) #unsat case (before timeout)
     #print("The problem is infeasible.")
@@ -120,7 +127,7 @@ def tournament_MIP_scheduler(n):
   else:
       # Any other termination → treat as timeout without solution
       print("Warning: TerminationCondition = ", tc)
-      if elapsed > 300: elapsed = 300
+      elapsed = 300
       optimal = False
       schedule = []
 
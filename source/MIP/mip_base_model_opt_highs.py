@@ -2,9 +2,14 @@ import time
 from pyomo.environ import SolverStatus, TerminationCondition
 import pyomo.environ as pyo
 from pyomo.contrib.solver.common.util import NoFeasibleSolutionError, NoOptimalSolutionError
+from utils import trace
+from utils import timing
+from MIP import incumbent
+from MIP import bounds
 
 
-def tournament_MIP_scheduler(n):
+# Build the Pyomo model of the base optimization formulation (also reused by the LNS engine)
+def build_model(n):
   weeks = n-1
   WEEK = [w for w in range(1, weeks+1)]
   periods = n//2
@@ -82,14 +87,30 @@ def tournament_MIP_scheduler(n):
   # optimization objective: minimize sum of auxiliary variable values
   # -> minimize home/ away difference
   model.obj = pyo.Objective(rule=opt_func, sense=pyo.minimize)
+  return model
+
+
+def tournament_MIP_scheduler(n):
+  trace.phase("encode")
+  model = build_model(n)
+  # lower bound of the objective (|home - away| >= 1 for every team)
+  bounds.apply(model, n)
 
   solver_h = pyo.SolverFactory('highs')
   solver_h.options['threads'] = 1
   solver_h.options['time_limit'] = 300
+  incumbent.shared_cutoff(solver_h, n, 'highs')
+  trace.counts({"vars": model.nvariables(), "constraints": model.nconstraints()})
+  trace.phase("solve")
   try:
     start = time.time()
-    result_h = solver_h.solve(model)
+    # without a solution at the time limit the results are read below rather than raising NoFeasibleSolutionError
+    result_h = solver_h.solve(model, load_solutions=False)
+    timing.report_solver_time(timing.pyomo_time(result_h))
+    if len(result_h.solution) > 0:
+      model.solutions.load_from(result_h)
     elapsed = int(time.time()-start)
+    trace.phase("decode")
   except NoFeasibleSolutionError:
     elapsed = int(time.time()-start) #unsat case (before timeout)
     #print("The problem is infeasible.")
@@ -102,6 +123,7 @@ def tournament_MIP_scheduler(n):
   st = result_h.solver.status
 
   schedule = []
+  from_bus = None
 
   if tc == TerminationCondition.optimal:
       # Optimal solution, safe to read
@@ -117,7 +139,7 @@ def tournament_MIP_scheduler(n):
                       elif pyo.value(model.x[t2,t1,w,p]) > 0.1:
                           period_list.append([t2,t1])
           schedule.append(period_list)
-      obj_value = int(model.obj())
+      obj_value = int(round(model.obj()))
 
   elif tc == TerminationCondition.maxTimeLimit:
       # Timeout: only use solution if it exists
@@ -137,10 +159,13 @@ def tournament_MIP_scheduler(n):
                           elif val is not None and pyo.value(model.x[t2,t1,w,p]) > 0.1:
                               period_list.append([t2,t1])
               schedule.append(period_list)
-          obj_value = int(model.obj())
+          obj_value = int(round(model.obj()))
       else:
           schedule = []
           obj_value = None
+          shared = incumbent.shared_fallback(n)
+          if shared is not None:
+              obj_value, schedule, from_bus = shared
 
   elif tc == TerminationCondition.infeasible:
       # Infeasible → no solution
@@ -151,12 +176,16 @@ def tournament_MIP_scheduler(n):
   else:
       # Any other termination → treat as timeout without solution
       print("Warning: TerminationCondition = ", tc)
-      if elapsed > 300: elapsed = 300
+      elapsed = 300
       optimal = False
       schedule = []
       obj_value = None
 
-  return {"time":elapsed, "optimal":optimal, "obj":obj_value, "sol":schedule}
+  incumbent.publish(n, schedule)
+  results = {"time":elapsed, "optimal":optimal, "obj":obj_value, "sol":schedule}
+  if from_bus is not None:
+    results["from_bus"] = from_bus
+  return results
 
 if __name__ == "__main__":
   n = int(input())
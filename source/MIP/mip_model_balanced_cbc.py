@@ -0,0 +1,11 @@
+from MIP.mip_model_cbc import tournament_MIP_scheduler as feasibility_scheduler
+from utils.orientation import balanced_result
+
+# Optimization model: solve the symmetry breaking feasibility model, then re-orient the matches
+# to an optimal home/away balance (sum of abs_diff = n)
+def tournament_MIP_scheduler(n):
+  return balanced_result(feasibility_scheduler(n))
+
+if __name__ == "__main__":
+  n = int(input())
+  schedule = tournament_MIP_scheduler(n)
@@ -2,9 +2,14 @@ import time
 from pyomo.environ import SolverStatus, TerminationCondition
 import pyomo.environ as pyo
 from pyomo.contrib.solver.common.util import NoFeasibleSolutionError, NoOptimalSolutionError
+from utils import trace
+from utils import timing
+from MIP import incumbent
+from MIP import bounds
 
 
 def tournament_MIP_scheduler(n):
+  trace.phase("encode")
   weeks = n-1
   WEEK = [w for w in range(1, weeks+1)]
   periods = n//2
@@ -81,6 +86,8 @@ def tournament_MIP_scheduler(n):
   # optimization objective: minimize sum of auxiliary variable values
   # -> minimize home/ away difference
   model.obj = pyo.Objective(rule=opt_func, sense=pyo.minimize)
+  # lower bound of the objective (|home - away| >= 1 for every team)
+  bounds.apply(model, n)
 
   # solver_h = pyo.SolverFactory('highs')
   # solver_h.options['threads'] = 1
@@ -91,10 +98,16 @@ def tournament_MIP_scheduler(n):
   solver_c.options['threads'] = 1
   solver_c.options['seconds'] = 300
 
+  trace.counts({"vars": model.nvariables(), "constraints": model.nconstraints()})
+  # best schedule published by the other running models (if any) as MIP start
+  shared = incumbent.shared_start(model, n)
+  trace.phase("solve")
   try:
     start = time.time()
-    result_c = solver_c.solve(model)
+    result_c = solver_c.solve(model, warmstart=shared is not None)
+    timing.report_solver_time(timing.pyomo_time(result_c))
     elapsed = int(time.time()-start)
+    trace.phase("decode")
   except NoFeasibleSolutionError:
     elapsed = int(time.time()-start) #unsat case (before timeout)
     #print("The problem is infeasible.")
@@ -123,7 +136,7 @@ def tournament_MIP_scheduler(n):
                       elif pyo.value(model.x[t2,t1,w,p]) > 0.1:
                           period_list.append([t2,t1])
           schedule.append(period_list)
-      obj_value = int(model.obj())
+      obj_value = int(round(model.obj()))
 
   elif tc == TerminationCondition.maxTimeLimit:
       # Timeout: only use solution if it exists
@@ -143,7 +156,7 @@ def tournament_MIP_scheduler(n):
                           elif val is not None and pyo.value(model.x[t2,t1,w,p]) > 0.1:
                               period_list.append([t2,t1])
               schedule.append(period_list)
-          obj_value = int(model.obj())
+          obj_value = int(round(model.obj()))
       else:
           schedule = []
           obj_value = None
@@ -157,10 +170,11 @@ def tournament_MIP_scheduler(n):
   else:
       # Any other termination → treat as timeout without solution
       print("Warning: TerminationCondition = ", tc)
-      if elapsed > 300: elapsed = 300
+      elapsed = 300
       optimal = False
       schedule = []
       obj_value = None
+  incumbent.publish(n, schedule)
   return {"time":elapsed, "optimal":optimal, "obj":obj_value, "sol":schedule}
 
 if __name__ == "__main__":
@@ -0,0 +1,15 @@
+from MIP.mip_model_opt_highs import build_model
+from MIP.persistent import descend
+from MIP import bounds
+from utils import trace
+
+# Optimization model with symmetry breaking solved by descent on the persistent HiGHS interface:
+# each improved solution adds an objective cut and the loaded model is re-solved (lower bound: n, see MIP/bounds.py)
+def tournament_MIP_scheduler(n):
+  trace.phase("encode")
+  model = build_model(n)
+  return descend(model, lower_bound=bounds.apply(model, n), time_limit=300)
+
+if __name__ == "__main__":
+  n = int(input())
+  schedule = tournament_MIP_scheduler(n)
@@ -0,0 +1,9 @@
+from MIP.mip_pairslot_model import tournament_MIP_scheduler as pairslot_scheduler
+
+# Feasibility version of the pair-slot formulation solved by HIGHS
+def tournament_MIP_scheduler(n):
+  return pairslot_scheduler(n, solver_name='highs', optimize=False)
+
+if __name__ == "__main__":
+  n = int(input())
+  schedule = tournament_MIP_scheduler(n)
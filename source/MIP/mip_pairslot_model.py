@@ -0,0 +1,139 @@
+import time
+from pyomo.environ import TerminationCondition
+import pyomo.environ as pyo
+from pyomo.contrib.solver.common.util import NoFeasibleSolutionError
+from utils import trace
+from utils import timing
+from MIP import incumbent
+from MIP import bounds
+
+
+# Pair-slot formulation: the slot variables only say which unordered pair {t1, t2} (t1 < t2) plays in a slot,
+# the orientation is a separate binary per pair (home[t1, t2] = 1 if t1 plays at home). No variable exists for
+# the diagonal t1 = t2 or for both orientations of the same match, which halves the slot variables of the
+# T1 x T2 x W x P models, and the objective only involves the n(n-1)/2 orientation binaries.
+def build_model(n, optimize=False):
+  weeks = n-1
+  WEEK = [w for w in range(1, weeks+1)]
+  periods = n//2
+  PERIOD = [p for p in range(1, periods+1)]
+  TEAM = [t for t in range(1, n+1)]
+  PAIRS = [(t1, t2) for t1 in TEAM for t2 in TEAM if t1<t2]
+
+  model = pyo.ConcreteModel()
+
+  model.T = pyo.Set(initialize=TEAM)
+  model.W = pyo.Set(initialize=WEEK)
+  model.P = pyo.Set(initialize=PERIOD)
+  model.PAIRS = pyo.Set(initialize=PAIRS, dimen=2)
+  model.y = pyo.Var(model.PAIRS, model.W, model.P, domain=pyo.Binary)
+  model.home = pyo.Var(model.PAIRS, domain=pyo.Binary)
+
+  # pairs involving each team
+  team_pairs = {t: [(t1, t2) for (t1, t2) in PAIRS if t in (t1, t2)] for t in TEAM}
+
+  # to ensure one single match per timeslot (week x period)
+  def single_match_per_slot(model, w, p):
+    return sum(model.y[t1, t2, w, p] for (t1, t2) in model.PAIRS) == 1
+  model.single_match_per_slot = pyo.Constraint(model.W, model.P, rule=single_match_per_slot)
+
+  # first problem constraint: each team has to play against each other team exactly once
+  def pair_once(model, t1, t2):
+    return sum(model.y[t1, t2, w, p] for w in model.W for p in model.P) == 1
+  model.pair_once = pyo.Constraint(model.PAIRS, rule=pair_once)
+
+  # second problem constraint: each team has to play once per week
+  def once_a_week(model, t, w):
+    return sum(model.y[t1, t2, w, p] for (t1, t2) in team_pairs[t] for p in model.P) == 1
+  model.once_a_week = pyo.Constraint(model.T, model.W, rule=once_a_week)
+
+  # third problem constraint: each team can play at most twice in the same period
+  def max_twice_period(model, t, p):
+    return sum(model.y[t1, t2, w, p] for (t1, t2) in team_pairs[t] for w in model.W) <= 2
+  model.max_twice_period = pyo.Constraint(model.T, model.P, rule=max_twice_period)
+
+  #symmetry break: fix first diagonal matches
+  def first_diag_match(model, p):
+    return model.y[2*p-1, 2*p, p, p] == 1
+  model.first_diag_match = pyo.Constraint(model.P, rule=first_diag_match)
+
+  if not optimize:
+    model.obj = pyo.Objective(expr=0, sense=pyo.minimize)
+    return model
+
+  # home games of each team: n-1 games, so |home - away| = |2*home - (n-1)|
+  def home_t(model, t):
+    return sum(model.home[t1, t2] if t1 == t else 1-model.home[t1, t2] for (t1, t2) in team_pairs[t])
+
+  model.abs_diff = pyo.Var(model.T, domain=pyo.NonNegativeReals)
+
+  def linearize_abs_diff_1(model, t):
+    return 2*home_t(model, t) - (n-1) <= model.abs_diff[t]
+  model.linearize_abs_diff_1 = pyo.Constraint(model.T, rule=linearize_abs_diff_1)
+
+  def linearize_abs_diff_2(model, t):
+    return 2*home_t(model, t) - (n-1) >= -model.abs_diff[t]
+  model.linearize_abs_diff_2 = pyo.Constraint(model.T, rule=linearize_abs_diff_2)
+
+  # optimization objective: minimize home/ away difference
+  model.obj = pyo.Objective(expr=sum(model.abs_diff[t] for t in model.T), sense=pyo.minimize)
+  return model
+
+# Schedule of the loaded solution, oriented by the home binaries
+def extract_schedule(model):
+  schedule = [[None for _ in model.W] for _ in model.P]
+  for (t1, t2, w, p), var in model.y.items():
+    if var.value is not None and var.value > 0.5:
+      home = model.home[t1, t2].value
+      schedule[p-1][w-1] = [t1, t2] if home is None or home > 0.5 else [t2, t1]
+  return schedule
+
+
+def tournament_MIP_scheduler(n, solver_name='highs', optimize=False):
+  trace.phase("encode")
+  model = build_model(n, optimize)
+  if optimize:
+    # lower bound of the objective (|home - away| >= 1 for every team)
+    bounds.apply(model, n)
+  trace.counts({"vars": model.nvariables(), "constraints": model.nconstraints()})
+
+  solver = pyo.SolverFactory(solver_name)
+  solver.options['threads'] = 1
+  if solver_name == 'highs':
+    solver.options['time_limit'] = 300
+  else:
+    solver.options['seconds'] = 300
+  if optimize:
+    incumbent.shared_cutoff(solver, n, solver_name)
+  trace.phase("solve")
+  start = time.perf_counter()
+  try:
+    result = solver.solve(model, load_solutions=False)
+    timing.report_solver_time(timing.pyomo_time(result))
+  except NoFeasibleSolutionError:
+    #unsat case (before timeout)
+    solve_time = round(time.perf_counter()-start, 3)
+    return {"time":int(solve_time), "optimal":True, "obj":None, "sol":[], "solve_time":solve_time}
+  solve_time = round(time.perf_counter()-start, 3)
+  elapsed = int(solve_time)
+  trace.phase("decode")
+
+  tc = result.solver.termination_condition
+  if tc == TerminationCondition.infeasible:
+    return {"time":elapsed, "optimal":True, "obj":None, "sol":[], "solve_time":solve_time}
+  if len(result.solution) == 0:
+    # timeout (or any other termination) without a solution: the optimization model returns the best published one
+    shared = incumbent.shared_fallback(n) if optimize else None
+    if shared is not None:
+      obj_value, schedule, from_bus = shared
+      return {"time":300, "optimal":False, "obj":obj_value, "sol":schedule, "solve_time":solve_time, "from_bus":from_bus}
+    return {"time":300, "optimal":False, "obj":None, "sol":[], "solve_time":solve_time}
+
+  model.solutions.load_from(result)
+  schedule = extract_schedule(model)
+  obj_value = int(round(pyo.value(model.obj))) if optimize else None
+  if optimize:
+    incumbent.publish(n, schedule)
+  if tc == TerminationCondition.optimal:
+    return {"time":elapsed, "optimal":True, "obj":obj_value, "sol":schedule, "solve_time":solve_time}
+  return {"time":300, "optimal":False, "obj":obj_value, "sol":schedule, "solve_time":solve_time}
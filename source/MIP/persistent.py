@@ -0,0 +1,103 @@
+import time
+import pyomo.environ as pyo
+from pyomo.contrib.appsi.solvers import Highs
+from pyomo.contrib.appsi.base import TerminationCondition
+from utils import trace
+from utils import incumbent_bus
+from utils.schedule import total_distance
+from MIP import incumbent
+
+
+# Persistent HiGHS interface for the optimization models.
+# The model is loaded into HiGHS once; later solves only send the changes (new cuts, fixed or unfixed variables),
+# so a sequence of solves with a tightened objective bound does not rewrite and reload the whole model.
+class PersistentHighs:
+  def __init__(self, model, threads=1):
+    self.model = model
+    model.bound_cuts = pyo.ConstraintList()
+    self.solver = Highs()
+    self.solver.config.load_solution = False
+    self.threads = threads
+
+  # Solve within the time limit; with first_solution the search stops at the first improving solution.
+  # Returns the termination condition and the objective of the loaded solution (None if no solution was found)
+  def solve(self, time_limit, first_solution=False):
+    self.solver.config.time_limit = time_limit
+    options = {'threads': self.threads}
+    if first_solution:
+      options['mip_max_improving_sols'] = 1
+    self.solver.highs_options = options
+    result = self.solver.solve(self.model)
+    if result.best_feasible_objective is None:
+      return result.termination_condition, None
+    self.solver.load_vars()
+    return result.termination_condition, int(round(result.best_feasible_objective))
+
+  # Only accept solutions with objective <= bound from now on
+  def tighten(self, bound):
+    self.model.bound_cuts.add(self.model.obj.expr <= bound)
+
+  def schedule(self):
+    model = self.model
+    schedule = [[None for _ in model.W] for _ in model.P]
+    for (t1, t2, w, p), var in model.x.items():
+      if var.value is not None and var.value > 0.5:
+        schedule[p-1][w-1] = [t1, t2]
+    return schedule
+
+
+# Solve an optimization model by descent: find a solution, require the next one to be strictly better and re-solve
+# the same loaded model, until the bound cannot be met (the last solution is optimal), the objective reaches the
+# lower bound, or the time runs out. The total distance is a sum of n odd numbers, hence even: each step asks for
+# an improvement of 2.
+# Before every solve, a better schedule published on the incumbent bus by another running model is adopted and the
+# cut is moved below it; every improvement found here is published. When the returned schedule is one adopted from
+# the bus, the results name the model that published it ("from_bus").
+def descend(model, lower_bound, time_limit=300, threads=1):
+  start = time.time()
+  n = len(model.W)+1
+  trace.counts({"vars": model.nvariables(), "constraints": model.nconstraints()})
+  trace.phase("solve")
+  persistent = PersistentHighs(model, threads)
+  schedule = []
+  obj_value = None
+  from_bus = None
+
+  def result(elapsed, optimal):
+    results = {"time":elapsed, "optimal":optimal, "obj":obj_value, "sol":schedule}
+    if from_bus is not None:
+      results["from_bus"] = from_bus
+    return results
+
+  while True:
+    remaining = time_limit - (time.time()-start)
+    if remaining < 1:
+      return result(300, False)
+    shared = incumbent_bus.better_bound(n, "totDistance", obj_value)
+    if shared is not None:
+      obj_value, schedule, from_bus = shared
+      trace.count("shared_objective", obj_value)
+      if obj_value <= lower_bound:
+        return result(int(time.time()-start), True)
+      persistent.tighten(obj_value-2)
+    tc, objective = persistent.solve(remaining, first_solution=True)
+    if objective is not None:
+      # the objective of the loaded schedule itself, not the rounded float reported by the solver
+      candidate = persistent.schedule()
+      objective = total_distance(candidate)
+    trace.count("objective", objective)
+    if objective is not None and (obj_value is None or objective < obj_value):
+      obj_value = objective
+      schedule = candidate
+      from_bus = None
+      incumbent.publish(n, schedule)
+      if obj_value <= lower_bound:
+        return result(int(time.time()-start), True)
+      persistent.tighten(obj_value-2)
+    elif tc == TerminationCondition.infeasible:
+      # no schedule at all (obj None) or no better one than the last
+      return result(int(time.time()-start), True)
+    elif tc == TerminationCondition.optimal:
+      return result(int(time.time()-start), True)
+    else:
+      return result(300, False)
@@ -0,0 +1,9 @@
+from SAT.SAT1_autosym import tournament_SAT_scheduler as autosym_scheduler
+
+# SAT1 model solved with Glucose3, with automatically detected symmetries broken by lex-leader clauses
+def tournament_SAT_scheduler(teams):
+  return autosym_scheduler(teams, solver_name="glucose3")
+
+if __name__ == "__main__":
+  teams = int(input())
+  print(tournament_SAT_scheduler(teams))
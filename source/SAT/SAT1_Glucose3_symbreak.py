@@ -3,6 +3,8 @@ from itertools import combinations
 import pandas as pd
 from pysat.solvers import Glucose3
 import time
+from utils import trace
+from utils import timing
 
 # Define the variables
 teams = 6
@@ -50,6 +52,7 @@ def at_most_k(int_vars, k):
 # Generate a SAT model to solve the tournament scheduling problem, using the Glucose3 solver and some symmetry breaking constraints to reduce the
 # search space and improve the overall solver efficiency
 def tournament_SAT_scheduler(teams):
+  trace.phase("encode")
   # Check that the number of teams is even
   if teams % 2 != 0:
     print("Input error: n must be even.")
@@ -76,7 +79,7 @@ def tournament_SAT_scheduler(teams):
                 for x in range(teams)]
 
   # Initialize the Glucose3 solver
-  s = Glucose3() 
+  s = Glucose3(use_timer=True)
 
   # Constraint: each team plays against each other team exactly once, regardless of which team plays at home or away
   for x in range(teams):
@@ -117,9 +120,14 @@ def tournament_SAT_scheduler(teams):
       for clause in exactly_one(games_per_team):
           s.add_clause(clause)
 
+  trace.counts({"vars": s.nof_vars(), "clauses": s.nof_clauses()})
+  trace.phase("solve")
   start = time.time()
   sat = s.solve()
   elapsed = int(time.time()-start)
+  trace.counts(s.accum_stats())
+  timing.report_solver_time(s.time_accum())
+  trace.phase("decode")
 
   # Check satisfiability
   if sat:
@@ -3,6 +3,8 @@ from itertools import combinations
 import pandas as pd
 from pysat.solvers import Minisat22
 import time
+from utils import trace
+from utils import timing
 
 # Define the variables
 teams = 6
@@ -49,6 +51,7 @@ def at_most_k(int_vars, k):
 
 # Generate a SAT model to solve the tournament scheduling problem, using the Minisat22 solver
 def tournament_SAT_scheduler(teams):
+  trace.phase("encode")
   # Check that the number of teams is even
   if teams % 2 != 0:
     print("Input error: n must be even.")
@@ -75,7 +78,7 @@ def tournament_SAT_scheduler(teams):
                 for x in range(teams)]
 
   # Initialize the Minisat22 solver
-  s = Minisat22()
+  s = Minisat22(use_timer=True)
 
   # Constraint: each team plays against each other team exactly once, regardless of which team plays at home or away
   for x in range(teams):
@@ -112,9 +115,14 @@ def tournament_SAT_scheduler(teams):
       for clause in exactly_one(games_per_team):
           s.add_clause(clause)
 
+  trace.counts({"vars": s.nof_vars(), "clauses": s.nof_clauses()})
+  trace.phase("solve")
   start = time.time()
   sat = s.solve()
   elapsed = int(time.time()- start)
+  trace.counts(s.accum_stats())
+  timing.report_solver_time(s.time_accum())
+  trace.phase("decode")
   # Check satisfiability
   if sat:
     m = s.get_model()
@@ -0,0 +1,9 @@
+from SAT.SAT1_preprocessed import tournament_SAT_scheduler as preprocessed_scheduler
+
+# SAT1 model solved with Minisat22 after CNF preprocessing
+def tournament_SAT_scheduler(teams):
+  return preprocessed_scheduler(teams, solver_name="minisat22")
+
+if __name__ == "__main__":
+  teams = int(input())
+  print(tournament_SAT_scheduler(teams))
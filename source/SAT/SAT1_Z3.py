@@ -2,6 +2,8 @@ from z3 import *
 import pandas as pd
 from itertools import combinations
 import time
+from utils import trace
+from utils import timing
 
 # Define the variables
 teams = 6
@@ -44,6 +46,7 @@ def at_most_k(bool_vars, k):
 
 # Generate a SAT model to solve the tournament scheduling problem, using the Z3 solver
 def tournament_SAT_scheduler(teams):
+  trace.phase("encode")
   # Check that the number of teams is even
   if teams % 2 != 0:
     print("Input error: n must be even.")
@@ -103,9 +106,14 @@ def tournament_SAT_scheduler(teams):
       s.add(exactly_one(matches))
 
   # Check satisfiability
+  trace.count("assertions", len(s.assertions()))
+  trace.phase("solve")
   start = time.time()
   sat_check = s.check()
   elapsed = int(time.time()- start)
+  trace.counts(trace.z3_counters(s.statistics()))
+  timing.report_solver_time(timing.z3_time(s.statistics()))
+  trace.phase("decode")
   if sat_check == sat:
     m = s.model()
     # print("SAT")
@@ -2,6 +2,9 @@ from z3 import *
 import pandas as pd
 from itertools import combinations
 import time
+from utils import trace
+from utils import timing
+from SAT.lex_encoding import lex_lessequal
 
 # Define the variables
 teams = 6
@@ -26,16 +29,6 @@ def display_tournament(sol):
   table.index = ['Period ' + str(i) for i in table.index]
   print(table)
 
-# Lexicographic less or equal comparison between two Boolean vectors
-def lex_lessequal(a, b):
-    assert len(a) == len(b) 
-    n = len(a)
-    strict_cases = [
-        And(*(a[j] == b[j] for j in range(i)), Not(a[i]), b[i])
-        for i in range(n)]
-    equal_case = And(*(a[j] == b[j] for j in range(n)))  # Case in which a is equal to b
-    return Or(equal_case, *strict_cases)
-
 # Cardinality constraint: at least one variable is True
 def at_least_one(bool_vars):
     return Or(bool_vars)
@@ -55,6 +48,7 @@ def at_most_k(bool_vars, k):
 # Generate a SAT model to solve the tournament scheduling problem, using the Z3 solver and some symmetry breaking constraints to reduce the
 # search space and improve the overall solver efficiency
 def tournament_SAT_scheduler(teams):
+  trace.phase("encode")
   # Check that the number of teams is even
   if teams % 2 != 0:
     print("Input error: n must be even.")
@@ -136,9 +130,14 @@ def tournament_SAT_scheduler(teams):
       s.add(exactly_one(matches))
 
   # Check satisfiability
+  trace.count("assertions", len(s.assertions()))
+  trace.phase("solve")
   start = time.time()
   sat_check = s.check()
   elapsed = int(time.time()-start)
+  trace.counts(trace.z3_counters(s.statistics()))
+  timing.report_solver_time(timing.z3_time(s.statistics()))
+  trace.phase("decode")
   if sat_check == sat:
     m = s.model()
     # print("SAT")
@@ -0,0 +1,46 @@
+import time
+from utils import trace
+from SAT.SAT1_cnf import build_cnf, decode
+from SAT.cnf import solve
+from SAT.symmetry import find_generators, add_lex_leader
+
+# SAT1 pysat model with automatic symmetry breaking: instead of the handwritten constraints of the _symbreak
+# versions, the symmetries of the generated CNF (team relabelings, period and week permutations, ...) are detected
+# by SAT.symmetry and broken with lex-leader clauses before solving.
+# The detection is bounded by DETECTION_TIME (the generators found by then are used) and counted in the reported
+# time, since the instance is only solved once; the trace has separate "symmetry" and "solve" phases.
+# The plain model solves n<=8 in a few seconds, so detection gets a few seconds too: at n=8 the first refinement
+# path does not fit in it and the formula is solved without lex-leader clauses.
+DETECTION_TIME = 5
+
+def tournament_SAT_scheduler(teams, solver_name="glucose3"):
+  trace.phase("encode")
+  # Check that the number of teams is even
+  if teams % 2 != 0:
+    print("Input error: n must be even")
+    return None
+
+  start = time.time()
+  cnf, games = build_cnf(teams)
+  trace.counts({"vars": cnf.nvars, "clauses": cnf.nof_clauses()})
+
+  trace.phase("symmetry")
+  generators = find_generators(cnf, time_limit=DETECTION_TIME)
+  lex_clauses = add_lex_leader(cnf, generators)
+  trace.counts({"generators": len(generators), "lex_clauses": lex_clauses})
+
+  trace.phase("solve")
+  sat, model, _, stats = solve(cnf, solver_name, time_limit=max(1, 300-(time.time()-start)))
+  elapsed = int(time.time() - start)
+  trace.counts(stats)
+  trace.phase("decode")
+  if sat:
+    return {"time":elapsed, "optimal":True, "obj": None, "sol":decode(model, games, teams)}
+  elif sat == False: # proved unsatisfiable
+    return {"time":elapsed, "optimal":True, "obj":None, "sol":[]}
+  else: # timed out with no solution
+    return {"time":300, "optimal":False, "obj":None, "sol":[]}
+
+if __name__ == "__main__":
+  teams = int(input())
+  print(tournament_SAT_scheduler(teams))
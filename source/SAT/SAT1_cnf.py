@@ -0,0 +1,61 @@
+from SAT.cnf import Cnf, exactly_one, at_most_k
+
+# CNF of the SAT1 pysat models (SAT1_Glucose3, SAT1_Minisat22 and their _symbreak versions): the same variables
+# games[x][y][w][p] (team x at home against y in week w and period p), numbered in the same order, and the same
+# constraints, collected in a Cnf instead of being sent to the solver one clause at a time.
+def build_cnf(teams, symbreak=False):
+  number_of_weeks = teams-1
+  number_of_periods = teams//2
+  WEEKS = range(number_of_weeks)
+  PERIODS = range(number_of_periods)
+
+  varnum = 1
+  games = [[[[None for p in PERIODS] for w in WEEKS] for y in range(teams)] for x in range(teams)]
+  for x in range(teams):
+    for y in range(teams):
+      if x!=y:
+        for w in WEEKS:
+          for p in PERIODS:
+            games[x][y][w][p] = varnum
+            varnum += 1
+  cnf = Cnf(varnum-1)
+
+  # Constraint: each team plays against each other team exactly once
+  for x in range(teams):
+    for y in range(x+1,teams):
+      exactly_one(cnf, [games[x][y][w][p] for w in WEEKS for p in PERIODS])
+
+  if symbreak:
+    # Symmetry breaking constraint: fix the first week matches
+    for p in PERIODS:
+      cnf.add_clause([games[p][p+number_of_periods][0][p]])
+
+  # Constraint: in each week and period only one match is scheduled
+  for w in WEEKS:
+    for p in PERIODS:
+      exactly_one(cnf, [games[x][y][w][p] for x in range(teams) for y in range(teams) if x!=y])
+
+  # Constraint: each team plays at most twice in the same period
+  for p in PERIODS:
+    for x in range(teams):
+      at_most_k(cnf, [g for w in WEEKS for y in range(teams) if y!=x for g in (games[x][y][w][p], games[y][x][w][p])], 2)
+
+  # Constraint: each team plays once a week, either at home or away
+  for x in range(teams):
+    for w in WEEKS:
+      exactly_one(cnf, [games[x][y][w][p] for y in range(teams) for p in PERIODS if y!=x] +
+                       [games[y][x][w][p] for y in range(teams) for p in PERIODS if y!=x])
+  return cnf, games
+
+# "sol" matrix of a pysat model (list of true and false literals)
+def decode(model, games, teams):
+  true_literals = set(literal for literal in model if literal > 0)
+  matrix = [[None for _ in range(teams-1)] for _ in range(teams//2)]
+  for x in range(teams):
+    for y in range(teams):
+      if x!=y:
+        for w in range(teams-1):
+          for p in range(teams//2):
+            if games[x][y][w][p] in true_literals:
+              matrix[p][w] = [x+1, y+1]
+  return matrix
@@ -0,0 +1,118 @@
+import os
+import time
+import queue
+import threading
+import multiprocessing as mp
+from pysat.solvers import Solver
+from utils import trace
+from utils import timing
+from SAT.SAT1_cnf import build_cnf, decode
+
+# Cube-and-conquer version of the SAT1 pysat model with symmetry breaking (week 1 fixed).
+# The search is split on the matches of week 2: a cube fixes the matches of the first `depth` periods of week 2
+# to pairs of distinct teams that did not meet in week 1 (the home team is the smaller one, as in every SAT1
+# solution). The cubes are shared through a queue by a pool of worker processes; each worker loads the formula
+# in its own pysat solver once and solves the cubes it takes under assumptions, keeping its learnt clauses from
+# one cube to the next. The first satisfiable cube stops all the workers; the instance is unsatisfiable only
+# once every cube has been refuted.
+
+# Each worker holds its own copy of the formula and of the learnt clauses: about 3.2GB at n=10. The number of
+# workers is capped by SAT_CUBE_WORKERS and by the memory available when the search starts.
+WORKER_MEMORY = 3.2e9
+MAX_WORKERS = int(os.environ.get("SAT_CUBE_WORKERS", 0)) or None
+
+def available_workers():
+  try:
+    memory = os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+  except (ValueError, OSError): # not reported on this platform
+    return os.cpu_count()
+  return max(1, min(os.cpu_count(), int(memory // WORKER_MEMORY)))
+
+# Assumption lists of the cubes
+def week2_cubes(teams, games, depth=1):
+  number_of_periods = teams//2
+  met = {(p, p+number_of_periods) for p in range(number_of_periods)}
+  cubes = [([], set())] # (assumptions, teams playing in the fixed matches)
+  for p in range(min(depth, number_of_periods)):
+    cubes = [(literals + [games[x][y][1][p]], busy | {x, y}) for literals, busy in cubes
+             for x in range(teams) for y in range(x+1, teams)
+             if (x, y) not in met and x not in busy and y not in busy]
+  return [literals for literals, _ in cubes]
+
+def _worker(cnf, solver_name, cubes, tasks, results, deadline):
+  with Solver(name=solver_name, use_timer=True) as s:
+    for clause in cnf.clauses():
+      s.add_clause(clause)
+    while True:
+      index = tasks.get()
+      if index is None:
+        return
+      timer = threading.Timer(max(0, deadline-time.time()), s.interrupt)
+      timer.start()
+      status = s.solve_limited(assumptions=cubes[index], expect_interrupt=True)
+      timer.cancel()
+      results.put((index, status, s.get_model() if status else None, s.time()))
+      if status is None:
+        return
+
+def tournament_SAT_scheduler(teams, solver_name="glucose3", workers=None, depth=1):
+  trace.phase("encode")
+  # Check that the number of teams is even
+  if teams % 2 != 0:
+    print("Input error: n must be even")
+    return None
+
+  start = time.time()
+  deadline = start+300
+  cnf, games = build_cnf(teams, symbreak=True)
+  cubes = week2_cubes(teams, games, depth)
+  workers = min(workers or MAX_WORKERS or os.cpu_count(), available_workers(), max(1, len(cubes)))
+  trace.counts({"vars": cnf.nvars, "clauses": cnf.nof_clauses(), "cubes": len(cubes), "workers": workers})
+
+  trace.phase("solve")
+  context = mp.get_context("fork")
+  tasks = context.Queue()
+  results = context.Queue()
+  for index in range(len(cubes)):
+    tasks.put(index)
+  for _ in range(workers):
+    tasks.put(None)
+  processes = [context.Process(target=_worker, args=(cnf, solver_name, cubes, tasks, results, deadline))
+               for _ in range(workers)]
+  for process in processes:
+    process.start()
+
+  sat, model, refuted = False, None, 0
+  try:
+    while refuted < len(cubes):
+      try:
+        index, status, cube_model, cube_time = results.get(timeout=max(0, deadline-time.time()))
+        timing.report_solver_time(cube_time)
+      except queue.Empty:
+        status = None
+      if status is None: # time limit
+        sat = None
+        break
+      if status:
+        sat, model = True, cube_model
+        break
+      refuted += 1
+  finally:
+    for process in processes:
+      process.kill()
+    for process in processes:
+      process.join()
+  elapsed = int(time.time() - start)
+  trace.count("refuted_cubes", refuted)
+
+  trace.phase("decode")
+  if sat:
+    return {"time":elapsed, "optimal":True, "obj": None, "sol":decode(model, games, teams)}
+  elif sat == False: # every cube refuted
+    return {"time":elapsed, "optimal":True, "obj":None, "sol":[]}
+  else: # timed out with no solution
+    return {"time":300, "optimal":False, "obj":None, "sol":[]}
+
+if __name__ == "__main__":
+  teams = int(input())
+  print(tournament_SAT_scheduler(teams))
@@ -0,0 +1,44 @@
+import time
+from utils import trace
+from SAT.SAT1_cnf import build_cnf, decode
+from SAT.cnf import solve
+from SAT.preprocess import Preprocessed
+
+# SAT1 pysat model (with or without the symmetry breaking of the _symbreak versions) simplified by SAT.preprocess
+# before solving. The reported time covers encoding, preprocessing and solving; "preprocess_time" in the result
+# is the preprocessing alone, and the trace has the clause counts before and after it. At n=8 preprocessing
+# takes about 25s to remove under 1% of the clauses, so these keys are not in the valid_teams.json sweep.
+def tournament_SAT_scheduler(teams, solver_name="glucose3", symbreak=False, **techniques):
+  trace.phase("encode")
+  # Check that the number of teams is even
+  if teams % 2 != 0:
+    print("Input error: n must be even")
+    return None
+
+  start = time.time()
+  cnf, games = build_cnf(teams, symbreak)
+
+  trace.phase("preprocess")
+  preprocess_start = time.time()
+  preprocessed = Preprocessed(cnf, **techniques)
+  preprocess_time = round(time.time() - preprocess_start, 3)
+  trace.counts(preprocessed.stats)
+
+  trace.phase("solve")
+  if preprocessed.status == False: # unsatisfiable found by the preprocessor
+    sat, model, stats = False, None, {}
+  else:
+    sat, model, _, stats = solve(preprocessed.cnf, solver_name, time_limit=max(1, 300-(time.time()-start)))
+  elapsed = int(time.time() - start)
+  trace.counts(stats)
+  trace.phase("decode")
+  if sat:
+    return {"time":elapsed, "optimal":True, "obj": None, "sol":decode(preprocessed.restore(model), games, teams), "preprocess_time":preprocess_time}
+  elif sat == False: # proved unsatisfiable
+    return {"time":elapsed, "optimal":True, "obj":None, "sol":[], "preprocess_time":preprocess_time}
+  else: # timed out with no solution
+    return {"time":300, "optimal":False, "obj":None, "sol":[], "preprocess_time":preprocess_time}
+
+if __name__ == "__main__":
+  teams = int(input())
+  print(tournament_SAT_scheduler(teams))
@@ -0,0 +1,149 @@
+from z3 import *
+from itertools import combinations
+import time
+from utils import trace
+from utils import timing
+from SAT.lex_encoding import lex_lessequal
+
+# Variant of the SAT2 home/away model with explicit match variables.
+# SAT2_Z3 rebuilds the match of x at home against y in week w and period p as And(is_home[x][w][p], is_away[y][w][p])
+# inside every constraint that needs it, so the same conjunctions are repeated in the pair-once and the
+# one-match-per-slot constraints and nested in their pairwise "exactly one" expansions. Here each match is one
+# Bool, match[x][y][w][p], defined once by its Tseitin clauses
+#   match -> is_home[x], match -> is_away[y], is_home[x] and is_away[y] -> match
+# and the cardinality constraints are applied to the match literals.
+
+# Cardinality constraint: at least one variable is True
+def at_least_one(bool_vars):
+    return Or(bool_vars)
+
+# Cardinality constraint: at most one variable is True (the negations are built once, not once per pair)
+def at_most_one(bool_vars):
+    negated = [Not(x) for x in bool_vars]
+    return And([Or(pair[0], pair[1]) for pair in combinations(negated, 2)])
+
+# Cardinality constraint: exactly one variable is True
+def exactly_one(bool_vars):
+    return And(at_least_one(bool_vars), at_most_one(bool_vars))
+
+# Cardinality constraint: at most k variables are True
+def at_most_k(bool_vars, k):
+    negated = [Not(x) for x in bool_vars]
+    return And([Or(X) for X in combinations(negated, k + 1)])
+
+# Build the solver with all the constraints; with symbreak, the symmetry breaking constraints of SAT2_Z3_symbreak
+# are added
+def build_solver(teams, symbreak=False):
+  number_of_weeks = teams-1
+  number_of_periods = teams//2
+  WEEKS = range(number_of_weeks)
+  PERIODS = range(number_of_periods)
+
+  is_home = [[[Bool(f"is_home_{x+1}_{w+1}_{p+1}") for p in PERIODS] for w in WEEKS] for x in range(teams)]
+  is_away = [[[Bool(f"is_away_{x+1}_{w+1}_{p+1}") for p in PERIODS] for w in WEEKS] for x in range(teams)]
+  # match[x][y][w][p] is True if team x plays at home against team y in week w and period p (None if x == y)
+  match = [[[[None if x==y else Bool(f"match_{x+1}_{y+1}_{w+1}_{p+1}") for p in PERIODS] for w in WEEKS]
+            for y in range(teams)] for x in range(teams)]
+
+  s = Solver()
+  s.set("timeout",300000)
+
+  # Tseitin definition of the match literals
+  definitions = []
+  for x in range(teams):
+    for y in range(teams):
+      if x!=y:
+        for w in WEEKS:
+          for p in PERIODS:
+            m = match[x][y][w][p]
+            definitions += [Or(Not(m), is_home[x][w][p]), Or(Not(m), is_away[y][w][p]),
+                            Or(m, Not(is_home[x][w][p]), Not(is_away[y][w][p]))]
+  s.add(And(definitions))
+
+  # Constraint: a team is not both at home and away in the same week and period
+  for x in range(teams):
+    for w in WEEKS:
+      for p in PERIODS:
+        s.add(Or(Not(is_home[x][w][p]), Not(is_away[x][w][p])))
+
+  # Constraint: each team plays against each other team exactly once, regardless of which team plays at home or away
+  for x in range(teams):
+    for y in range(x+1,teams):
+      s.add(exactly_one([match[x][y][w][p] for w in WEEKS for p in PERIODS] +
+                        [match[y][x][w][p] for w in WEEKS for p in PERIODS]))
+
+  # Constraint: in each week and period only one match is scheduled
+  for w in WEEKS:
+    for p in PERIODS:
+      s.add(exactly_one([match[x][y][w][p] for x in range(teams) for y in range(teams) if x!=y]))
+
+  # Constraint: each team plays at most twice in the same period
+  for p in PERIODS:
+    for x in range(teams):
+      s.add(at_most_k([v for w in WEEKS for v in (is_home[x][w][p], is_away[x][w][p])], 2))
+
+  # Constraint: each team plays once a week, either at home or away
+  for x in range(teams):
+    for w in WEEKS:
+      s.add(exactly_one([v for p in PERIODS for v in (is_home[x][w][p], is_away[x][w][p])]))
+
+  if symbreak:
+    # Symmetry breaking constraint: fix the first week (index 0) matches
+    for p in PERIODS:
+      s.add(match[p][p+number_of_periods][0][p])
+
+    # Symmetry breaking constraint: lexicographical ordering between consecutive weeks
+    for w in range(number_of_weeks - 1):
+      week_i = [is_home[x][w][p] for x in range(teams-1,-1,-1) for p in PERIODS]
+      week_i_plus_1 = [is_home[x][w+1][p] for x in range(teams-1,-1,-1) for p in PERIODS]
+      s.add(lex_lessequal(week_i, week_i_plus_1))
+
+    # Symmetry breaking constraint: from week 2 on, the home team of a match is the one with the larger number
+    for w in range(1,number_of_weeks):
+      for p in PERIODS:
+        for x in range(teams):
+          for y in range(x+1,teams):
+            s.add(Not(match[x][y][w][p]))
+
+  return s, match
+
+# Generate a SAT model with explicit match variables to solve the tournament scheduling problem, using the Z3 solver
+def tournament_SAT_scheduler(teams, symbreak=False):
+  trace.phase("encode")
+  # Check that the number of teams is even
+  if teams % 2 != 0:
+    print("Input error: n must be even")
+    return None
+
+  number_of_weeks = teams-1
+  number_of_periods = teams//2
+  s, match = build_solver(teams, symbreak)
+
+  # Check satisfiability
+  trace.count("assertions", len(s.assertions()))
+  trace.phase("solve")
+  start = time.time()
+  sat_check = s.check()
+  elapsed = int(time.time()-start)
+  trace.counts(trace.z3_counters(s.statistics()))
+  timing.report_solver_time(timing.z3_time(s.statistics()))
+  trace.phase("decode")
+  if sat_check == sat:
+    m = s.model()
+    matrix = [[None for _ in range(number_of_weeks)] for _ in range(number_of_periods)]
+    for x in range(teams):
+      for y in range(teams):
+        if x!=y:
+          for w in range(number_of_weeks):
+            for p in range(number_of_periods):
+              if is_true(m.evaluate(match[x][y][w][p])):
+                matrix[p][w] = [x+1, y+1]
+    return {"time":elapsed, "optimal":True, "obj": None, "sol":matrix}
+  elif sat_check == unsat:
+    return {"time":elapsed, "optimal":True, "obj":None, "sol":[]}
+  else:
+    return {"time":300, "optimal":False, "obj":None, "sol":[]}
+
+if __name__ == "__main__":
+  teams = int(input())
+  print(tournament_SAT_scheduler(teams))
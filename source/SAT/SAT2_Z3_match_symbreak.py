@@ -0,0 +1,9 @@
+from SAT.SAT2_Z3_match import tournament_SAT_scheduler as match_scheduler
+
+# SAT2 model with explicit match variables and the symmetry breaking constraints of SAT2_Z3_symbreak
+def tournament_SAT_scheduler(teams):
+  return match_scheduler(teams, symbreak=True)
+
+if __name__ == "__main__":
+  teams = int(input())
+  print(tournament_SAT_scheduler(teams))
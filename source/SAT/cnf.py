@@ -0,0 +1,93 @@
+import time
+import threading
+from itertools import combinations
+import numpy as np
+from pysat.solvers import Solver
+from utils import timing
+
+# CNF formula kept in flat arrays, for the passes that transform the formula of a pysat model before solving it
+# (symmetry breaking, preprocessing). Clauses of the same length are stored as rows of a 2D block, so the
+# pairwise and at-most-k expansions are generated with numpy and a formula of tens of millions of clauses stays
+# in a few hundred MB; literals are pysat integers (v or -v, variables from 1 to nvars).
+class Cnf:
+  def __init__(self, nvars=0):
+    self.nvars = nvars
+    self._blocks = []
+    self._pending = []
+    self._arrays = None
+
+  def new_var(self):
+    self.nvars += 1
+    return self.nvars
+
+  def add_clause(self, clause):
+    self._pending.append(list(clause))
+    self._arrays = None
+
+  # Add the rows of a 2D integer array as clauses
+  def add_block(self, block):
+    block = np.asarray(block, dtype=np.int32)
+    if block.size:
+      self._blocks.append(block)
+      self._arrays = None
+
+  def _flush(self):
+    by_length = {}
+    for clause in self._pending:
+      by_length.setdefault(len(clause), []).append(clause)
+    for clauses in by_length.values():
+      self._blocks.append(np.array(clauses, dtype=np.int32))
+    self._pending = []
+
+  # (literals, offsets): clause i is literals[offsets[i]:offsets[i+1]]
+  def arrays(self):
+    if self._arrays is None:
+      self._flush()
+      literals = np.concatenate([block.ravel() for block in self._blocks]) if self._blocks else np.zeros(0, np.int32)
+      lengths = np.concatenate([np.full(len(block), block.shape[1]) for block in self._blocks]) if self._blocks \
+        else np.zeros(0, np.int64)
+      self._arrays = (literals, np.concatenate(([0], np.cumsum(lengths))))
+    return self._arrays
+
+  def nof_clauses(self):
+    return len(self.arrays()[1]) - 1
+
+  def clauses(self):
+    self._flush()
+    for block in self._blocks:
+      yield from block.tolist()
+
+
+# Index tuples of the k-subsets of range(m), cached since the models expand many lists of the same length
+_subsets = {}
+def subsets(m, k):
+  if (m, k) not in _subsets:
+    _subsets[(m, k)] = np.array(list(combinations(range(m), k)), dtype=np.int64).reshape(-1, k)
+  return _subsets[(m, k)]
+
+# Cardinality constraints of the pysat models, added to a Cnf
+def exactly_one(cnf, literals):
+  cnf.add_clause(literals)
+  at_most_k(cnf, literals, 1)
+
+def at_most_k(cnf, literals, k):
+  literals = np.asarray(literals, dtype=np.int32)
+  if len(literals) > k:
+    cnf.add_block(-literals[subsets(len(literals), k+1)])
+
+
+# Solve a Cnf with a pysat solver within the time limit.
+# Returns (status, model, solve time, solver statistics): status True (sat), False (unsat) or None (time limit)
+def solve(cnf, solver_name, time_limit=300, assumptions=()):
+  with Solver(name=solver_name, use_timer=True) as s:
+    for clause in cnf.clauses():
+      s.add_clause(clause)
+    timer = threading.Timer(time_limit, s.interrupt)
+    start = time.perf_counter()
+    timer.start()
+    status = s.solve_limited(assumptions=list(assumptions), expect_interrupt=True)
+    timer.cancel()
+    solve_time = time.perf_counter()-start
+    timing.report_solver_time(s.time_accum())
+    model = s.get_model() if status else None
+    return status, model, solve_time, s.accum_stats()
@@ -0,0 +1,39 @@
+from z3 import And, Or, Not, FreshBool
+
+
+# Linear-size encoding of the lexicographic ordering a <= b between two Boolean vectors (False < True).
+# An auxiliary literal e[i] is forced true when a[0..i-1] == b[0..i-1]; the clauses are, for each position i:
+#   e[i] -> (a[i] -> b[i])
+#   e[i] and a[i] == b[i] -> e[i+1]
+# with e[0] true. That is 3 clauses of at most 4 literals and one auxiliary variable per position, instead of the
+# quadratic disjunction over the prefixes of the direct encoding. e[i] may also be true when the prefixes differ,
+# but then the solver can always set it false, so the solutions on a and b are exactly the lex ordered ones.
+# The clauses are built over generic literals, so the Z3 and the pysat models share the same encoding.
+def lex_lessequal_clauses(a, b, new_var, neg):
+  assert len(a) == len(b)
+  clauses = []
+  equal = None # e[0]: the empty prefixes are equal
+  for i in range(len(a)):
+    prefix = [] if equal is None else [neg(equal)]
+    clauses.append(prefix + [neg(a[i]), b[i]])
+    if i == len(a)-1:
+      break
+    equal_next = new_var()
+    clauses.append(prefix + [a[i], b[i], equal_next])
+    clauses.append(prefix + [neg(a[i]), neg(b[i]), equal_next])
+    equal = equal_next
+  return clauses
+
+# Z3 version over Bool expressions, with fresh auxiliary Bools
+def lex_lessequal(a, b):
+  clauses = lex_lessequal_clauses(a, b, lambda: FreshBool("lex_eq"), Not)
+  return And([Or(clause) for clause in clauses])
+
+# pysat version over integer literals; next_var is the first free variable, returns (clauses, next free variable)
+def lex_lessequal_cnf(a, b, next_var):
+  counter = [next_var]
+  def new_var():
+    counter[0] += 1
+    return counter[0]-1
+  clauses = lex_lessequal_clauses(a, b, new_var, lambda literal: -literal)
+  return clauses, counter[0]
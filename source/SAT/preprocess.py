@@ -0,0 +1,35 @@
+import time
+from pysat.process import Processor
+from SAT.cnf import Cnf
+
+# Optional preprocessing of a Cnf before solving, with the CaDiCaL preprocessor shipped with pysat.
+# Unit propagation is always done; subsumption, bounded variable elimination and failed literal probing can be
+# switched off one by one. The other CaDiCaL techniques (vivification, equivalent literal substitution, blocked and
+# covered clause elimination) are left off, so the benchmark measures the techniques above only.
+# Eliminated variables are not in the simplified formula: restore() rebuilds a model of the original formula from a
+# model of the simplified one, so decoding works on the original variables as without preprocessing.
+TECHNIQUES = ("subsume", "elim", "probe")
+
+class Preprocessed:
+  def __init__(self, cnf, rounds=1, **techniques):
+    unknown = set(techniques) - set(TECHNIQUES)
+    if unknown:
+      raise ValueError(f"unknown preprocessing techniques: {', '.join(sorted(unknown))}")
+    enabled = {name: techniques.get(name, True) for name in TECHNIQUES}
+
+    start = time.perf_counter()
+    self._processor = Processor(bootstrap_with=cnf.clauses())
+    processed = self._processor.process(rounds=rounds, vivify=False, decompose=False, block=False, cover=False,
+                                        condition=False, probehbr=enabled["probe"], **enabled)
+    self.time = time.perf_counter()-start
+    # False if the preprocessor proved the formula unsatisfiable
+    self.status = processed.status
+    self.cnf = Cnf(cnf.nvars)
+    for clause in processed.clauses:
+      self.cnf.add_clause(clause)
+    self.stats = {"clauses_before": cnf.nof_clauses(), "clauses_after": self.cnf.nof_clauses(),
+                  "preprocess_time": round(self.time, 3)}
+
+  # Model of the original formula from a model of the simplified one
+  def restore(self, model):
+    return self._processor.restore(model)
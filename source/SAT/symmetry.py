@@ -0,0 +1,224 @@
+import time
+import numpy as np
+from SAT.lex_encoding import lex_lessequal_cnf
+
+# Static symmetry detection and breaking on a Cnf.
+# The formula is seen as a graph with one vertex per literal (x and -x joined by an edge) and one vertex per
+# clause joined to its literals; a permutation of the literals that maps the clauses onto the clauses (and -x to
+# the negation of the image of x) is a symmetry of the formula. Generators of the symmetry group are found with an
+# individualization-refinement search, as in graph automorphism tools:
+#  - color refinement: the color of a literal is repeatedly refined with the multiset of the colors of its
+#    clauses (a clause being colored by the multiset of its literal colors) until the partition is stable;
+#  - the first path individualizes a literal of the smallest non-singleton cell and refines, until every literal
+#    has its own color: that leaf labels the literals;
+#  - going back up the path, every other literal of the cell individualized at each level (except those already
+#    in the orbit of the first one) is tried in its place, and the search goes down again choosing in the cells of
+#    the same colors as the first path; a leaf with the same colors defines a candidate permutation, kept if it
+#    is a symmetry.
+# Colors are multiset hashes of 64-bit mixed values: refinement only depends on the colors, so equal labels in two
+# leaves mean equal refinement histories, and candidates are checked against the clauses before being kept: the
+# sorted multiset of clause hashes is a cheap pre-filter, then the mapped clauses (literals sorted within each
+# clause, clauses sorted by length and contents) are compared exactly with the clauses of the formula.
+# The symmetries are then broken with lex-leader constraints: for each generator g, assignment <= g(assignment)
+# in the variable order, encoded with the linear-size lex encoding of SAT.lex_encoding.
+
+def _mix(values, salt):
+  # splitmix64 finalizer
+  z = (values.astype(np.uint64) + np.uint64(salt)) * np.uint64(0x9E3779B97F4A7C15)
+  z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+  z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+  return z ^ (z >> np.uint64(31))
+
+def _segment_sum(values, offsets):
+  # sums of values[offsets[i]:offsets[i+1]], 0 for empty segments (uint64, wrapping)
+  counts = np.diff(offsets)
+  sums = np.add.reduceat(np.append(values, np.uint64(0)), np.minimum(offsets[:-1], len(values)))
+  sums[counts == 0] = 0
+  return sums
+
+
+class _LiteralGraph:
+  def __init__(self, cnf):
+    literals, offsets = cnf.arrays()
+    self.nvars = cnf.nvars
+    self.nodes = 2*self.nvars
+    # literal v -> node 2(v-1), -v -> node 2(v-1)+1; the negation of node u is u ^ 1
+    self.occurrences = (2*(np.abs(literals)-1) + (literals < 0)).astype(np.int32)
+    self.clause_offsets = offsets.astype(np.int64)
+    clause_of = np.repeat(np.arange(len(offsets)-1, dtype=np.int32), np.diff(offsets))
+    self.clause_of = clause_of
+    lengths = np.diff(self.clause_offsets)
+    self.clauses_by_length = {int(length): np.flatnonzero(lengths == length) for length in np.unique(lengths)
+                              if length > 0}
+    order = np.argsort(self.occurrences, kind="stable")
+    self.clauses_by_literal = clause_of[order]
+    self.literal_offsets = np.concatenate(([0], np.cumsum(np.bincount(self.occurrences, minlength=self.nodes))))
+    self.negation = np.arange(self.nodes) ^ 1
+    self.clause_key = np.sort(self._clause_hashes(np.arange(self.nodes)))
+    self.clause_rows = None
+
+  # Order-independent hash of every clause after renaming the literal nodes with mapping
+  def _clause_hashes(self, mapping):
+    first = _mix(mapping, 1)[self.occurrences]
+    second = _mix(mapping, 2)[self.occurrences]
+    return _segment_sum(first, self.clause_offsets) ^ (_segment_sum(second, self.clause_offsets) >> np.uint64(1))
+
+  # Clauses after renaming the literal nodes with mapping, as one array per clause length: the literals of every
+  # clause sorted, the rows (clauses) sorted lexicographically
+  def _sorted_clauses(self, mapping):
+    mapped = mapping[self.occurrences]
+    mapped = mapped[np.lexsort((mapped, self.clause_of))]
+    rows = {}
+    for length, clauses in self.clauses_by_length.items():
+      block = mapped[self.clause_offsets[clauses][:, None] + np.arange(length)]
+      rows[length] = block[np.lexsort(block.T[::-1])]
+    return rows
+
+  # Stable refinement of the coloring (colors: int64 per node, numbered from 0)
+  def refine(self, colors):
+    count = len(np.unique(colors))
+    while True:
+      # values are mixed once per node or clause and then gathered along the (much longer) occurrence lists
+      clause_hash = _segment_sum(_mix(colors, 3)[self.occurrences], self.clause_offsets)
+      signature = _segment_sum(_mix(clause_hash, 4)[self.clauses_by_literal], self.literal_offsets) \
+        + _mix(colors[self.negation], 5)
+      order = np.lexsort((signature, colors))
+      sorted_colors = colors[order]
+      sorted_signature = signature[order]
+      new_cell = np.concatenate(([True], (sorted_colors[1:] != sorted_colors[:-1]) |
+                                 (sorted_signature[1:] != sorted_signature[:-1])))
+      refined = np.empty_like(colors)
+      refined[order] = np.cumsum(new_cell)-1
+      new_count = int(refined.max())+1
+      colors = refined
+      if new_count == count:
+        return colors
+      count = new_count
+
+  def is_symmetry(self, mapping):
+    if not np.array_equal(mapping[self.negation], mapping ^ 1):
+      return False
+    if not np.array_equal(np.sort(self._clause_hashes(mapping)), self.clause_key):
+      return False
+    if self.clause_rows is None:
+      self.clause_rows = self._sorted_clauses(np.arange(self.nodes))
+    rows = self._sorted_clauses(mapping)
+    return all(np.array_equal(rows[length], self.clause_rows[length]) for length in self.clause_rows)
+
+
+def _individualize(colors, node):
+  # the node gets a new color right after its cell (the other colors are shifted), so that the numbering stays
+  # determined by the refinement history only
+  colors = colors.copy()
+  color = colors[node]
+  colors[colors > color] += 1
+  colors[node] = color+1
+  return colors
+
+def _target_cell(colors):
+  sizes = np.bincount(colors)
+  candidates = np.flatnonzero(sizes > 1)
+  if len(candidates) == 0:
+    return None
+  return int(candidates[np.argmin(sizes[candidates])])
+
+
+class _Orbits:
+  def __init__(self, size):
+    self.parent = np.arange(size)
+
+  def find(self, x):
+    while self.parent[x] != x:
+      self.parent[x] = self.parent[self.parent[x]]
+      x = self.parent[x]
+    return x
+
+  def add(self, mapping):
+    for x in np.flatnonzero(mapping != np.arange(len(mapping))):
+      a, b = self.find(x), self.find(mapping[x])
+      if a != b:
+        self.parent[max(a, b)] = min(a, b)
+
+
+# Generators of the symmetry group of the formula, as permutations of the literal nodes; the search stops at the
+# time limit with the generators found so far (none if the first path is not complete by then: every refinement
+# goes over all the clause occurrences, about 1.3s at n=8, and the first path alone takes 13 of them)
+def find_generators(cnf, time_limit=5, max_leaves=32):
+  start = time.perf_counter()
+  graph = _LiteralGraph(cnf)
+  colors = graph.refine(np.zeros(graph.nodes, dtype=np.int64))
+
+  # first path
+  path = []
+  while True:
+    cell = _target_cell(colors)
+    if cell is None:
+      break
+    if time.perf_counter()-start > time_limit:
+      return []
+    members = np.flatnonzero(colors == cell)
+    path.append((colors, cell, members))
+    colors = graph.refine(_individualize(colors, members[0]))
+  first_leaf = np.argsort(colors) # node of each label
+  histograms = [np.bincount(level[0]) for level in path[1:]] + [None]
+
+  def descend(colors, level, budget):
+    # a leaf compatible with the first path, whose labeling is a symmetry; budget counts the leaves left to try
+    if level == len(path):
+      mapping = np.empty(graph.nodes, dtype=np.int64)
+      mapping[first_leaf] = np.argsort(colors)
+      return (mapping if graph.is_symmetry(mapping) else None), budget-1
+    _, cell, _ = path[level]
+    for node in np.flatnonzero(colors == cell):
+      if budget <= 0 or time.perf_counter()-start > time_limit:
+        return None, 0
+      refined = graph.refine(_individualize(colors, node))
+      if histograms[level] is not None and not np.array_equal(np.bincount(refined), histograms[level]):
+        continue
+      if histograms[level] is None and refined.max()+1 != graph.nodes:
+        continue
+      mapping, budget = descend(refined, level+1, budget)
+      if mapping is not None:
+        return mapping, budget
+    return None, budget
+
+  generators = []
+  orbits = _Orbits(graph.nodes)
+  for level in range(len(path)-1, -1, -1):
+    colors, cell, members = path[level]
+    first = members[0]
+    for node in members[1:]:
+      if time.perf_counter()-start > time_limit:
+        return generators
+      if orbits.find(node) == orbits.find(first):
+        continue
+      refined = graph.refine(_individualize(colors, node))
+      expected = histograms[level]
+      if expected is not None and not np.array_equal(np.bincount(refined), expected):
+        continue
+      mapping, _ = descend(refined, level+1, max_leaves)
+      if mapping is not None:
+        generators.append(mapping)
+        orbits.add(mapping)
+  return generators
+
+# Add the lex-leader constraints of the generators to the formula: assignment <= g(assignment), comparing the
+# variables in increasing order over the support of g
+def add_lex_leader(cnf, generators):
+  nvars = cnf.nvars
+  clauses = 0
+  for mapping in generators:
+    images = mapping[0::2] # image of the positive literal of each variable
+    a = []
+    b = [None]*nvars
+    for v, image in enumerate(images):
+      b[image//2] = -(v+1) if image % 2 else v+1
+    for j in range(nvars):
+      if b[j] != j+1:
+        a.append(j+1)
+    lex_clauses, next_var = lex_lessequal_cnf(a, [b[j-1] for j in a], cnf.nvars+1)
+    cnf.nvars = next_var-1
+    for clause in lex_clauses:
+      cnf.add_clause(clause)
+    clauses += len(lex_clauses)
+  return clauses
@@ -0,0 +1,12 @@
+from SMT.SMT_Z3_symbreak import tournament_SMT_scheduler as feasibility_scheduler
+from utils.orientation import balanced_result
+from utils.schedule import home_spread
+
+# Optimization model: solve the symmetry breaking feasibility model, then re-orient the matches
+# to an optimal home/away balance (max_home - min_home = 1)
+def tournament_SMT_scheduler(teams):
+  return balanced_result(feasibility_scheduler(teams), objective=home_spread)
+
+if __name__ == "__main__":
+  teams = int(input())
+  sol = tournament_SMT_scheduler(teams)
@@ -1,6 +1,8 @@
 from z3 import *
 import pandas as pd
 import time
+from utils import trace
+from utils import timing
 
 # Define the variables
 teams = 6
@@ -29,6 +31,7 @@ def display_tournament(sol):
 # Generate a SMT model to solve the tournament scheduling problem, using the Z3 solver and some symmetry breaking constraints to reduce the
 # search space and improve the overall solver efficiency
 def tournament_SMT_scheduler(teams):
+  trace.phase("encode")
   # Check that the number of teams is even
   if teams % 2 != 0:
     print("Input error: n must be even")
@@ -92,9 +95,14 @@ def tournament_SMT_scheduler(teams):
     s.add(Distinct(all_teams))
 
   # Check satisfiability
+  trace.count("assertions", len(s.assertions()))
+  trace.phase("solve")
   start = time.time()
   sat_check = s.check()
   elapsed = int(time.time()-start)
+  trace.counts(trace.z3_counters(s.statistics()))
+  timing.report_solver_time(timing.z3_time(s.statistics()))
+  trace.phase("decode")
 
   if sat_check == sat:
     m = s.model()
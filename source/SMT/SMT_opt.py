@@ -1,6 +1,10 @@
 from z3 import *
 import pandas as pd
 import time
+from utils import trace
+from utils import timing
+from utils import incumbent_bus
+from utils import bounds
 
 # Define the variables
 teams = 6
@@ -28,6 +32,7 @@ def display_tournament(sol):
 
 # Generate a SMT model to solve the tournament scheduling problem, using the Z3 solver
 def tournament_SMT_scheduler(teams):
+  trace.phase("encode")
   # Check that the number of teams is even
   if teams % 2 != 0:
     print("Input error: n must be even")
@@ -114,10 +119,38 @@ def tournament_SMT_scheduler(teams):
   # Balance the number of home and away games
   s.minimize(max_home - min_home)
 
+  # Incumbent bus (utils/incumbent_bus.py): the objective is bounded by the best home spread of the schedules
+  # published by the other running models, and every improving model found by the optimizer is published
+  shared = incumbent_bus.best(teams, "home_spread")
+  if shared is not None:
+    s.add(max_home - min_home <= shared[0])
+
+  # Lower bound of the objective (utils/bounds.py): each team plays an odd number of matches, so the home counts
+  # cannot all be equal. It is added as a constraint, and the optimizer is interrupted as soon as a model reaches it
+  # (the model is optimal for the home spread; the soft constraints are left as they are in that model)
+  lower_bound = bounds.lower_bound(teams, "home_spread")
+  s.add(max_home - min_home >= lower_bound)
+  proven = []
+  def on_model(m):
+    if incumbent_bus.enabled():
+      matrix = [[[m.eval(home_team[w][p], model_completion=True).as_long(),
+                  m.eval(away_team[w][p], model_completion=True).as_long()] for w in range(number_of_weeks)]
+                for p in range(number_of_periods)]
+      incumbent_bus.publish(teams, matrix, "SMT")
+    if m.eval(max_home - min_home, model_completion=True).as_long() <= lower_bound:
+      proven.append(True)
+      s.ctx.interrupt()
+  s.set_on_model(on_model)
+
   # Check satisfiability
+  trace.count("assertions", len(s.assertions()))
+  trace.phase("solve")
   start = time.time()
   result = s.check()
   elapsed = int(time.time()-start)
+  trace.counts(trace.z3_counters(s.statistics()))
+  timing.report_solver_time(timing.z3_time(s.statistics()))
+  trace.phase("decode")
   if result == unsat:
     return {"time": elapsed, "optimal": True, "obj":None, "sol":[]}
   elif result == unknown:
@@ -132,6 +165,9 @@ def tournament_SMT_scheduler(teams):
     matrix = [[None for _ in range(number_of_weeks)] for _ in range(number_of_periods)]
     for team1, team2, w, p in schedule:
         matrix[p][w] = [team1, team2]
+    if proven:
+      # interrupted on a model reaching the lower bound
+      return {"time": elapsed, "optimal": True, "obj":obj_val, "sol":matrix}
     return {"time": 300, "optimal": False, "obj":obj_val, "sol":matrix}
   else: # optimal solution
     m = s.model()
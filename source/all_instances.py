@@ -1,174 +1,23 @@
-#import sys
-import time, json
+import time
+import argparse
+import traceback
 from pathlib import Path
+from utils import trace
+from utils.results_json import update_result_file
+from utils.result_store import record_run
+from utils.schedule_npy import save_schedule, remove_schedule, schedule_path, to_array
+from utils.timing import timed_run, run_isolated, SolverCrash, TIME_LIMIT
+from utils.ledger import JobLedger, job_key, current_config, saved_results, pending_jobs
+from utils.prediction import RuntimePredictor, predicted_timeout_result, budget_exceeded_result
 
+import_start = time.perf_counter()
 # Import the needed solvers
-from SAT.SAT1_Z3 import tournament_SAT_scheduler as z3_1
-from SAT.SAT1_Z3_symbreak import tournament_SAT_scheduler as z3_1_symbreak
-from SAT.SAT1_Minisat22 import tournament_SAT_scheduler as minisat22_1
-from SAT.SAT1_Minisat22_symbreak import tournament_SAT_scheduler as minisat22_1_symbreak
-from SAT.SAT1_Glucose3 import tournament_SAT_scheduler as glucose3_1
-from SAT.SAT1_Glucose3_symbreak import tournament_SAT_scheduler as glucose3_1_symbreak
-from SAT.SAT2_Z3 import tournament_SAT_scheduler as z3_2
-from SAT.SAT2_Z3_symbreak import tournament_SAT_scheduler as z3_2_symbreak
-from SMT.SMT_Z3 import tournament_SMT_scheduler as z3
-from SMT.SMT_Z3_symbreak import tournament_SMT_scheduler as z3_symbreak
-from SMT.SMT_opt import tournament_SMT_scheduler as z3_opt
-from SMT.SMT_opt_symbreak import tournament_SMT_scheduler as z3_opt_symbreak
-from MIP.mip_base_model_cbc import tournament_MIP_scheduler as solve_base_cbc
-from MIP.mip_base_model_opt_cbc import tournament_MIP_scheduler as solve_base_opt_cbc
-from MIP.mip_model_cbc import tournament_MIP_scheduler as solve_symbreak_cbc
-from MIP.mip_model_opt_cbc import tournament_MIP_scheduler as solve_symbreak_opt_cbc
-from MIP.mip_base_model_highs import tournament_MIP_scheduler as solve_base_highs
-from MIP.mip_base_model_opt_highs import tournament_MIP_scheduler as solve_base_opt_highs
-from MIP.mip_model_highs import tournament_MIP_scheduler as solve_symbreak_highs
-from MIP.mip_model_opt_highs import tournament_MIP_scheduler as solve_symbreak_opt_highs
-from CP.basic_chuffed import tournament_CP_scheduler as basic_chuffed
-from CP.local_symbreak_chuffed import tournament_CP_scheduler as local_symbreak_chuffed
-from CP.global_symbreak_chuffed import tournament_CP_scheduler as global_symbreak_chuffed
-from CP.global_symbreak_opt_chuffed import tournament_CP_scheduler as global_symbreak_opt_chuffed
-from CP.basic_gecode import tournament_CP_scheduler as basic_gecode
-from CP.local_symbreak_gecode import tournament_CP_scheduler as local_symbreak_gecode
-from CP.global_symbreak_gecode import tournament_CP_scheduler as global_symbreak_gecode
-from CP.global_symbreak_opt_gecode import tournament_CP_scheduler as global_symbreak_opt_gecode
-from CP.local_noimplied_chuffed import tournament_CP_scheduler as local_noimplied_chuffed
-from CP.local_noimplied_gecode import tournament_CP_scheduler as local_noimplied_gecode
+from registry import SOLVERS, VALID_TEAMS, paradigms
+trace.record("import", import_start)
 
-
-# Associate each approach with its solver
-SOLVERS = {
-    "Z3_1": z3_1,
-    "Z3_1_symbreak": z3_1_symbreak,
-    "MINISAT22_1": minisat22_1,
-    "MINISAT22_1_symbreak": minisat22_1_symbreak,
-    "GLUCOSE3_1": glucose3_1,
-    "GLUCOSE3_1_symbreak": glucose3_1_symbreak,
-    "Z3_2": z3_2,
-    "Z3_2_symbreak": z3_2_symbreak,
-    "smt_Z3": z3,
-    "smt_Z3_symbreak": z3_symbreak,
-    "smt_Z3_optimize": z3_opt,
-    "smt_Z3_optimize_symbreak": z3_opt_symbreak,
-    "basic_gecode": basic_gecode,
-    "local_symbreak_gecode": local_symbreak_gecode,
-    "local_noimplied_gecode": local_noimplied_gecode,
-    "global_symbreak_gecode": global_symbreak_gecode,
-    "global_symbreak_opt_gecode": global_symbreak_opt_gecode,
-    "basic_chuffed": basic_chuffed,
-    "local_symbreak_chuffed": local_symbreak_chuffed,
-    "local_noimplied_chuffed": local_noimplied_chuffed,
-    "global_symbreak_chuffed": global_symbreak_chuffed,
-    "global_symbreak_opt_chuffed": global_symbreak_opt_chuffed,
-    "base_cbc": solve_base_cbc,
-    "base_opt_cbc": solve_base_opt_cbc,
-    "symbreak_cbc": solve_symbreak_cbc,
-    "symbreak_opt_cbc": solve_symbreak_opt_cbc,
-    "base_highs": solve_base_highs,
-    "base_opt_highs": solve_base_opt_highs,
-    "symbreak_highs": solve_symbreak_highs,
-    "symbreak_opt_highs": solve_symbreak_opt_highs,
-}
-
-# Associate each approach with increasing number of teams until it times out
-VALID_TEAMS = {
-    "Z3_1": {4, 6, 8},
-    "Z3_1_symbreak": {4, 6, 8},
-    "MINISAT22_1": {4, 6, 8, 10},
-    "MINISAT22_1_symbreak": {4, 6, 8, 10},
-    "GLUCOSE3_1": {4, 6, 8, 10},
-    "GLUCOSE3_1_symbreak": {4, 6, 8, 10},
-    "Z3_2": {4, 6, 8, 10, 12},
-    "Z3_2_symbreak": {4, 6, 8, 10, 12},
-    "smt_Z3":  {4, 6, 8, 10},
-    "smt_Z3_symbreak":  {4, 6, 8, 10},
-    "smt_Z3_optimize":  {4, 6, 8, 10},
-    "smt_Z3_optimize_symbreak":  {4, 6, 8, 10},
-    "basic_gecode": {4, 6, 8, 10, 12},
-    "local_symbreak_gecode": {4, 6, 8, 10, 12, 14},
-    "local_noimplied_gecode": {4, 6, 8, 10, 12, 14},
-    "global_symbreak_gecode": {4, 6, 8, 10, 12},
-    "global_symbreak_opt_gecode": {4, 6, 8, 10},
-    "basic_chuffed": {4, 6, 8, 10},
-    "local_symbreak_chuffed": {4, 6, 8, 10, 12, 14},
-    "local_noimplied_chuffed": {4, 6, 8, 10, 12, 14},
-    "global_symbreak_chuffed": {4, 6, 8, 10, 12, 14},
-    "global_symbreak_opt_chuffed": {4, 6, 8, 10, 12},
-    "base_cbc": {4, 6, 8, 10, 12},
-    "base_opt_cbc": {4, 6, 8, 10, 12},
-    "symbreak_cbc": {4, 6, 8, 10, 12},
-    "symbreak_opt_cbc": {4, 6, 8, 10, 12},
-    "base_highs": {4, 6, 8, 10, 12},
-    "base_opt_highs": {4, 6, 8, 10, 12},
-    "symbreak_highs": {4, 6, 8, 10, 12},
-    "symbreak_opt_highs": {4, 6, 8, 10, 12},
-}
-
-paradigms = {
-    "Z3_1": "SAT",
-    "Z3_1_symbreak": "SAT",
-    "MINISAT22_1": "SAT",
-    "MINISAT22_1_symbreak": "SAT",
-    "GLUCOSE3_1": "SAT",
-    "GLUCOSE3_1_symbreak": "SAT",
-    "Z3_2": "SAT",
-    "Z3_2_symbreak": "SAT",
-    "smt_Z3":  "SMT",
-    "smt_Z3_symbreak":  "SMT",
-    "smt_Z3_optimize":  "SMT",
-    "smt_Z3_optimize_symbreak": "SMT",
-    "basic_gecode": "CP",
-    "local_symbreak_gecode": "CP",
-    "local_noimplied_gecode": "CP",
-    "global_symbreak_gecode": "CP",
-    "global_symbreak_opt_gecode": "CP",
-    "basic_chuffed": "CP",
-    "local_symbreak_chuffed": "CP",
-    "local_noimplied_chuffed": "CP",
-    "global_symbreak_chuffed": "CP",
-    "global_symbreak_opt_chuffed": "CP",
-    "base_cbc": "MIP",
-    "base_opt_cbc": "MIP",
-    "symbreak_cbc": "MIP",
-    "symbreak_opt_cbc": "MIP",
-    "base_highs": "MIP",
-    "base_opt_highs": "MIP",
-    "symbreak_highs": "MIP",
-    "symbreak_opt_highs": "MIP",
-}
-
-def matrix_style_json(obj, indent=2):
-    """
-    Convert any nested dict/list structure to JSON string
-    where list-of-lists are kept in matrix-style format.
-    """
-    def serialize(obj, level=0):
-        spacing = ' ' * (level * indent)
-        
-        if isinstance(obj, dict):
-            items = []
-            for k, v in obj.items():
-                items.append(f'{spacing}"{k}": {serialize(v, level + 1)}')
-            return '{\n' + ',\n'.join(items) + f'\n{spacing}}}'
-        
-        elif isinstance(obj, list):
-            # Check if this is a list-of-lists (all elements are lists)
-            if all(isinstance(i, list) for i in obj) and obj:
-                # Keep each sublist on one line
-                inner_items = [json.dumps(sublist) for sublist in obj]
-                inner_spacing = ' ' * ((level + 1) * indent)
-                return '[\n' + inner_spacing + (',\n' + inner_spacing).join(inner_items) + f'\n{spacing}]'
-            else:
-                # For regular lists, use compact JSON
-                return json.dumps(obj)
-        
-        else:
-            # For primitives: int, float, bool, str
-            return json.dumps(obj)
-    
-    return serialize(obj)
-
-
-def save_results(solver, n, results):
+# With keep_existing, results already saved for the model and n are left in place (the run is only recorded in
+# the result store)
+def save_results(solver, n, results, keep_existing=False):
   paradigm = paradigms[solver]
   main_folder = Path(__file__).resolve().parent.parent #main folder is up two levels from this script
   res_dir = main_folder / "res" / paradigm.upper()
@@ -177,28 +26,126 @@ def save_results(solver, n, results):
   file_name = f"{n}.json"
   file_path = res_dir / file_name
 
-  if file_path.exists():
-    with open(file_path, "r") as f:
-      existent_file = json.load(f)
+  # the entry is streamed into the file (the other models' entries are copied, not parsed), with the schedule
+  # as a numpy array
+  sol = to_array(results["sol"]) if len(results["sol"]) > 0 else results["sol"]
+  if not update_result_file(file_path, solver, dict(results, sol=sol), replace=not keep_existing):
+    record_run(solver, paradigm, n, results, file_path)
+    print(f"Earlier results kept in {file_path}.")
+    return
+  if len(sol) > 0:
+    save_schedule(schedule_path(file_path, solver), sol)
   else:
-    existent_file = {}
-  
-  existent_file[solver] = results
-
-  with open(file_path, "w") as f:
-     #json.dump(existent_file, f, indent=2, separators=(",", ":"))
-     f.write(matrix_style_json(existent_file))
+    remove_schedule(schedule_path(file_path, solver))
+  same = record_run(solver, paradigm, n, results, file_path)
+  if same:
+    print(f"Same schedule as {', '.join(same)} (up to team, week and period permutations).")
   
   print(f"Results saved to {file_path}.")
 
+# Run one instance and save its results. With a predictor, an instance that timed out before keeps its results, one
+# certain to time out is skipped (saved as a predicted timeout), and the others run in a separate process killed at
+# the predicted budget when that is below the time limit (saved as budget exceeded if they do not finish, without
+# replacing earlier results of the same size; a crash of that process raises SolverCrash)
+def run_job(solver_key, num_teams, predictor=None):
+    trace.set_context(model=solver_key, n=num_teams)
+    budget = TIME_LIMIT
+    if predictor is not None:
+        action, budget, predicted = predictor.decide(solver_key, num_teams)
+        if action == "keep":
+            print("Skipped: timed out before, results kept")
+            return predictor.timeouts[(solver_key, num_teams)]
+        if action == "skip":
+            print("Skipped: predicted timeout" + (f" ({predicted:.1f}s)" if predicted is not None else ""))
+            results = predicted_timeout_result(predicted)
+            save_results(solver_key, num_teams, results)
+            return results
+    killed = False
+    with trace.span("run"):
+        if budget < TIME_LIMIT:
+            print(f"Budget {budget:.1f}s (predicted {predicted:.1f}s)")
+            results = run_isolated(SOLVERS[solver_key], num_teams, budget)
+            if results is None:
+                results = budget_exceeded_result(budget, predicted)
+                killed = True
+        else:
+            results = timed_run(SOLVERS[solver_key], num_teams)
+        trace.end_phases()
+    with trace.span("save"):
+        save_results(solver_key, num_teams, results, keep_existing=killed)
+    if predictor is not None:
+        predictor.observe(solver_key, num_teams, results)
+    return results
+
+def res_folder():
+    main_folder = Path(__file__).resolve().parent.parent #main folder is up two levels from this script
+    return main_folder / "res"
+
 # Solve all the instances together
-def run_all_solvers_all_teams():
-    for solver_key, solver_func in SOLVERS.items():
+def run_all_solvers_all_teams(predict=False):
+    predictor = RuntimePredictor(saved_results(res_folder())) if predict else None
+    for solver_key in SOLVERS:
         valid_teams = VALID_TEAMS.get(solver_key, set())
-        for num_teams in valid_teams:
+        for num_teams in sorted(valid_teams):
             print(f"\nRunning model '{solver_key}' with {num_teams} teams...")
-            results = solver_func(num_teams)
-            save_results(solver_key, num_teams, results)
+            try:
+                run_job(solver_key, num_teams, predictor)
+            except SolverCrash as crash:
+                print(f"Model '{solver_key}' with {num_teams} teams crashed: {crash}")
+    trace.write_chrome_trace()
+
+# Solve all the instances with a job ledger: completed jobs are skipped, failed ones are retried, and the pending
+# jobs run in order of expected time, so the short ones finish first
+def run_resumable(ledger_path, max_attempts=2, retry_timeouts=False, predict=False):
+    res_dir = res_folder()
+    ledger = JobLedger(ledger_path or res_dir / "ledger.json")
+    ledger.recover()
+    config = current_config()
+    jobs = [(solver_key, num_teams) for solver_key in SOLVERS for num_teams in sorted(VALID_TEAMS.get(solver_key, set()))]
+
+    # results saved by earlier sweeps (with or without the ledger)
+    saved = saved_results(res_dir)
+    for (solver_key, num_teams), results in saved.items():
+        key = job_key(solver_key, num_teams, config)
+        if (solver_key, num_teams) in jobs and ledger.get(key) is None:
+            ledger.import_saved(key, solver_key, num_teams, config, results)
+    ledger.save()
+    known_times = {job: results.get("wall_time", results.get("time")) for job, results in saved.items()}
+    predictor = RuntimePredictor(saved) if predict else None
+
+    while True:
+        pending = pending_jobs(jobs, ledger, config, known_times, max_attempts, retry_timeouts)
+        if not pending:
+            break
+        solver_key, num_teams = pending[0]
+        key = job_key(solver_key, num_teams, config)
+        print(f"\nRunning model '{solver_key}' with {num_teams} teams ({len(pending)} jobs left)...")
+        ledger.start(key, solver_key, num_teams, config)
+        try:
+            results = run_job(solver_key, num_teams, predictor)
+        except Exception:
+            traceback.print_exc()
+            ledger.fail(key, traceback.format_exc(limit=3))
+            continue
+        ledger.finish(key, results)
+        known_times[(solver_key, num_teams)] = results.get("wall_time", results["time"])
+    trace.write_chrome_trace()
+
+    failed = [job for job in ledger.jobs.values() if job["status"] == "failed"]
+    for job in failed:
+        print(f"Model '{job['model']}' with {job['n']} teams failed after {job['attempts']} attempts.")
 
 if __name__ == "__main__":
-    run_all_solvers_all_teams()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run all the instances.")
+    parser.add_argument("--resume", action="store_true", help="use the job ledger: skip completed jobs, retry failed ones")
+    parser.add_argument("--ledger", default=None, help="ledger file (default: res/ledger.json)")
+    parser.add_argument("--max-attempts", type=int, default=2, help="attempts per job before giving up")
+    parser.add_argument("--retry-timeouts", action="store_true", help="also retry the jobs that timed out")
+    parser.add_argument("--predict", action="store_true",
+                        help="skip instances predicted to time out and stop the others at a predicted budget")
+    args = parser.parse_args()
+
+    if args.resume:
+        run_resumable(args.ledger, args.max_attempts, args.retry_timeouts, args.predict)
+    else:
+        run_all_solvers_all_teams(args.predict)
\ No newline at end of file
@@ -0,0 +1,49 @@
+import sys
+import json
+from datetime import timedelta
+from pathlib import Path
+
+from utils.schedule import is_valid_schedule
+from CP.fzn_cache import solve_cached, cache_path, flatzinc_size
+
+# Benchmark of the channeled match-id CP models against the local_symbreak models they derive from.
+# For every n, each model is flattened (the cached FlatZinc is removed first, so the flattening is always timed)
+# and solved once; the size of the FlatZinc and the two times are reported.
+# It needs a MiniZinc install and has not been run yet: the channeled keys are left out of valid_teams.json until
+# their sizes are measured (python discover.py channeled_gecode channeled_chuffed).
+# Run: python -m benchmarks.cp_channeled [max n] [timeout] [output json]
+
+MODELS = [
+    ("local_symbreak_gecode.mzn", "gecode"),
+    ("channeled_gecode.mzn", "gecode"),
+    ("local_symbreak_chuffed.mzn", "chuffed"),
+    ("channeled_chuffed.mzn", "chuffed"),
+]
+
+def run_benchmark(ns, timeout=300):
+    rows = []
+    for n in ns:
+        for model_file, solver in MODELS:
+            model_path = (Path(__file__).resolve().parent.parent / "CP" / model_file)
+            cache_path(model_path, solver, n).unlink(missing_ok=True)
+            result = solve_cached(model_path, solver, n, timeout=timedelta(seconds=timeout))
+            variables, constraints = flatzinc_size(cache_path(model_path, solver, n))
+            solved = result.solution is not None
+            if solved:
+                sol = [[[int(result["tHome"][i][j]), int(result["tAway"][i][j])] for j in range(n-1)] for i in range(n//2)]
+                solved = is_valid_schedule(sol, n)
+            rows.append({"n": n, "model": model_file[:-4], "status": str(result.status), "valid": solved,
+                         "fzn_vars": variables, "fzn_constraints": constraints,
+                         "flatten_time": result.flatten_time, "solve_time": result.solve_time})
+            print(f"n={n:2d} {model_file[:-4]:28s} {str(result.status):20s} vars={variables:7d} "
+                  f"constraints={constraints:7d} flatten={result.flatten_time:8.3f}s solve={result.solve_time:8.3f}s")
+    return rows
+
+
+if __name__ == "__main__":
+    max_n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    timeout = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    rows = run_benchmark(range(6, max_n+1, 2), timeout)
+    if len(sys.argv) > 3:
+        with open(sys.argv[3], "w") as f:
+            json.dump(rows, f, indent=2)
@@ -0,0 +1,70 @@
+import sys
+import json
+import time
+import tempfile
+import multiprocessing as mp
+
+from registry import SOLVERS
+from utils import incumbent_bus
+from utils.timing import timed_run
+
+# Benchmark of the cross-paradigm incumbent bus: the optimization models are run one at a time without the bus,
+# then all at the same time (one process each) sharing a bus folder. For every run the time, objective and
+# optimality are reported; for the combined run, also the time at which each objective reached its best value on
+# the bus (the time to the best schedule of the combined run) and which model published it, and for each model
+# whether the schedule it returned was adopted from the bus ("from_bus": the model that published it).
+# The models compete for the cores in the combined run, so it needs at least as many cores as models.
+# Run: python -m benchmarks.incumbent_bus [n,n,...] [key,key,...] [output json]
+
+MODELS = ["global_symbreak_opt_gecode", "base_opt_highs_persistent", "smt_Z3_optimize_symbreak"]
+
+def _combined_worker(key, n, bus_dir, results):
+    incumbent_bus.BUS_DIR = bus_dir
+    results.put((key, timed_run(SOLVERS[key], n)))
+
+def run_alone(keys, n):
+    rows = []
+    for key in keys:
+        results = timed_run(SOLVERS[key], n)
+        rows.append({"n": n, "mode": "alone", "model": key, "time": results["wall_time"], "obj": results["obj"],
+                     "optimal": results["optimal"]})
+    return rows
+
+def run_combined(keys, n):
+    context = mp.get_context("fork")
+    results = context.Queue()
+    with tempfile.TemporaryDirectory() as bus_dir:
+        start = time.time()
+        processes = [context.Process(target=_combined_worker, args=(key, n, bus_dir, results)) for key in keys]
+        for process in processes:
+            process.start()
+        finished = dict(results.get() for _ in keys)
+        for process in processes:
+            process.join()
+        incumbent_bus.BUS_DIR = bus_dir
+        shared = incumbent_bus.entries(n)
+        incumbent_bus.BUS_DIR = None
+    rows = [{"n": n, "mode": "combined", "model": key, "time": finished[key]["wall_time"],
+             "obj": finished[key]["obj"], "optimal": finished[key]["optimal"],
+             "from_bus": finished[key].get("from_bus")} for key in keys]
+    for objective, entry in shared.items():
+        rows.append({"n": n, "mode": "combined", "model": f"bus:{objective}", "time": round(entry["time"]-start, 3),
+                     "obj": entry["obj"], "source": entry["source"]})
+    return rows
+
+def run_benchmark(ns, keys):
+    rows = []
+    for n in ns:
+        for row in run_alone(keys, n) + run_combined(keys, n):
+            rows.append(row)
+            print(", ".join(f"{k}={v}" for k, v in row.items()), flush=True)
+    return rows
+
+
+if __name__ == "__main__":
+    ns = [int(v) for v in sys.argv[1].split(",")] if len(sys.argv) > 1 else [6, 8, 10]
+    keys = sys.argv[2].split(",") if len(sys.argv) > 2 else MODELS
+    rows = run_benchmark(ns, keys)
+    if len(sys.argv) > 3:
+        with open(sys.argv[3], "w") as f:
+            json.dump(rows, f, indent=2)
@@ -0,0 +1,61 @@
+import sys
+import json
+import time
+
+from registry import SOLVERS, paradigms
+from utils import bounds
+from utils.timing import timed_run
+from MIP import bounds as mip_bounds
+from MIP.mip_model_opt_highs import build_model as build_symbreak_opt
+from MIP.mip_base_model_opt_highs import build_model as build_base_opt
+from MIP.mip_pairslot_model import build_model as build_pairslot
+
+# Benchmark of the objective lower bounds (utils/bounds.py). For every n:
+#  - the LP relaxation bound of the MIP optimization models, without and with the per-team bounds of MIP/bounds.py,
+#    next to the analytical bound
+#  - the time, objective and optimality of the _opt models, and whether their objective is the lower bound (the
+#    models stop as soon as they reach it)
+# Run: python -m benchmarks.lower_bounds [n,n,...] [key,key,...] [output json]
+
+MIP_MODELS = {"symbreak_opt": build_symbreak_opt, "base_opt": build_base_opt,
+              "pairslot_opt": lambda n: build_pairslot(n, optimize=True)}
+
+MODELS = ["symbreak_opt_highs", "pairslot_opt_highs", "symbreak_opt_highs_persistent", "global_symbreak_opt_gecode",
+          "smt_Z3_optimize_symbreak"]
+
+def lp_rows(n):
+    rows = []
+    for name, build_model in MIP_MODELS.items():
+        model = build_model(n)
+        start = time.perf_counter()
+        plain = mip_bounds.lp_bound(model)
+        mip_bounds.apply(model, n)
+        bounded = mip_bounds.lp_bound(model)
+        rows.append({"n": n, "model": name, "analytical": bounds.lower_bound(n), "lp": plain,
+                     "lp_with_bounds": bounded, "lp_time": round(time.perf_counter()-start, 3)})
+    return rows
+
+def model_rows(keys, n):
+    rows = []
+    for key in keys:
+        results = timed_run(SOLVERS[key], n)
+        rows.append({"n": n, "model": key, "time": results["wall_time"], "obj": results["obj"],
+                     "optimal": results["optimal"], "at_bound": bounds.reached(n, results["obj"], bounds.objective_of(paradigms[key]))})
+    return rows
+
+def run_benchmark(ns, keys):
+    rows = []
+    for n in ns:
+        for row in lp_rows(n) + model_rows(keys, n):
+            rows.append(row)
+            print(", ".join(f"{k}={v}" for k, v in row.items()), flush=True)
+    return rows
+
+
+if __name__ == "__main__":
+    ns = [int(v) for v in sys.argv[1].split(",")] if len(sys.argv) > 1 else [6, 8, 10]
+    keys = sys.argv[2].split(",") if len(sys.argv) > 2 else MODELS
+    rows = run_benchmark(ns, keys)
+    if len(sys.argv) > 3:
+        with open(sys.argv[3], "w") as f:
+            json.dump(rows, f, indent=2)
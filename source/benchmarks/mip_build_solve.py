@@ -0,0 +1,69 @@
+import sys
+import json
+import time
+import pyomo.environ as pyo
+
+from MIP.mip_base_model_opt_highs import build_model as build_base_opt
+from MIP.mip_model_opt_highs import build_model as build_symbreak_opt
+from MIP.persistent import PersistentHighs
+
+# Benchmark of model construction against solving for the HiGHS optimization models.
+# For every n the model is built, solved once and re-solved with an objective cut below the solution found,
+# both with SolverFactory('highs') (the whole model is written and loaded again on every solve) and with the
+# persistent interface (only the cut is sent to the loaded model).
+# Run: python -m benchmarks.mip_build_solve [max n] [time limit] [output json]
+
+MODELS = {"base_opt": build_base_opt, "symbreak_opt": build_symbreak_opt}
+
+def _legacy_solve(model, time_limit):
+  solver = pyo.SolverFactory('highs')
+  solver.options['threads'] = 1
+  solver.options['time_limit'] = time_limit
+  start = time.time()
+  result = solver.solve(model, load_solutions=False)
+  elapsed = time.time()-start
+  if len(result.solution) == 0:
+    return elapsed, None
+  model.solutions.load_from(result)
+  return elapsed, int(round(pyo.value(model.obj)))
+
+def _persistent_solve(persistent, time_limit):
+  start = time.time()
+  _, objective = persistent.solve(time_limit)
+  return time.time()-start, objective
+
+def run_benchmark(ns, time_limit=60):
+  rows = []
+  for n in ns:
+    for name, build_model in MODELS.items():
+      start = time.time()
+      model = build_model(n)
+      build_time = time.time()-start
+      row = {"n": n, "model": name, "build_time": round(build_time, 3)}
+
+      first, objective = _legacy_solve(model, time_limit)
+      row["legacy_solve"] = round(first, 3)
+      if objective is not None:
+        model.legacy_cut = pyo.Constraint(expr=model.obj.expr <= objective-2)
+        row["legacy_resolve"] = round(_legacy_solve(model, time_limit)[0], 3)
+        model.del_component(model.legacy_cut)
+
+      persistent = PersistentHighs(build_model(n))
+      first, objective = _persistent_solve(persistent, time_limit)
+      row["persistent_solve"] = round(first, 3)
+      if objective is not None:
+        persistent.tighten(objective-2)
+        row["persistent_resolve"] = round(_persistent_solve(persistent, time_limit)[0], 3)
+      row["obj"] = objective
+      rows.append(row)
+      print(", ".join(f"{k}={v}" for k, v in row.items()))
+  return rows
+
+
+if __name__ == "__main__":
+  max_n = int(sys.argv[1]) if len(sys.argv) > 1 else 14
+  time_limit = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+  rows = run_benchmark(range(4, max_n+1, 2), time_limit)
+  if len(sys.argv) > 3:
+    with open(sys.argv[3], "w") as f:
+      json.dump(rows, f, indent=2)
@@ -0,0 +1,54 @@
+import sys
+import json
+
+from utils.timing import timed_run
+from MIP.mip_model_opt_highs import build_model as build_symbreak_opt
+from MIP.mip_pairslot_model import build_model as build_pairslot
+from MIP.mip_model_highs import tournament_MIP_scheduler as symbreak_highs
+from MIP.mip_model_opt_highs import tournament_MIP_scheduler as symbreak_opt_highs
+from MIP.mip_model_cbc import tournament_MIP_scheduler as symbreak_cbc
+from MIP.mip_model_opt_cbc import tournament_MIP_scheduler as symbreak_opt_cbc
+from MIP.mip_pairslot_highs import tournament_MIP_scheduler as pairslot_highs
+from MIP.mip_pairslot_opt_highs import tournament_MIP_scheduler as pairslot_opt_highs
+from MIP.mip_pairslot_cbc import tournament_MIP_scheduler as pairslot_cbc
+from MIP.mip_pairslot_opt_cbc import tournament_MIP_scheduler as pairslot_opt_cbc
+
+# Benchmark of the pair-slot MIP formulation against the T1 x T2 x W x P one (symmetry breaking models):
+# model size and solving time of each pair of equivalent keys.
+# Run: python -m benchmarks.mip_pairslot [n,n,...] [highs,cbc] [output json]
+
+PAIRS = [
+  ("symbreak_highs", symbreak_highs, "pairslot_highs", pairslot_highs),
+  ("symbreak_opt_highs", symbreak_opt_highs, "pairslot_opt_highs", pairslot_opt_highs),
+  ("symbreak_cbc", symbreak_cbc, "pairslot_cbc", pairslot_cbc),
+  ("symbreak_opt_cbc", symbreak_opt_cbc, "pairslot_opt_cbc", pairslot_opt_cbc),
+]
+
+def model_size(model):
+  return model.nvariables(), model.nconstraints()
+
+def run_benchmark(ns, solvers=("highs", "cbc")):
+  rows = []
+  for n in ns:
+    old_vars, old_constraints = model_size(build_symbreak_opt(n))
+    new_vars, new_constraints = model_size(build_pairslot(n, optimize=True))
+    print(f"n={n}: variables {old_vars} -> {new_vars}, constraints {old_constraints} -> {new_constraints}")
+    for old_key, old_solver, new_key, new_solver in PAIRS:
+      if not any(old_key.endswith(s) for s in solvers):
+        continue
+      for key, solver in ((old_key, old_solver), (new_key, new_solver)):
+        results = timed_run(solver, n)
+        row = {"n": n, "model": key, "wall_time": results["wall_time"], "time": results["time"],
+               "optimal": results["optimal"], "obj": results["obj"]}
+        rows.append(row)
+        print(", ".join(f"{k}={v}" for k, v in row.items()))
+  return rows
+
+
+if __name__ == "__main__":
+  ns = [int(v) for v in sys.argv[1].split(",")] if len(sys.argv) > 1 else [12, 14]
+  solvers = sys.argv[2].split(",") if len(sys.argv) > 2 else ["highs", "cbc"]
+  rows = run_benchmark(ns, solvers)
+  if len(sys.argv) > 3:
+    with open(sys.argv[3], "w") as f:
+      json.dump(rows, f, indent=2)
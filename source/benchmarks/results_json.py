@@ -0,0 +1,110 @@
+import io
+import os
+import sys
+import json
+import time
+import random
+
+import numpy as np
+
+from utils.results_json import matrix_style_json, write_matrix_style_json, update_result_file
+
+# Benchmark of the result serializer on a large schedule (default n = 1000: 500 periods x 999 weeks), given as
+# nested lists (as the models return it) and as a numpy array, against the previous recursive implementation.
+# The outputs are checked to be identical.
+# Then the update of one entry of a result file holding `models` schedules of that size: loading and rewriting the
+# whole file (as save_results did) against update_result_file with the schedule as a numpy array.
+# Run: python -m benchmarks.results_json [n,n,...] [output json]
+
+
+# Implementation used by the runners before the shared serializer
+def recursive_matrix_style_json(obj, indent=2):
+    def serialize(obj, level=0):
+        spacing = ' ' * (level * indent)
+        if isinstance(obj, dict):
+            items = []
+            for k, v in obj.items():
+                items.append(f'{spacing}"{k}": {serialize(v, level + 1)}')
+            return '{\n' + ',\n'.join(items) + f'\n{spacing}}}'
+        elif isinstance(obj, list):
+            if all(isinstance(i, list) for i in obj) and obj:
+                inner_items = [json.dumps(sublist) for sublist in obj]
+                inner_spacing = ' ' * ((level + 1) * indent)
+                return '[\n' + inner_spacing + (',\n' + inner_spacing).join(inner_items) + f'\n{spacing}]'
+            else:
+                return json.dumps(obj)
+        else:
+            return json.dumps(obj)
+    return serialize(obj)
+
+# Random matrix of the right shape and values (not a valid schedule: only the size matters here)
+def random_schedule(n, seed=0):
+    rng = random.Random(seed)
+    return [[[rng.randint(1, n), rng.randint(1, n)] for _ in range(n-1)] for _ in range(n//2)]
+
+def best_time(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = function()
+        times.append(time.perf_counter()-start)
+    return min(times), output
+
+def run_benchmark(n, repeat=5, models=8):
+    sol = random_schedule(n)
+    results = {"model": {"time": 12, "optimal": True, "obj": n, "sol": sol, "wall_time": 12.345}}
+    array_results = {"model": dict(results["model"], sol=np.array(sol, dtype=np.uint16))}
+
+    def write(obj):
+        f = io.StringIO()
+        write_matrix_style_json(obj, f)
+        return f.getvalue()
+
+    reference_time, reference = best_time(lambda: recursive_matrix_style_json(results), repeat)
+    rows = [{"n": n, "serializer": "recursive", "time": round(reference_time, 4)}]
+    for name, function in (("shared", lambda: matrix_style_json(results)),
+                           ("shared, streamed", lambda: write(results)),
+                           ("shared, numpy array", lambda: write(array_results))):
+        elapsed, output = best_time(function, repeat)
+        assert output == reference, f"{name}: output differs"
+        rows.append({"n": n, "serializer": name, "time": round(elapsed, 4)})
+    rows += update_rows(n, results["model"], array_results["model"], repeat, models)
+    for row in rows:
+        print(f"n={row['n']}, {row['serializer']}: {1000*row['time']:.1f} ms")
+    return rows
+
+def update_rows(n, entry, array_entry, repeat, models, path="results_json_benchmark.json"):
+    saved = {f"model{i}": entry for i in range(models)}
+
+    def rewrite():
+        with open(path, "r") as f:
+            existent_file = json.load(f)
+        existent_file["model0"] = entry
+        with open(path, "w") as f:
+            write_matrix_style_json(existent_file, f)
+        with open(path, "r") as f:
+            return f.read()
+
+    def update():
+        update_result_file(path, "model0", array_entry)
+        with open(path, "r") as f:
+            return f.read()
+
+    with open(path, "w") as f:
+        write_matrix_style_json(saved, f)
+    try:
+        reference_time, reference = best_time(rewrite, repeat)
+        elapsed, output = best_time(update, repeat)
+    finally:
+        os.remove(path)
+    assert output == reference, "update_result_file: output differs"
+    return [{"n": n, "serializer": f"file update, load and rewrite ({models} models)", "time": round(reference_time, 4)},
+            {"n": n, "serializer": f"file update, update_result_file ({models} models)", "time": round(elapsed, 4)}]
+
+
+if __name__ == "__main__":
+    ns = [int(v) for v in sys.argv[1].split(",")] if len(sys.argv) > 1 else [1000]
+    rows = [row for n in ns for row in run_benchmark(n)]
+    if len(sys.argv) > 2:
+        with open(sys.argv[2], "w") as f:
+            json.dump(rows, f, indent=2)
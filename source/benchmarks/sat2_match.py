@@ -0,0 +1,58 @@
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+from utils import trace
+from SAT.SAT2_Z3 import tournament_SAT_scheduler as z3_2
+from SAT.SAT2_Z3_symbreak import tournament_SAT_scheduler as z3_2_symbreak
+from SAT.SAT2_Z3_match import tournament_SAT_scheduler as z3_2_match
+from SAT.SAT2_Z3_match_symbreak import tournament_SAT_scheduler as z3_2_match_symbreak
+
+# Benchmark of the SAT2 model with explicit match variables against the inline And(is_home, is_away) one.
+# Every run is traced in-process: the encode and solve phases give the times, and the counters give the number of
+# assertions and the size of the CNF Z3 builds from them (variables, binary and longer clauses).
+# Run: python -m benchmarks.sat2_match [n,n,...] [output json]
+
+PAIRS = [
+  ("Z3_2", z3_2, "Z3_2_match", z3_2_match),
+  ("Z3_2_symbreak", z3_2_symbreak, "Z3_2_match_symbreak", z3_2_match_symbreak),
+]
+
+def traced_run(key, solver, n, trace_dir):
+  trace_file = Path(trace_dir) / "trace.jsonl"
+  trace_file.unlink(missing_ok=True)
+  trace.set_context(model=key, n=n)
+  results = solver(n)
+  trace.end_phases()
+  row = {"n": n, "model": key, "optimal": results["optimal"]}
+  with open(trace_file, "r") as f:
+    for line in f:
+      event = json.loads(line)
+      if event["type"] == "span" and event["name"] in ("encode", "solve"):
+        row[f"{event['name']}_time"] = round(event["dur"]/1e6, 3)
+      elif event["type"] == "counter" and event["name"] in ("assertions", "sat_mk_var", "sat_mk_clause_2ary",
+                                                               "sat_mk_clause_nary"):
+        row[event["name"]] = event["value"]
+  return row
+
+def run_benchmark(ns):
+  rows = []
+  with tempfile.TemporaryDirectory() as trace_dir:
+    trace.TRACE_DIR = trace_dir
+    for n in ns:
+      for old_key, old_solver, new_key, new_solver in PAIRS:
+        for key, solver in ((old_key, old_solver), (new_key, new_solver)):
+          row = traced_run(key, solver, n, trace_dir)
+          rows.append(row)
+          print(", ".join(f"{k}={v}" for k, v in row.items()))
+    trace.TRACE_DIR = None
+  return rows
+
+
+if __name__ == "__main__":
+  ns = [int(v) for v in sys.argv[1].split(",")] if len(sys.argv) > 1 else [6, 8, 10]
+  rows = run_benchmark(ns)
+  if len(sys.argv) > 2:
+    with open(sys.argv[2], "w") as f:
+      json.dump(rows, f, indent=2)
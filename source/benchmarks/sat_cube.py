@@ -0,0 +1,44 @@
+import os
+import sys
+import json
+import time
+
+from SAT.SAT1_Glucose3_symbreak import tournament_SAT_scheduler as glucose3_1_symbreak
+from SAT.SAT1_cube import tournament_SAT_scheduler as glucose3_1_cube
+
+# Benchmark of the cube-and-conquer SAT1 model: wall-clock time for a growing number of worker processes, with the
+# speedup over one worker and over the sequential GLUCOSE3_1_symbreak model (same formula, no cubes).
+# Every worker loads the whole formula in its own solver, so the speedup is bounded by the loading time as well as
+# by the number of cores.
+# Run: python -m benchmarks.sat_cube [n,n,...] [workers,workers,...] [cube depth] [output json]
+
+def wall_time(solver, n, **kwargs):
+  start = time.perf_counter()
+  results = solver(n, **kwargs)
+  return round(time.perf_counter()-start, 3), results["optimal"]
+
+def run_benchmark(ns, cores, depth):
+  rows = []
+  for n in ns:
+    sequential, _ = wall_time(glucose3_1_symbreak, n)
+    one_worker = None
+    for workers in cores:
+      elapsed, optimal = wall_time(glucose3_1_cube, n, workers=workers, depth=depth)
+      one_worker = one_worker or elapsed
+      row = {"n": n, "workers": workers, "depth": depth, "optimal": optimal, "time": elapsed,
+             "speedup": round(one_worker/elapsed, 2), "sequential_time": sequential,
+             "speedup_vs_sequential": round(sequential/elapsed, 2)}
+      rows.append(row)
+      print(", ".join(f"{k}={v}" for k, v in row.items()), flush=True)
+  return rows
+
+
+if __name__ == "__main__":
+  ns = [int(v) for v in sys.argv[1].split(",")] if len(sys.argv) > 1 else [8, 10]
+  cores = [int(v) for v in sys.argv[2].split(",")] if len(sys.argv) > 2 else \
+    sorted({1, 2, 4, os.cpu_count()} & set(range(1, os.cpu_count()+1)))
+  depth = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+  rows = run_benchmark(ns, cores, depth)
+  if len(sys.argv) > 4:
+    with open(sys.argv[4], "w") as f:
+      json.dump(rows, f, indent=2)
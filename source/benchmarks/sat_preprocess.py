@@ -0,0 +1,48 @@
+import sys
+import json
+import time
+
+from SAT.SAT1_cnf import build_cnf
+from SAT.cnf import solve
+from SAT.preprocess import Preprocessed
+
+# Benchmark of the CNF preprocessing stage on the SAT1 pysat models: for every n, solver and symmetry breaking
+# setting, the raw formula and the preprocessed one are solved, and encode, preprocess and solve times are reported
+# separately with the clause counts, so the total with preprocessing can be compared with the raw one.
+# Run: python -m benchmarks.sat_preprocess [n,n,...] [timeout] [output json]
+
+SOLVERS = ["glucose3", "minisat22"]
+
+def run_instance(n, solver_name, symbreak, timeout):
+  start = time.perf_counter()
+  cnf, _ = build_cnf(n, symbreak)
+  encode_time = time.perf_counter()-start
+  status, _, raw_time, _ = solve(cnf, solver_name, timeout)
+  preprocessed = Preprocessed(cnf)
+  if preprocessed.status == False:
+    pre_status, pre_time = False, 0.0
+  else:
+    pre_status, _, pre_time, _ = solve(preprocessed.cnf, solver_name, timeout)
+  return {"n": n, "solver": solver_name, "symbreak": symbreak, "status": status, "encode_time": round(encode_time, 3),
+          "raw_solve_time": round(raw_time, 3), **preprocessed.stats, "preprocessed_status": pre_status,
+          "preprocessed_solve_time": round(pre_time, 3),
+          "preprocessed_total": round(preprocessed.time+pre_time, 3)}
+
+def run_benchmark(ns, timeout):
+  rows = []
+  for n in ns:
+    for symbreak in (False, True):
+      for solver_name in SOLVERS:
+        row = run_instance(n, solver_name, symbreak, timeout)
+        rows.append(row)
+        print(", ".join(f"{k}={v}" for k, v in row.items()), flush=True)
+  return rows
+
+
+if __name__ == "__main__":
+  ns = [int(v) for v in sys.argv[1].split(",")] if len(sys.argv) > 1 else [4, 6, 8]
+  timeout = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+  rows = run_benchmark(ns, timeout)
+  if len(sys.argv) > 3:
+    with open(sys.argv[3], "w") as f:
+      json.dump(rows, f, indent=2)
@@ -0,0 +1,72 @@
+import os
+import sys
+import json
+import argparse
+
+from registry import SOLVERS, VALID_TEAMS_FILE
+from utils.timing import run_isolated, TIME_LIMIT
+from utils.prediction import predict_runtime
+
+# Adaptive discovery of the numbers of teams each model can handle.
+# For a model key, n grows from min_n by 2; every size runs in a separate process group that is killed when the
+# budget expires. The search stops at the first size that does not finish (solved or proven unsat) within the
+# budget, or when the runtime predicted from the growth over the last sizes is certainly above the budget, so
+# that size is skipped instead of burning a whole budget. The frontier is written back to valid_teams.json,
+# which the registry loads.
+# Run: python discover.py [model keys | all] --budget 300 --min-n 4 [--max-n 40] [--dry-run]
+
+
+# A size is handled if the model solved it (or proved it unsat) within the budget
+def finished(results, budget):
+    return results is not None and results["optimal"] and results["wall_time"] < budget
+
+def discover(solver_key, budget=TIME_LIMIT, min_n=4, max_n=40, certainty=2.0):
+    frontier = []
+    times = []
+    for n in range(min_n, max_n+1, 2):
+        predicted = predict_runtime(list(zip(frontier, times)), n)
+        if predicted is not None and predicted > certainty*budget:
+            print(f"{solver_key}: n={n} skipped, predicted {predicted:.1f}s")
+            break
+        results = run_isolated(SOLVERS[solver_key], n, budget)
+        if not finished(results, budget):
+            print(f"{solver_key}: n={n} not finished within {budget}s")
+            break
+        print(f"{solver_key}: n={n} finished in {results['wall_time']}s")
+        frontier.append(n)
+        times.append(results["wall_time"])
+    return frontier
+
+# Write the frontier of a model into the data file, keeping the other models and the file layout
+def write_frontier(solver_key, frontier, path=VALID_TEAMS_FILE):
+    with open(path, "r") as f:
+        valid_teams = json.load(f)
+    valid_teams[solver_key] = sorted(frontier)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        f.write("{\n" + ",\n".join(f"  {json.dumps(k)}: {json.dumps(v)}" for k, v in valid_teams.items()) + "\n}\n")
+    os.replace(tmp_path, path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find the numbers of teams each model solves within the budget.")
+    parser.add_argument("models", nargs="+", help="model keys, or 'all'")
+    parser.add_argument("--budget", type=int, default=TIME_LIMIT, help="seconds per instance")
+    parser.add_argument("--min-n", type=int, default=4)
+    parser.add_argument("--max-n", type=int, default=40)
+    parser.add_argument("--dry-run", action="store_true", help="do not update valid_teams.json")
+    args = parser.parse_args()
+
+    keys = list(SOLVERS) if args.models == ["all"] else args.models
+    unknown = [key for key in keys if key not in SOLVERS]
+    if unknown:
+        print(f"Model(s) {', '.join(unknown)} not available. Choose between: {', '.join(SOLVERS)}")
+        sys.exit(1)
+
+    for key in keys:
+        frontier = discover(key, args.budget, args.min_n, args.max_n)
+        print(f"{key}: {frontier}")
+        if not frontier:
+            print(f"{key}: no size finished, valid_teams.json not updated (see --min-n)")
+        elif not args.dry_run:
+            write_frontier(key, frontier)
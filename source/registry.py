@@ -0,0 +1,211 @@
+import json
+from pathlib import Path
+
+# Import the needed solvers
+from SAT.SAT1_Z3 import tournament_SAT_scheduler as z3_1
+from SAT.SAT1_Z3_symbreak import tournament_SAT_scheduler as z3_1_symbreak
+from SAT.SAT1_Minisat22 import tournament_SAT_scheduler as minisat22_1
+from SAT.SAT1_Minisat22_symbreak import tournament_SAT_scheduler as minisat22_1_symbreak
+from SAT.SAT1_Glucose3 import tournament_SAT_scheduler as glucose3_1
+from SAT.SAT1_Glucose3_symbreak import tournament_SAT_scheduler as glucose3_1_symbreak
+from SAT.SAT2_Z3 import tournament_SAT_scheduler as z3_2
+from SAT.SAT2_Z3_symbreak import tournament_SAT_scheduler as z3_2_symbreak
+from SMT.SMT_Z3 import tournament_SMT_scheduler as z3
+from SMT.SMT_Z3_symbreak import tournament_SMT_scheduler as z3_symbreak
+from SMT.SMT_opt import tournament_SMT_scheduler as z3_opt
+from SMT.SMT_opt_symbreak import tournament_SMT_scheduler as z3_opt_symbreak
+from MIP.mip_base_model_cbc import tournament_MIP_scheduler as solve_base_cbc
+from MIP.mip_base_model_opt_cbc import tournament_MIP_scheduler as solve_base_opt_cbc
+from MIP.mip_model_cbc import tournament_MIP_scheduler as solve_symbreak_cbc
+from MIP.mip_model_opt_cbc import tournament_MIP_scheduler as solve_symbreak_opt_cbc
+from MIP.mip_base_model_highs import tournament_MIP_scheduler as solve_base_highs
+from MIP.mip_base_model_opt_highs import tournament_MIP_scheduler as solve_base_opt_highs
+from MIP.mip_model_highs import tournament_MIP_scheduler as solve_symbreak_highs
+from MIP.mip_model_opt_highs import tournament_MIP_scheduler as solve_symbreak_opt_highs
+from CP.basic_chuffed import tournament_CP_scheduler as basic_chuffed
+from CP.local_symbreak_chuffed import tournament_CP_scheduler as local_symbreak_chuffed
+from CP.global_symbreak_chuffed import tournament_CP_scheduler as global_symbreak_chuffed
+from CP.global_symbreak_opt_chuffed import tournament_CP_scheduler as global_symbreak_opt_chuffed
+from CP.local_noimplied_chuffed import tournament_CP_scheduler as local_noimplied_chuffed
+from CP.basic_gecode import tournament_CP_scheduler as basic_gecode
+from CP.local_symbreak_gecode import tournament_CP_scheduler as local_symbreak_gecode
+from CP.global_symbreak_gecode import tournament_CP_scheduler as global_symbreak_gecode
+from CP.global_symbreak_opt_gecode import tournament_CP_scheduler as global_symbreak_opt_gecode
+from CP.local_noimplied_gecode import tournament_CP_scheduler as local_noimplied_gecode
+from LNS.lns_gecode import tournament_LNS_scheduler as lns_gecode
+from LNS.lns_chuffed import tournament_LNS_scheduler as lns_chuffed
+from LNS.lns_highs import tournament_LNS_scheduler as lns_highs
+from CP.local_symbreak_balanced_gecode import tournament_CP_scheduler as local_symbreak_balanced_gecode
+from CP.local_symbreak_balanced_chuffed import tournament_CP_scheduler as local_symbreak_balanced_chuffed
+from MIP.mip_model_balanced_cbc import tournament_MIP_scheduler as solve_symbreak_balanced_cbc
+from MIP.mip_model_balanced_highs import tournament_MIP_scheduler as solve_symbreak_balanced_highs
+from SMT.SMT_Z3_balanced import tournament_SMT_scheduler as z3_balanced
+from LS.tabu_search import tournament_LS_scheduler as tabu_search
+from LS.tabu_search_balanced import tournament_LS_scheduler as tabu_search_balanced
+from CP.channeled_gecode import tournament_CP_scheduler as channeled_gecode
+from CP.channeled_chuffed import tournament_CP_scheduler as channeled_chuffed
+from CP.local_symbreak_gecode_parallel import tournament_CP_scheduler as local_symbreak_gecode_parallel
+from CP.global_symbreak_opt_gecode_parallel import tournament_CP_scheduler as global_symbreak_opt_gecode_parallel
+from CP.local_symbreak_chuffed_free import tournament_CP_scheduler as local_symbreak_chuffed_free
+from CP.global_symbreak_opt_chuffed_free import tournament_CP_scheduler as global_symbreak_opt_chuffed_free
+from MIP.mip_base_model_opt_highs_persistent import tournament_MIP_scheduler as solve_base_opt_highs_persistent
+from MIP.mip_model_opt_highs_persistent import tournament_MIP_scheduler as solve_symbreak_opt_highs_persistent
+from MIP.mip_pairslot_highs import tournament_MIP_scheduler as solve_pairslot_highs
+from MIP.mip_pairslot_cbc import tournament_MIP_scheduler as solve_pairslot_cbc
+from MIP.mip_pairslot_opt_highs import tournament_MIP_scheduler as solve_pairslot_opt_highs
+from MIP.mip_pairslot_opt_cbc import tournament_MIP_scheduler as solve_pairslot_opt_cbc
+from SAT.SAT2_Z3_match import tournament_SAT_scheduler as z3_2_match
+from SAT.SAT2_Z3_match_symbreak import tournament_SAT_scheduler as z3_2_match_symbreak
+from SAT.SAT1_Glucose3_autosym import tournament_SAT_scheduler as glucose3_1_autosym
+from SAT.SAT1_Minisat22_autosym import tournament_SAT_scheduler as minisat22_1_autosym
+from SAT.SAT1_Glucose3_preprocessed import tournament_SAT_scheduler as glucose3_1_preprocessed
+from SAT.SAT1_Glucose3_symbreak_preprocessed import tournament_SAT_scheduler as glucose3_1_symbreak_preprocessed
+from SAT.SAT1_Minisat22_preprocessed import tournament_SAT_scheduler as minisat22_1_preprocessed
+from SAT.SAT1_Minisat22_symbreak_preprocessed import tournament_SAT_scheduler as minisat22_1_symbreak_preprocessed
+from SAT.SAT1_cube import tournament_SAT_scheduler as glucose3_1_cube
+from CP.local_symbreak_gecode_eps import tournament_CP_scheduler as local_symbreak_gecode_eps
+from CP.global_symbreak_opt_gecode_eps import tournament_CP_scheduler as global_symbreak_opt_gecode_eps
+
+
+# Associate each approach with its solver
+SOLVERS = {
+    "Z3_1": z3_1,
+    "Z3_1_symbreak": z3_1_symbreak,
+    "MINISAT22_1": minisat22_1,
+    "MINISAT22_1_symbreak": minisat22_1_symbreak,
+    "GLUCOSE3_1": glucose3_1,
+    "GLUCOSE3_1_symbreak": glucose3_1_symbreak,
+    "Z3_2": z3_2,
+    "Z3_2_symbreak": z3_2_symbreak,
+    "smt_Z3": z3,
+    "smt_Z3_symbreak": z3_symbreak,
+    "smt_Z3_optimize": z3_opt,
+    "smt_Z3_optimize_symbreak": z3_opt_symbreak,
+    "basic_gecode": basic_gecode,
+    "local_symbreak_gecode": local_symbreak_gecode,
+    "local_noimplied_gecode": local_noimplied_gecode,
+    "global_symbreak_gecode": global_symbreak_gecode,
+    "global_symbreak_opt_gecode": global_symbreak_opt_gecode,
+    "basic_chuffed": basic_chuffed,
+    "local_symbreak_chuffed": local_symbreak_chuffed,
+    "local_noimplied_chuffed": local_noimplied_chuffed,
+    "global_symbreak_chuffed": global_symbreak_chuffed,
+    "global_symbreak_opt_chuffed": global_symbreak_opt_chuffed,
+    "base_cbc": solve_base_cbc,
+    "base_opt_cbc": solve_base_opt_cbc,
+    "symbreak_cbc": solve_symbreak_cbc,
+    "symbreak_opt_cbc": solve_symbreak_opt_cbc,
+    "base_highs": solve_base_highs,
+    "base_opt_highs": solve_base_opt_highs,
+    "symbreak_highs": solve_symbreak_highs,
+    "symbreak_opt_highs": solve_symbreak_opt_highs,
+    "lns_gecode": lns_gecode,
+    "lns_chuffed": lns_chuffed,
+    "lns_highs": lns_highs,
+    "local_symbreak_balanced_gecode": local_symbreak_balanced_gecode,
+    "local_symbreak_balanced_chuffed": local_symbreak_balanced_chuffed,
+    "symbreak_balanced_cbc": solve_symbreak_balanced_cbc,
+    "symbreak_balanced_highs": solve_symbreak_balanced_highs,
+    "smt_Z3_balanced": z3_balanced,
+    "tabu_search": tabu_search,
+    "tabu_search_balanced": tabu_search_balanced,
+    "channeled_gecode": channeled_gecode,
+    "channeled_chuffed": channeled_chuffed,
+    "local_symbreak_gecode_parallel": local_symbreak_gecode_parallel,
+    "global_symbreak_opt_gecode_parallel": global_symbreak_opt_gecode_parallel,
+    "local_symbreak_chuffed_free": local_symbreak_chuffed_free,
+    "global_symbreak_opt_chuffed_free": global_symbreak_opt_chuffed_free,
+    "base_opt_highs_persistent": solve_base_opt_highs_persistent,
+    "symbreak_opt_highs_persistent": solve_symbreak_opt_highs_persistent,
+    "pairslot_highs": solve_pairslot_highs,
+    "pairslot_cbc": solve_pairslot_cbc,
+    "pairslot_opt_highs": solve_pairslot_opt_highs,
+    "pairslot_opt_cbc": solve_pairslot_opt_cbc,
+    "Z3_2_match": z3_2_match,
+    "Z3_2_match_symbreak": z3_2_match_symbreak,
+    "GLUCOSE3_1_autosym": glucose3_1_autosym,
+    "MINISAT22_1_autosym": minisat22_1_autosym,
+    "GLUCOSE3_1_preprocessed": glucose3_1_preprocessed,
+    "GLUCOSE3_1_symbreak_preprocessed": glucose3_1_symbreak_preprocessed,
+    "MINISAT22_1_preprocessed": minisat22_1_preprocessed,
+    "MINISAT22_1_symbreak_preprocessed": minisat22_1_symbreak_preprocessed,
+    "GLUCOSE3_1_cube": glucose3_1_cube,
+    "local_symbreak_gecode_eps": local_symbreak_gecode_eps,
+    "global_symbreak_opt_gecode_eps": global_symbreak_opt_gecode_eps,
+}
+
+# Numbers of teams each model solves within the time limit, read from valid_teams.json.
+# The file is updated by discover.py, which finds the frontier of each model by increasing n.
+VALID_TEAMS_FILE = Path(__file__).resolve().parent / "valid_teams.json"
+
+def load_valid_teams(path=VALID_TEAMS_FILE):
+    with open(path, "r") as f:
+        return {key: set(values) for key, values in json.load(f).items()}
+
+VALID_TEAMS = load_valid_teams()
+
+paradigms = {
+    "Z3_1": "SAT",
+    "Z3_1_symbreak": "SAT",
+    "MINISAT22_1": "SAT",
+    "MINISAT22_1_symbreak": "SAT",
+    "GLUCOSE3_1": "SAT",
+    "GLUCOSE3_1_symbreak": "SAT",
+    "Z3_2": "SAT",
+    "Z3_2_symbreak": "SAT",
+    "smt_Z3":  "SMT",
+    "smt_Z3_symbreak":  "SMT",
+    "smt_Z3_optimize":  "SMT",
+    "smt_Z3_optimize_symbreak": "SMT",
+    "basic_gecode": "CP",
+    "local_symbreak_gecode": "CP",
+    "local_noimplied_gecode": "CP",
+    "global_symbreak_gecode": "CP",
+    "global_symbreak_opt_gecode": "CP",
+    "basic_chuffed": "CP",
+    "local_symbreak_chuffed": "CP",
+    "local_noimplied_chuffed": "CP",
+    "global_symbreak_chuffed": "CP",
+    "global_symbreak_opt_chuffed": "CP",
+    "base_cbc": "MIP",
+    "base_opt_cbc": "MIP",
+    "symbreak_cbc": "MIP",
+    "symbreak_opt_cbc": "MIP",
+    "base_highs": "MIP",
+    "base_opt_highs": "MIP",
+    "symbreak_highs": "MIP",
+    "symbreak_opt_highs": "MIP",
+    "lns_gecode": "LNS",
+    "lns_chuffed": "LNS",
+    "lns_highs": "LNS",
+    "local_symbreak_balanced_gecode": "CP",
+    "local_symbreak_balanced_chuffed": "CP",
+    "symbreak_balanced_cbc": "MIP",
+    "symbreak_balanced_highs": "MIP",
+    "smt_Z3_balanced": "SMT",
+    "tabu_search": "LS",
+    "tabu_search_balanced": "LS",
+    "channeled_gecode": "CP",
+    "channeled_chuffed": "CP",
+    "local_symbreak_gecode_parallel": "CP",
+    "global_symbreak_opt_gecode_parallel": "CP",
+    "local_symbreak_chuffed_free": "CP",
+    "global_symbreak_opt_chuffed_free": "CP",
+    "base_opt_highs_persistent": "MIP",
+    "symbreak_opt_highs_persistent": "MIP",
+    "pairslot_highs": "MIP",
+    "pairslot_cbc": "MIP",
+    "pairslot_opt_highs": "MIP",
+    "pairslot_opt_cbc": "MIP",
+    "Z3_2_match": "SAT",
+    "Z3_2_match_symbreak": "SAT",
+    "GLUCOSE3_1_autosym": "SAT",
+    "MINISAT22_1_autosym": "SAT",
+    "GLUCOSE3_1_preprocessed": "SAT",
+    "GLUCOSE3_1_symbreak_preprocessed": "SAT",
+    "MINISAT22_1_preprocessed": "SAT",
+    "MINISAT22_1_symbreak_preprocessed": "SAT",
+    "GLUCOSE3_1_cube": "SAT",
+    "local_symbreak_gecode_eps": "CP",
+    "global_symbreak_opt_gecode_eps": "CP",
+}
@@ -2,4 +2,4 @@
 
 set -e
 export PYTHONPATH=$(pwd)
-python3 all_instances.py
\ No newline at end of file
+python3 all_instances.py "$@"
\ No newline at end of file
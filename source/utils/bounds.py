@@ -0,0 +1,23 @@
+# Lower bounds of the fairness objectives, used by the _opt models to stop as soon as their incumbent is provably
+# optimal instead of spending the rest of the time limit on the proof.
+# Every team plays n-1 games, which is odd, so its home and away counts always differ:
+#  - "totDistance" (sum of |home - away|): every term is at least 1, so the objective is at least n
+#  - "home_spread" (max home - min home): the home counts cannot all be (n-1)/2, so the spread is at least 1
+# Both bounds are reached by every n (see utils/orientation.py), so they are also the optimal values. The LP
+# relaxation of the MIP models is 0 without the per-team bound |home - away| >= 1 and n with it (see MIP/bounds.py).
+
+ANALYTICAL = {"totDistance": lambda n: n, "home_spread": lambda n: 1}
+
+
+# Objective minimized by the optimization models of a paradigm: the SMT models minimize the spread of the home
+# games, the others the total distance
+def objective_of(paradigm):
+    return "home_spread" if paradigm.upper() == "SMT" else "totDistance"
+
+
+def lower_bound(n, objective="totDistance"):
+    return ANALYTICAL[objective](n)
+
+# True if an objective value proves the incumbent optimal
+def reached(n, value, objective="totDistance"):
+    return value is not None and value <= lower_bound(n, objective)
@@ -0,0 +1,240 @@
+import sys
+import json
+import hashlib
+from pathlib import Path
+
+from utils.schedule_npy import load_schedule, split_schedule_path
+
+# Canonical form of a schedule under the symmetries of the problem:
+#  - team relabeling (any permutation of 1..n)
+#  - week permutation (any reordering of the columns)
+#  - period permutation (any reordering of the rows)
+# Two "sol" matrices describe the same tournament if and only if their canonical forms are equal.
+#
+# The canonical form uses the same normalization as the symbreak models: one week is moved to the front and its
+# match in period i becomes (i, i+periods), which fixes the team labels; the remaining weeks are then sorted.
+# The minimum over all choices of first week and period order is the canonical form. Teams, periods and weeks
+# are first colored with relabeling-invariant signatures so that only choices among equally colored
+# weeks/periods have to be enumerated.
+# Run: python -m utils.canonical [result files or .npy schedules...] groups the saved schedules that are equal.
+
+
+# Compress a dict of (comparable) signatures into small integer colors, ordered by signature
+def _compress(signatures):
+    palette = {sig: c for c, sig in enumerate(sorted(set(signatures.values())))}
+    return {key: palette[sig] for key, sig in signatures.items()}
+
+# Compute invariant colors of teams, periods and weeks by iterated refinement
+def _colors(sol, rounds=2):
+    periods = len(sol)
+    weeks = len(sol[0])
+    teams = 2*periods
+
+    counts = [[0]*(teams+1) for _ in range(periods)]
+    home = [0]*(teams+1)
+    for p in range(periods):
+        for w in range(weeks):
+            h, a = sol[p][w]
+            counts[p][h] += 1
+            counts[p][a] += 1
+            home[h] += 1
+
+    team_color = _compress({t: (home[t], tuple(sorted(counts[p][t] for p in range(periods)))) for t in range(1, teams+1)})
+    period_color = _compress({p: tuple(sorted((counts[p][t], team_color[t]) for t in range(1, teams+1) if counts[p][t]))
+                              for p in range(periods)})
+    for _ in range(rounds):
+        # Each team is refined with the colors of its opponents, its side and the color of the period of each match
+        signatures = {t: [team_color[t]] for t in range(1, teams+1)}
+        for p in range(periods):
+            for w in range(weeks):
+                h, a = sol[p][w]
+                signatures[h].append((0, period_color[p], counts[p][h], team_color[a]))
+                signatures[a].append((1, period_color[p], counts[p][a], team_color[h]))
+        team_color = _compress({t: (sig[0], tuple(sorted(sig[1:]))) for t, sig in signatures.items()})
+        period_color = _compress({p: (period_color[p], tuple(sorted((team_color[sol[p][w][0]], team_color[sol[p][w][1]])
+                                                                    for w in range(weeks))))
+                                  for p in range(periods)})
+
+    week_color = _compress({w: tuple(sorted((period_color[p], team_color[sol[p][w][0]], team_color[sol[p][w][1]])
+                                            for p in range(periods)))
+                            for w in range(weeks)})
+    return team_color, period_color, week_color
+
+# Relabel and reorder the schedule given the first week and the period order
+def _normalize(sol, first_week, period_order):
+    periods = len(sol)
+    weeks = len(sol[0])
+    label = {}
+    for i, p in enumerate(period_order):
+        h, a = sol[p][first_week]
+        label[h] = i+1
+        label[a] = i+1+periods
+    columns = []
+    for w in range(weeks):
+        if w == first_week: continue
+        columns.append(tuple((label[sol[p][w][0]], label[sol[p][w][1]]) for p in period_order))
+    columns.sort()
+    first = tuple((i+1, i+1+periods) for i in range(periods))
+    return (first,) + tuple(columns)
+
+# Enumerate the period orders to try for a given first week.
+# The next period is always taken among the remaining ones with the smallest signature, where the signature
+# refines the period key with the labels already assigned to the teams of the ordered periods.
+def _period_orders(sol, first_week, period_key, order, remaining):
+    if not remaining:
+        yield order
+        return
+    position = {q: i for i, q in enumerate(order)}
+    label = {}
+    for i, q in enumerate(order):
+        h, a = sol[q][first_week]
+        label[h] = (i, 0)
+        label[a] = (i, 1)
+
+    def team_signature(t):
+        signature = []
+        for q in range(len(sol)):
+            for w, (h, a) in enumerate(sol[q]):
+                if h == t and a in label:
+                    signature.append((label[a], 0, position.get(q, -1)))
+                elif a == t and h in label:
+                    signature.append((label[h], 1, position.get(q, -1)))
+        return tuple(sorted(signature))
+
+    def signature(p):
+        h, a = sol[p][first_week]
+        row = tuple(sorted((label.get(x, (-1, -1)), label.get(y, (-1, -1)))
+                           for w, (x, y) in enumerate(sol[p]) if w != first_week))
+        return (period_key[p], team_signature(h), team_signature(a), row)
+
+    signatures = {p: signature(p) for p in remaining} if order else {p: period_key[p] for p in remaining}
+    smallest = min(signatures.values())
+    for p in remaining:
+        if signatures[p] == smallest:
+            yield from _period_orders(sol, first_week, period_key, order + [p], [q for q in remaining if q != p])
+
+# Compute the canonical form of a schedule, returned in the standard "sol" layout [period][week] -> [home, away]
+def canonical_form(sol):
+    if len(sol) == 0:
+        return []
+    key = canonical_key(sol)
+    periods = len(key[0])
+    return [[list(column[p]) for column in key] for p in range(periods)]
+
+# Compute the canonical form as a hashable tuple of weeks, each week being a tuple of (home, away) per period
+def canonical_key(sol):
+    if len(sol) == 0:
+        return ()
+    periods = len(sol)
+    team_color, period_color, week_color = _colors(sol)
+
+    # Only the weeks with the smallest color can be moved to the front
+    best_week_color = min(week_color.values())
+    best = None
+    for w0 in (w for w, c in week_color.items() if c == best_week_color):
+        # Periods are ordered by their color and the colors of the first week match; ties are branched on
+        period_key = {p: (period_color[p], team_color[sol[p][w0][0]], team_color[sol[p][w0][1]]) for p in range(periods)}
+        for order in _period_orders(sol, w0, period_key, [], sorted(range(periods))):
+            candidate = _normalize(sol, w0, order)
+            if best is None or candidate < best:
+                best = candidate
+    return best
+
+# Fast relabeling-invariant fingerprint: equal schedules always share it, different schedules rarely do
+def invariant_hash(sol):
+    if len(sol) == 0:
+        return hashlib.sha1(b"[]").hexdigest()
+    team_color, period_color, week_color = _colors(sol)
+    summary = (len(sol), sorted(team_color.values()), sorted(period_color.values()), sorted(week_color.values()))
+    return hashlib.sha1(repr(summary).encode()).hexdigest()
+
+# Hash of the canonical form: two schedules have the same hash if and only if they are equivalent
+def canonical_hash(sol):
+    return hashlib.sha1(repr(canonical_key(sol)).encode()).hexdigest()
+
+# Check whether two schedules are equal up to team, week and period permutations
+def equivalent(sol1, sol2):
+    if len(sol1) != len(sol2):
+        return False
+    if invariant_hash(sol1) != invariant_hash(sol2):
+        return False
+    return canonical_key(sol1) == canonical_key(sol2)
+
+
+# Set of schedules that keeps one representative per equivalence class.
+# The cheap invariant hash is computed first and the canonical form only when two schedules collide on it.
+class ScheduleSet:
+    def __init__(self):
+        self._buckets = {}
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, sol):
+        return self._find(sol, invariant_hash(sol)) is not None
+
+    def _find(self, sol, inv):
+        bucket = self._buckets.get(inv)
+        if not bucket:
+            return None
+        key = canonical_key(sol)
+        for entry in bucket:
+            if entry["key"] is None:
+                entry["key"] = canonical_key(entry["sol"])
+            if entry["key"] == key:
+                return entry
+        return None
+
+    # Add a schedule: returns True if it is new, False if an equivalent schedule was already stored
+    def add(self, sol, label=None):
+        inv = invariant_hash(sol)
+        entry = self._find(sol, inv)
+        if entry is not None:
+            entry["labels"].append(label)
+            return False
+        self._buckets.setdefault(inv, []).append({"sol": sol, "key": None, "labels": [label]})
+        self._size += 1
+        return True
+
+    # Equivalence classes as lists of labels, in insertion order
+    def classes(self):
+        return [entry["labels"] for bucket in self._buckets.values() for entry in bucket]
+
+
+# Keep only the first schedule of each equivalence class, preserving the input order
+def deduplicate(schedules):
+    seen = ScheduleSet()
+    return [sol for sol in schedules if len(sol) and seen.add(sol)]
+
+# Schedules of a result file, {model: sol}; a binary schedule file (utils/schedule_npy.py) is memory-mapped
+def _schedules(file_path):
+    file_path = Path(file_path)
+    if file_path.suffix == ".npy":
+        _, model = split_schedule_path(file_path)
+        return {model: load_schedule(file_path)}
+    with open(file_path, "r") as f:
+        return {model: result.get("sol") for model, result in json.load(f).items()}
+
+# Group the models of one or more result files by equivalent schedules
+def equivalence_classes(file_paths):
+    classes = {}
+    for file_path in file_paths:
+        for model, sol in _schedules(file_path).items():
+            if sol is None or len(sol) == 0:
+                continue
+            n = 2*len(sol)
+            classes.setdefault(n, ScheduleSet()).add(sol, label=f"{Path(file_path).parent.name}/{model}")
+    return {n: schedule_set.classes() for n, schedule_set in sorted(classes.items())}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] in ("-h", "--help"):
+        print("Use: python -m utils.canonical [result files or binary schedules (.npy)...]")
+        print("Groups the models whose schedules are equal up to team, week and period permutations.")
+        sys.exit(1)
+
+    for n, groups in equivalence_classes(sys.argv[1:]).items():
+        print(f"n={n}: {sum(len(g) for g in groups)} schedules, {len(groups)} distinct")
+        for group in groups:
+            print(f" - {', '.join(group)}")
@@ -0,0 +1,94 @@
+import os
+import json
+import fcntl
+import time
+from pathlib import Path
+
+from utils.schedule import is_valid_schedule, total_distance, home_spread
+from utils.timing import TIME_LIMIT
+
+# Incumbent sharing between the optimization models of different paradigms running at the same time on the same n
+# (e.g. a CP, a MIP and an SMT _opt model started in parallel by hand or by a sweep).
+# The bus is a folder set by the INCUMBENT_BUS environment variable, with one JSON file per n holding, for each
+# objective, the best schedule published so far. The schedule is the objective-independent part: every model
+# publishes its improving schedules, and every model reads the best value of its own objective, computed on any
+# published schedule, as a bound:
+#  - "totDistance" (sum of |home - away|): CP and MIP _opt models
+#  - "home_spread" (max home - min home): SMT _opt models
+# The objectives are invariant under the symmetries removed by the symbreak models (team relabeling, week and
+# period permutations), so a bound coming from any schedule is valid for every model.
+# Files are updated under an exclusive lock and replaced atomically, so readers never need the lock.
+# Entries are scoped to a run: the models started together share a session (INCUMBENT_BUS_SESSION, a sub-folder
+# of the bus), and an entry older than MAX_AGE (INCUMBENT_BUS_MAX_AGE seconds, by default twice the time limit, so
+# that any two runs that overlap in time see each other's entries) is ignored and replaced by the next publication.
+# better_bound also returns the model that published the schedule, so a model returning a schedule adopted from the
+# bus reports it as "from_bus" in its results.
+# When INCUMBENT_BUS is not set every call returns immediately.
+
+BUS_DIR = os.environ.get("INCUMBENT_BUS")
+SESSION = os.environ.get("INCUMBENT_BUS_SESSION")
+MAX_AGE = float(os.environ.get("INCUMBENT_BUS_MAX_AGE", 2*TIME_LIMIT))
+
+OBJECTIVES = {"totDistance": total_distance, "home_spread": home_spread}
+
+
+def enabled():
+    return BUS_DIR is not None
+
+def _folder():
+    return Path(BUS_DIR) / SESSION if SESSION else Path(BUS_DIR)
+
+def _path(n):
+    return _folder() / f"{n}.json"
+
+# Entries of n that have not expired
+def _read(n):
+    try:
+        with open(_path(n), "r") as f:
+            entries = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    now = time.time()
+    return {name: entry for name, entry in entries.items() if now-entry["time"] <= MAX_AGE}
+
+# Publish a schedule found by a model; returns the objectives it improved
+def publish(n, sol, source=None):
+    if not enabled() or not is_valid_schedule(sol, n):
+        return []
+    sol = [[[int(h), int(a)] for h, a in row] for row in sol]
+    _folder().mkdir(parents=True, exist_ok=True)
+    with open(_folder() / f"{n}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        entries = _read(n)
+        improved = []
+        for name, objective in OBJECTIVES.items():
+            value = objective(sol)
+            if name not in entries or value < entries[name]["obj"]:
+                entries[name] = {"obj": value, "sol": sol, "source": source, "time": time.time()}
+                improved.append(name)
+        if improved:
+            tmp_path = _path(n).with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, _path(n))
+    return improved
+
+# Entries published for n: {objective: {"obj", "sol", "source", "time"}}
+def entries(n):
+    return _read(n) if enabled() else {}
+
+# Best published (objective value, schedule) for an objective, None if nothing was published
+def best(n, objective):
+    if not enabled():
+        return None
+    entry = _read(n).get(objective)
+    return (entry["obj"], entry["sol"]) if entry else None
+
+# Best published (objective value, schedule, source) if it is better than value (None: no value yet), otherwise None
+def better_bound(n, objective, value=None):
+    if not enabled():
+        return None
+    entry = _read(n).get(objective)
+    if entry is None or (value is not None and entry["obj"] >= value):
+        return None
+    return entry["obj"], entry["sol"], entry["source"] or "unknown"
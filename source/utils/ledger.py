@@ -0,0 +1,117 @@
+import os
+import json
+import time
+from pathlib import Path
+
+from utils.timing import TIME_LIMIT
+
+# Job ledger of the resumable sweep: one entry per (model key, n, configuration) with its status
+# ("running", "done", "failed"), the number of attempts, a summary of the result or the error.
+# The ledger is rewritten atomically after every change, so a sweep that is killed at any point can be resumed:
+# done jobs are skipped, jobs left "running" by the interrupted sweep count as failed attempts, and failed jobs
+# are retried until they reach the maximum number of attempts.
+
+# Environment settings that change how a model runs (see CP/configured.py and SAT/SAT1_cube.py); part of the job key
+CONFIG_VARIABLES = ("CP_PROCESSES", "CP_RANDOM_SEED", "CP_OPTIMISATION_LEVEL", "SAT_CUBE_WORKERS")
+
+
+def current_config():
+    return {name: os.environ[name] for name in CONFIG_VARIABLES if os.environ.get(name)}
+
+def job_key(model, n, config):
+    return f"{model}|{n}|{json.dumps(config, sort_keys=True)}"
+
+# Results already saved in the res folder: {(model key, n): results}
+def saved_results(res_dir):
+    saved = {}
+    for file_path in Path(res_dir).glob("*/*.json"):
+        if not file_path.stem.isdigit():
+            continue
+        with open(file_path, "r") as f:
+            for model, results in json.load(f).items():
+                saved[(model, int(file_path.stem))] = results
+    return saved
+
+
+class JobLedger:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.jobs = {}
+        if self.path.exists():
+            with open(self.path, "r") as f:
+                self.jobs = json.load(f)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.jobs, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, key):
+        return self.jobs.get(key)
+
+    # Jobs still marked as running were interrupted with the previous sweep
+    def recover(self):
+        for job in self.jobs.values():
+            if job["status"] == "running":
+                job["status"] = "failed"
+                job["error"] = "interrupted"
+        self.save()
+
+    def start(self, key, model, n, config):
+        job = self.jobs.setdefault(key, {"model": model, "n": n, "config": config, "attempts": 0})
+        job.update(status="running", attempts=job["attempts"]+1, started=time.time())
+        self.save()
+
+    def finish(self, key, results):
+        summary = {k: results.get(k) for k in ("time", "optimal", "obj", "wall_time", "cpu_time")}
+        self.jobs[key].update(status="done", result=summary, finished=time.time())
+        self.jobs[key].pop("error", None)
+        self.save()
+
+    def fail(self, key, error):
+        self.jobs[key].update(status="failed", error=error, finished=time.time())
+        self.save()
+
+    # Mark as done a job whose results were saved before the ledger existed
+    def import_saved(self, key, model, n, config, results):
+        summary = {k: results.get(k) for k in ("time", "optimal", "obj", "wall_time", "cpu_time")}
+        self.jobs[key] = {"model": model, "n": n, "config": config, "attempts": 0, "status": "done", "result": summary}
+
+
+# Observed time of a result (wall-clock time when recorded, else the legacy time field)
+def _observed_time(results):
+    return results.get("wall_time", results.get("time", TIME_LIMIT))
+
+# Expected running time of a job: its own previous time if it already ran, otherwise an extrapolation from the
+# largest smaller instance of the same model (growth per 2 teams), capped at the time limit
+def expected_cost(model, n, known_times, growth=4.0):
+    if (model, n) in known_times:
+        return known_times[(model, n)]
+    smaller = [m for (key, m) in known_times if key == model and m < n]
+    if smaller:
+        m = max(smaller)
+        base = max(known_times[(model, m)], 0.1)
+        steps = (n-m)//2
+    else:
+        base = 0.1
+        steps = (n-4)//2
+    return min(base * growth**steps, TIME_LIMIT)
+
+# Jobs to run, cheapest first: not done, and failed fewer than max_attempts times. A run that timed out is done
+# unless retry_timeouts is set.
+def pending_jobs(jobs, ledger, config, known_times, max_attempts=2, retry_timeouts=False):
+    pending = []
+    for model, n in jobs:
+        job = ledger.get(job_key(model, n, config))
+        if job is not None:
+            if job["attempts"] >= max_attempts and job["status"] != "done":
+                continue
+            if job["status"] == "done":
+                timed_out = job.get("result") and not job["result"].get("optimal")
+                if not (retry_timeouts and timed_out and job["attempts"] < max_attempts):
+                    continue
+        pending.append((expected_cost(model, n, known_times), model, n))
+    pending.sort()
+    return [(model, n) for _, model, n in pending]
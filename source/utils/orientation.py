@@ -0,0 +1,68 @@
+import time
+
+from utils.schedule import total_distance
+from utils import trace
+
+# Optimal home/away orientation of a feasible schedule.
+# Re-orienting a match (swapping home and away in its slot) never breaks a constraint of the problem, so the
+# fairness objectives only depend on the orientation. In the complete graph K_n (n even) every team has odd degree
+# n-1: pairing the teams with dummy edges makes every degree even, and orienting the edges along an Eulerian
+# circuit gives in-degree = out-degree everywhere. Dropping the dummy edges leaves |home - away| = 1 for each team,
+# which is the lower bound because n-1 is odd. The whole procedure is linear in the number of matches, O(n^2).
+
+
+# Orient the edges of a multigraph with all degrees even along Eulerian circuits (iterative Hierholzer)
+def _euler_orientation(num_vertices, edges):
+    adjacency = [[] for _ in range(num_vertices+1)]
+    for e, (u, v) in enumerate(edges):
+        adjacency[u].append(e)
+        adjacency[v].append(e)
+    used = [False]*len(edges)
+    position = [0]*(num_vertices+1)
+    oriented = [None]*len(edges)
+
+    for root in range(1, num_vertices+1):
+        stack = [root]
+        while stack:
+            u = stack[-1]
+            # skip the edges already traversed from the other endpoint
+            while position[u] < len(adjacency[u]) and used[adjacency[u][position[u]]]:
+                position[u] += 1
+            if position[u] == len(adjacency[u]):
+                stack.pop()
+                continue
+            e = adjacency[u][position[u]]
+            used[e] = True
+            a, b = edges[e]
+            v = b if a == u else a
+            oriented[e] = (u, v)
+            stack.append(v)
+    return oriented
+
+# Re-orient the matches of a schedule so that every team has |home games - away games| = 1
+def balance_orientation(sol):
+    if not sol:
+        return sol
+    n = 2*len(sol)
+    slots = [(p, w) for p in range(len(sol)) for w in range(len(sol[p]))]
+    edges = [tuple(sol[p][w]) for p, w in slots]
+    # dummy perfect matching between the teams, all of which have odd degree
+    edges += [(t, t+1) for t in range(1, n+1, 2)]
+    oriented = _euler_orientation(n, edges)
+
+    balanced = [[None for _ in row] for row in sol]
+    for (p, w), (h, a) in zip(slots, oriented):
+        balanced[p][w] = [h, a]
+    return balanced
+
+# Post-process the result of a feasibility model into an optimal result for a fairness objective.
+# The balanced orientation reaches the lower bound of both objectives (n for the total distance, 1 for the
+# spread of home games), so any schedule found by the model becomes an optimal one.
+def balanced_result(results, objective=total_distance):
+    if not results["sol"]:
+        return results
+    start = time.time()
+    trace.phase("orientation")
+    sol = balance_orientation(results["sol"])
+    elapsed = int(time.time()-start)
+    return {"time": results["time"]+elapsed, "optimal": results["optimal"], "obj": objective(sol), "sol": sol}
@@ -0,0 +1,87 @@
+import math
+from collections import defaultdict
+
+from utils.timing import TIME_LIMIT
+
+# Runtime prediction for the sweep.
+# The running time of a model grows about exponentially with n, so log(time) is fitted as a line in n on the last
+# solved sizes of the model (from res/ and from the current sweep). Each job then gets a budget equal to the
+# predicted time times a margin plus a fixed slack (capped at the time limit), or is skipped as a "predicted
+# timeout" when the model already timed out without any schedule on a smaller size or the prediction is far above
+# the time limit (a timeout with a schedule, e.g. an optimization model that did not prove optimality, does not
+# rule out the larger sizes).
+# A size the model already solved is never skipped and always gets the full time limit; a size it already timed
+# out on keeps its saved results.
+
+# Times below this are measurement noise (the legacy "time" field is rounded down to whole seconds)
+MIN_TIME = 0.5
+
+
+# Least squares fit of log(time) = a + b*n on the last `window` points; None with fewer than two points
+def predict_runtime(points, n, window=3):
+    points = sorted(points)[-window:]
+    if len(points) < 2:
+        return None
+    xs = [m for m, _ in points]
+    ys = [math.log(max(t, MIN_TIME)) for _, t in points]
+    x_mean = sum(xs)/len(xs)
+    y_mean = sum(ys)/len(ys)
+    variance = sum((x-x_mean)**2 for x in xs)
+    # the running time is not expected to decrease with n
+    slope = max(sum((x-x_mean)*(y-y_mean) for x, y in zip(xs, ys))/variance, 0.0)
+    return math.exp(y_mean + slope*(n-x_mean))
+
+
+class RuntimePredictor:
+    def __init__(self, saved=None, margin=4.0, slack=30.0, certainty=2.0):
+        self.margin = margin
+        self.slack = slack
+        self.certainty = certainty
+        # model -> {n: (time, solved)}
+        self.observed = defaultdict(dict)
+        # (model, n) -> results of the real timeouts
+        self.timeouts = {}
+        # model -> sizes on which a real timeout found no schedule
+        self.unsolved = defaultdict(set)
+        for (model, n), results in (saved or {}).items():
+            self.observe(model, n, results)
+
+    def observe(self, model, n, results):
+        status = results.get("status")
+        if status == "predicted timeout":
+            return
+        if status == "budget exceeded":
+            # stopped by a budget shorter than the time limit: not a proof that it times out
+            self.observed[model].setdefault(n, (results["budget"], False))
+            return
+        solved = results["optimal"]
+        if not solved:
+            self.timeouts[(model, n)] = results
+            if len(results["sol"]) == 0:
+                self.unsolved[model].add(n)
+        self.observed[model][n] = (results.get("wall_time", results["time"]) if solved else TIME_LIMIT, solved)
+
+    # ("run", budget, predicted time), ("skip", None, predicted time) or ("keep", None, None)
+    def decide(self, model, n):
+        observed = self.observed[model]
+        if n in observed and observed[n][1]:
+            return "run", TIME_LIMIT, observed[n][0]
+        if (model, n) in self.timeouts:
+            return "keep", None, None
+        if any(m < n for m in self.unsolved[model]):
+            return "skip", None, None
+        predicted = predict_runtime([(m, t) for m, (t, solved) in observed.items() if solved and m < n], n)
+        if predicted is None:
+            return "run", TIME_LIMIT, None
+        if predicted > self.certainty*TIME_LIMIT:
+            return "skip", None, predicted
+        return "run", min(predicted*self.margin + self.slack, TIME_LIMIT), predicted
+
+
+def predicted_timeout_result(predicted):
+    return {"time": TIME_LIMIT, "optimal": False, "obj": None, "sol": [], "status": "predicted timeout",
+            "predicted_time": None if predicted is None else round(predicted, 3)}
+
+def budget_exceeded_result(budget, predicted):
+    return {"time": TIME_LIMIT, "optimal": False, "obj": None, "sol": [], "status": "budget exceeded",
+            "budget": round(budget, 3), "predicted_time": None if predicted is None else round(predicted, 3)}
@@ -0,0 +1,205 @@
+import sys
+import json
+import time
+import sqlite3
+import argparse
+from pathlib import Path
+
+from utils import schedule_npy
+from utils.canonical import canonical_hash
+from utils.bounds import objective_of
+from utils.ledger import current_config
+
+# Indexed store of the results, kept next to the res/<PARADIGM>/<n>.json files (res/results.sqlite).
+# save_results appends one row per run: model key, paradigm, n, timing, optimality, objective and status, plus a
+# pointer to the schedule (the JSON file and the model key in it), so the comparison queries never load or parse
+# the schedule matrices. The JSON files stay the reference output; results saved before the store existed are
+# loaded with "python -m utils.result_store import".
+# Every run with a schedule also records the canonical hash of the schedule (utils/canonical.py), equal for two
+# schedules if and only if they are the same up to team, week and period permutations: the "distinct" query
+# groups the models that found the same schedule, and record_run returns the models whose latest schedule for
+# that n is the same as the new one.
+# The objective column names what obj measures (utils/bounds.py: "totDistance" or "home_spread"), taken from the
+# "objective" entry of the result if any, else from the paradigm; runs without an objective value have none.
+# Objective values are only compared between runs with the same objective.
+# Queries: python -m utils.result_store best | timeouts | frontier | distinct | runs (best model per n and
+# objective, all the timeouts, largest n solved by each model, distinct schedules of every n, every run).
+
+MAIN_FOLDER = Path(__file__).resolve().parent.parent.parent
+DEFAULT_DB = MAIN_FOLDER / "res" / "results.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    model TEXT NOT NULL,
+    paradigm TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    time INTEGER NOT NULL,
+    optimal INTEGER NOT NULL,
+    obj INTEGER,
+    wall_time REAL,
+    cpu_time REAL,
+    status TEXT,
+    config TEXT,
+    recorded REAL NOT NULL,
+    sol_file TEXT NOT NULL,
+    sol_key TEXT NOT NULL,
+    canonical_hash TEXT,
+    objective TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_model_n ON runs (model, n);
+CREATE INDEX IF NOT EXISTS runs_n ON runs (n);
+-- last run of every (model, n), which is what the JSON files hold
+CREATE VIEW IF NOT EXISTS latest AS
+    SELECT * FROM runs WHERE run_id IN (SELECT MAX(run_id) FROM runs GROUP BY model, n);
+"""
+
+# Columns added after the first version of the store, added to existing stores when they are opened (and filled
+# for the runs already recorded where the store has what it takes: the objective follows from the paradigm)
+ADDED_COLUMNS = {"canonical_hash": "TEXT", "objective": "TEXT"}
+BACKFILL = {"objective": "UPDATE runs SET objective = objective_of(paradigm) WHERE obj IS NOT NULL"}
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS runs_n_hash ON runs (n, canonical_hash);
+"""
+
+QUERIES = {
+    # best model per n and objective (feasibility models have none): solved runs, lowest objective, then shortest
+    # time
+    "best": """
+        SELECT n, objective, model, paradigm, obj, time, wall_time FROM (
+            SELECT *, ROW_NUMBER() OVER (
+                PARTITION BY n, objective ORDER BY obj, COALESCE(wall_time, time), model) AS rank
+            FROM latest WHERE optimal = 1)
+        WHERE rank = 1 ORDER BY n, objective IS NOT NULL, objective""",
+    "timeouts": """
+        SELECT model, paradigm, n, obj, status FROM latest WHERE optimal = 0 ORDER BY model, n""",
+    # largest n each model solves
+    "frontier": """
+        SELECT model, paradigm, MAX(n) AS max_n, COUNT(*) AS solved FROM latest WHERE optimal = 1
+        GROUP BY model ORDER BY max_n DESC, model""",
+    # one row per distinct schedule of every n (up to team, week and period permutations) and the models finding it
+    "distinct": """
+        SELECT n, canonical_hash, COUNT(*) AS models, GROUP_CONCAT(model, ', ') AS same_schedule FROM (
+            SELECT n, canonical_hash, model FROM latest WHERE canonical_hash IS NOT NULL ORDER BY model)
+        GROUP BY n, canonical_hash ORDER BY n, models DESC, canonical_hash""",
+    "runs": """
+        SELECT run_id, model, paradigm, n, time, optimal, objective, obj, wall_time, cpu_time, status,
+               datetime(recorded, 'unixepoch') AS recorded
+        FROM runs ORDER BY run_id""",
+}
+
+
+def connect(db_path=DEFAULT_DB):
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(db_path)
+    connection.executescript(SCHEMA)
+    connection.create_function("objective_of", 1, objective_of, deterministic=True)
+    columns = {row[1] for row in connection.execute("PRAGMA table_info(runs)")}
+    for column, kind in ADDED_COLUMNS.items():
+        if column not in columns:
+            with connection:
+                connection.execute(f"ALTER TABLE runs ADD COLUMN {column} {kind}")
+                if column in BACKFILL:
+                    connection.execute(BACKFILL[column])
+    connection.executescript(INDEXES)
+    return connection
+
+# Schedule files are referenced relative to the main folder, so the store can be moved with the res/ tree
+def _relative(sol_file):
+    sol_file = Path(sol_file).resolve()
+    return sol_file.relative_to(MAIN_FOLDER) if sol_file.is_relative_to(MAIN_FOLDER) else sol_file
+
+def _row(model, paradigm, n, results, sol_file, config, recorded):
+    obj = results.get("obj")
+    obj = obj if isinstance(obj, int) else None
+    return (model, paradigm.upper(), n, int(results["time"]), int(bool(results["optimal"])), obj,
+            results.get("wall_time"), results.get("cpu_time"), results.get("status"),
+            json.dumps(config, sort_keys=True), recorded, str(_relative(sol_file)), model,
+            canonical_hash(results["sol"]) if len(results.get("sol", [])) > 0 else None,
+            None if obj is None else results.get("objective", objective_of(paradigm)))
+
+_INSERT = """INSERT INTO runs (model, paradigm, n, time, optimal, obj, wall_time, cpu_time, status, config, recorded,
+                               sol_file, sol_key, canonical_hash, objective)
+              VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+# Record a run saved by the runners to sol_file; returns the other models whose latest schedule for n is the same
+# (up to team, week and period permutations)
+def record_run(model, paradigm, n, results, sol_file, db_path=DEFAULT_DB):
+    row = _row(model, paradigm, n, results, sol_file, current_config(), time.time())
+    with connect(db_path) as connection:
+        connection.execute(_INSERT, row)
+        schedule_hash = row[13]
+        same = [] if schedule_hash is None else [other for (other,) in connection.execute(
+            "SELECT model FROM latest WHERE n = ? AND canonical_hash = ? AND model != ? ORDER BY model",
+            (n, schedule_hash, model))]
+    connection.close()
+    return same
+
+# Load the results of a res/ tree into the store (one run per model and n, dated by the file), except the model
+# and n pairs it already has
+def import_res(res_dir, db_path=DEFAULT_DB):
+    with connect(db_path) as connection:
+        known = set(connection.execute("SELECT DISTINCT model, n FROM runs").fetchall())
+    connection.close()
+    rows = []
+    for file_path in sorted(Path(res_dir).glob("*/*.json")):
+        if not file_path.stem.isdigit():
+            continue
+        with open(file_path, "r") as f:
+            for model, results in json.load(f).items():
+                if (model, int(file_path.stem)) in known:
+                    continue
+                rows.append(_row(model, file_path.parent.name, int(file_path.stem), results, file_path, {},
+                                 file_path.stat().st_mtime))
+    with connect(db_path) as connection:
+        connection.executemany(_INSERT, rows)
+    connection.close()
+    return len(rows)
+
+def query(name, db_path=DEFAULT_DB):
+    with connect(db_path) as connection:
+        cursor = connection.execute(QUERIES[name])
+        columns = [column[0] for column in cursor.description]
+        rows = cursor.fetchall()
+    connection.close()
+    return columns, rows
+
+# Schedule of a run, read from the file the row points to (memory-mapped from its binary schedule file if any)
+def load_schedule(run_id, db_path=DEFAULT_DB):
+    with connect(db_path) as connection:
+        sol_file, sol_key = connection.execute("SELECT sol_file, sol_key FROM runs WHERE run_id = ?",
+                                               (run_id,)).fetchone()
+    connection.close()
+    npy_path = schedule_npy.schedule_path(MAIN_FOLDER / sol_file, sol_key)
+    if npy_path.exists():
+        return schedule_npy.load_schedule(npy_path)
+    with open(MAIN_FOLDER / sol_file, "r") as f:
+        return json.load(f)[sol_key]["sol"]
+
+def print_table(columns, rows):
+    widths = [max([len(str(c))] + [len(str(row[i])) for row in rows]) for i, c in enumerate(columns)]
+    print("  ".join(str(c).ljust(w) for c, w in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(v).ljust(w) for v, w in zip(row, widths)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the result store.")
+    parser.add_argument("command", choices=list(QUERIES) + ["import"],
+                        help="a query (best: best model per n, timeouts, frontier, distinct: models finding the same "
+                             "schedule, runs) or import a res/ tree")
+    parser.add_argument("--db", default=DEFAULT_DB, help="store file (default: res/results.sqlite)")
+    parser.add_argument("--res", default=DEFAULT_DB.parent, help="res/ tree to import")
+    parser.add_argument("--json", action="store_true", help="print the rows as JSON")
+    args = parser.parse_args()
+
+    if args.command == "import":
+        print(f"{import_res(args.res, args.db)} runs imported into {args.db}.")
+        sys.exit(0)
+    columns, rows = query(args.command, args.db)
+    if args.json:
+        print(json.dumps([dict(zip(columns, row)) for row in rows], indent=2))
+    else:
+        print_table(columns, rows)
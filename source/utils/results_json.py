@@ -0,0 +1,161 @@
+import os
+import re
+import json
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Serializer of the result files: JSON where a list of lists is written one sublist per line (matrix style), so
+# the "sol" matrices stay readable, and everything else is indented like json.dump(indent=2) for dicts and written
+# compact for the other lists and the primitives.
+# The output is produced in chunks and written to the file object as it goes: the whole document is never built
+# as one string, and a schedule matrix costs one C-encoded json.dumps per row. A schedule given as an integer
+# numpy array of shape periods x weeks x 2 is rendered without going through Python objects at all.
+# update_result_file replaces or adds one entry of a result file without parsing the others: the top-level keys
+# of a file written in this format are the only lines starting with a quote, so the text of the other entries is
+# copied as it is and only the new entry is serialized.
+
+_encode = json.JSONEncoder().encode
+
+
+# Text of the rows of a non-negative integer array of shape (rows, columns, 2), as json.dumps would write
+# row.tolist(), separated by ",\n" + inner_spacing. Each number is first written right-aligned in a fixed width
+# padded with zero bytes, which are removed at the end. The values are team numbers, so the table of their texts
+# is small.
+def _render_pairs(array, inner_spacing):
+    rows, columns, _ = array.shape
+    width = len(str(int(array.max())))
+    block = 2*width + 6
+    lead = (inner_spacing + '[').encode()
+    row_length = len(lead) + columns*block + 2
+    buffer = np.zeros((rows, row_length), dtype=np.uint8)
+    buffer[:, :len(lead)] = np.frombuffer(lead, dtype=np.uint8)
+    blocks = buffer[:, len(lead):len(lead)+columns*block].reshape(rows, columns, block)
+
+    # "[h, a], " per pair
+    blocks[:, :, 0] = ord('[')
+    blocks[:, :, width+1] = ord(',')
+    blocks[:, :, width+2] = ord(' ')
+    blocks[:, :, 2*width+3] = ord(']')
+    blocks[:, :, 2*width+4] = ord(',')
+    blocks[:, :, 2*width+5] = ord(' ')
+    # text of every value up to the maximum, right-aligned
+    table = np.zeros((int(array.max())+1, width), dtype=np.uint8)
+    for value in range(len(table)):
+        text = str(value).encode()
+        table[value, width-len(text):] = np.frombuffer(text, dtype=np.uint8)
+    blocks[:, :, 1:width+1] = table[array[:, :, 0]]
+    blocks[:, :, width+3:2*width+3] = table[array[:, :, 1]]
+
+    # the last pair of a row closes it: "[h, a]]" then ",\n" before the next row
+    blocks[:, -1, 2*width+4] = ord(']')
+    blocks[:, -1, 2*width+5] = 0
+    buffer[:-1, -2] = ord(',')
+    buffer[:-1, -1] = ord('\n')
+    return buffer.tobytes().translate(None, b'\x00').decode('ascii')
+
+def _is_pair_array(obj):
+    return (np is not None and isinstance(obj, np.ndarray) and obj.ndim == 3 and obj.shape[2] == 2
+            and obj.size > 0 and np.issubdtype(obj.dtype, np.integer) and obj.min() >= 0)
+
+
+def _iter_serialize(obj, indent, level):
+    spacing = ' ' * (level * indent)
+
+    if np is not None and isinstance(obj, np.ndarray):
+        if _is_pair_array(obj):
+            yield '[\n' + _render_pairs(obj, ' ' * ((level + 1) * indent)) + f'\n{spacing}]'
+            return
+        obj = obj.tolist()
+
+    if isinstance(obj, dict):
+        yield '{\n'
+        first = True
+        for k, v in obj.items():
+            if not first:
+                yield ',\n'
+            first = False
+            yield f'{spacing}"{k}": '
+            yield from _iter_serialize(v, indent, level + 1)
+        yield f'\n{spacing}}}'
+
+    elif isinstance(obj, list) and obj and all(isinstance(i, list) for i in obj):
+        # list-of-lists: keep each sublist on one line
+        inner_spacing = ' ' * ((level + 1) * indent)
+        yield '[\n' + inner_spacing + _encode(obj[0])
+        separator = ',\n' + inner_spacing
+        for sublist in obj[1:]:
+            yield separator + _encode(sublist)
+        yield f'\n{spacing}]'
+
+    else:
+        # regular lists (compact JSON) and primitives: int, float, bool, str, None
+        yield _encode(obj)
+
+
+def write_matrix_style_json(obj, f, indent=2):
+    """
+    Write any nested dict/list structure to the file object f
+    as JSON where list-of-lists are kept in matrix-style format.
+    """
+    for chunk in _iter_serialize(obj, indent, 0):
+        f.write(chunk)
+
+# Top-level entries of a result file as (key, text of the value), or None if the text is not in this layout
+def _split_entries(text):
+    text = text.rstrip()
+    if not (text.startswith('{\n"') and text.endswith('\n}')):
+        return None
+    keys = list(re.finditer(r'^"((?:[^"\\\n]|\\.)*)": ', text, re.M))
+    entries = []
+    for key, next_key in zip(keys, keys[1:] + [None]):
+        end = next_key.start() - 2 if next_key else len(text) - 2
+        if next_key and text[end:end + 2] != ',\n':
+            return None
+        entries.append((json.loads(f'"{key.group(1)}"'), text[key.end():end]))
+    return entries
+
+def update_result_file(file_path, key, value, replace=True, indent=2):
+    """
+    Set the entry key of the JSON result file to value (appended if new), copying the other entries as they are.
+    With replace=False an existing entry is left in place. Returns True if the file was written.
+    """
+    entries = []
+    if os.path.exists(file_path):
+        with open(file_path, "r") as f:
+            text = f.read()
+        entries = _split_entries(text)
+        if entries is None:
+            # other layouts (e.g. json.dump): rewritten as a whole
+            entries = [(k, ''.join(_iter_serialize(v, indent, 1))) for k, v in json.loads(text).items()]
+    if not replace and any(k == key for k, _ in entries):
+        return False
+
+    temporary = f"{file_path}.tmp"
+    with open(temporary, "w") as f:
+        f.write('{\n')
+        written = False
+        for i, (k, text) in enumerate(entries):
+            f.write((',\n' if i else '') + f'"{k}": ')
+            if k == key:
+                for chunk in _iter_serialize(value, indent, 1):
+                    f.write(chunk)
+                written = True
+            else:
+                f.write(text)
+        if not written:
+            f.write((',\n' if entries else '') + f'"{key}": ')
+            for chunk in _iter_serialize(value, indent, 1):
+                f.write(chunk)
+        f.write('\n}')
+    os.replace(temporary, file_path)
+    return True
+
+def matrix_style_json(obj, indent=2):
+    """
+    Convert any nested dict/list structure to JSON string
+    where list-of-lists are kept in matrix-style format.
+    """
+    return ''.join(_iter_serialize(obj, indent, 0))
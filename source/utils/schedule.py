@@ -0,0 +1,60 @@
+# Helpers shared by the post-processing tools that work on the standard "sol" matrix:
+# sol[p][w] = [home, away] for period p and week w, teams numbered from 1 to n.
+# The matrix can be nested lists or a periods x weeks x 2 integer array (see utils/schedule_npy.py).
+
+
+# Number of home and away games of each team (index 0 unused)
+def home_away_counts(sol):
+    n = 2*len(sol)
+    home = [0]*(n+1)
+    away = [0]*(n+1)
+    for row in sol:
+        for h, a in row:
+            home[h] += 1
+            away[a] += 1
+    return home, away
+
+# Objective of the CP and MIP optimization models: sum over the teams of |home games - away games|
+def total_distance(sol):
+    home, away = home_away_counts(sol)
+    return sum(abs(home[t]-away[t]) for t in range(1, len(home)))
+
+# Objective of the SMT optimization models: maximum minus minimum number of home games
+def home_spread(sol):
+    home, _ = home_away_counts(sol)
+    return max(home[1:]) - min(home[1:])
+
+# Check every constraint of the problem on a schedule
+def is_valid_schedule(sol, n=None):
+    if len(sol) == 0:
+        return False
+    n = n or 2*len(sol)
+    periods = n//2
+    weeks = n-1
+    if len(sol) != periods or any(len(row) != weeks for row in sol):
+        return False
+
+    pairs = set()
+    for w in range(weeks):
+        week_teams = set()
+        for p in range(periods):
+            h, a = sol[p][w]
+            if h == a or not (1 <= h <= n and 1 <= a <= n):
+                return False
+            week_teams.update((h, a))
+            pairs.add((min(h, a), max(h, a)))
+        # each team plays once a week
+        if len(week_teams) != n:
+            return False
+    # each pair plays exactly once
+    if len(pairs) != n*(n-1)//2:
+        return False
+    # each team plays at most twice in the same period
+    for row in sol:
+        counts = {}
+        for h, a in row:
+            counts[h] = counts.get(h, 0) + 1
+            counts[a] = counts.get(a, 0) + 1
+        if max(counts.values()) > 2:
+            return False
+    return True
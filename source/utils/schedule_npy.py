@@ -0,0 +1,87 @@
+import sys
+import json
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# Binary format of the "sol" matrices: a uint16 array of shape periods x weeks x 2 (home, away), saved as a .npy
+# file next to the result file, res/<PARADIGM>/<n>.<model key>.npy. The .npy header records the dtype and the
+# shape, from which n = 2*periods follows, so the file needs no other metadata.
+# Loading memory-maps the file: nothing is parsed or copied, and the tools of utils/schedule.py and
+# utils/canonical.py accept the array as it is. The JSON files stay the reference output; the .npy files can be
+# regenerated from them at any time with "python -m utils.schedule_npy [res folder]".
+
+DTYPE = np.uint16
+
+
+def schedule_path(json_path, model):
+    json_path = Path(json_path)
+    return json_path.with_name(f"{json_path.stem}.{model}.npy")
+
+# Result file and model key of a binary schedule file
+def split_schedule_path(path):
+    path = Path(path)
+    stem, model = path.name[:-len(".npy")].split(".", 1)
+    return path.with_name(f"{stem}.json"), model
+
+def to_array(sol):
+    array = np.asarray(sol)
+    if array.ndim != 3 or array.shape[2] != 2:
+        raise ValueError(f"a schedule has shape periods x weeks x 2, got {array.shape}")
+    if array.size and (array.min() < 0 or array.max() > np.iinfo(DTYPE).max):
+        raise ValueError("team numbers out of the range of uint16")
+    return array.astype(DTYPE, copy=False)
+
+def save_schedule(path, sol):
+    np.save(path, to_array(sol))
+
+# Remove the schedule file of a result without a schedule, so that no stale schedule of an earlier run is left
+def remove_schedule(path):
+    Path(path).unlink(missing_ok=True)
+
+# Memory-mapped (read only) schedule; with mmap=False the array is read into memory
+def load_schedule(path, mmap=True):
+    return np.load(path, mmap_mode="r" if mmap else None)
+
+# Write the binary schedules of a result file (the files of the models without a schedule are removed)
+def convert_file(json_path):
+    with open(json_path, "r") as f:
+        results = json.load(f)
+    written = []
+    for model, result in results.items():
+        path = schedule_path(json_path, model)
+        if result.get("sol"):
+            save_schedule(path, result["sol"])
+            written.append(path)
+        else:
+            remove_schedule(path)
+    return written
+
+# Convert every result file of a res/ tree
+def convert_res(res_dir):
+    written = []
+    for json_path in sorted(Path(res_dir).glob("*/*.json")):
+        if json_path.stem.isdigit():
+            written.extend(convert_file(json_path))
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write the binary schedules of a res/ tree.")
+    parser.add_argument("res", nargs="?", default=Path(__file__).resolve().parent.parent.parent / "res")
+    parser.add_argument("--check", action="store_true", help="reload every written file and compare it to the JSON")
+    args = parser.parse_args()
+
+    written = convert_res(args.res)
+    json_size = sum(path.stat().st_size for path in Path(args.res).glob("*/*.json"))
+    npy_size = sum(path.stat().st_size for path in written)
+    print(f"{len(written)} schedules written ({npy_size} bytes, result files {json_size} bytes).")
+    if args.check:
+        for path in written:
+            json_path, model = split_schedule_path(path)
+            with open(json_path, "r") as f:
+                if load_schedule(path).tolist() != json.load(f)[model]["sol"]:
+                    print(f"{path} differs from {json_path}")
+                    sys.exit(1)
+        print("All the schedules match their result files.")
@@ -0,0 +1,106 @@
+import os
+import time
+import queue
+import signal
+import multiprocessing as mp
+
+# Timing of a model run, shared by the runners.
+# The legacy "time" field (integer seconds, as computed by each wrapper) is kept; the runner adds the wall-clock
+# time of the whole wrapper call measured with perf_counter and the CPU time of the process and of the solver
+# subprocesses it waited for (MiniZinc), and applies the time limit rule of the result format.
+# The wrappers report the solving time measured by the solver itself right after each solve call (report_solver_time)
+# and the runner adds the total of the run as solver_time, for the solvers that measure one: HiGHS and CBC through
+# pyomo, the z3 "time" statistic and the pysat timer.
+
+TIME_LIMIT = 300
+# Interval at which run_isolated checks that the solver process is still alive
+POLL_INTERVAL = 0.5
+
+
+# The solver process of run_isolated exited without returning results (crash, killed by the system, exception)
+class SolverCrash(RuntimeError):
+    pass
+
+_solver_times = []
+
+
+# CPU time of this process (all threads) and of its terminated child processes
+def cpu_time():
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+# A run is optimal only if it finished within the time limit: otherwise time is 300 and optimal is false
+def apply_time_limit(results):
+    results["time"] = int(results["time"])
+    if not results["optimal"] or results["time"] >= TIME_LIMIT:
+        results["time"] = TIME_LIMIT
+        results["optimal"] = False
+    return results
+
+# Solving time reported by the solver for one solve call (seconds, None if the solver reported none)
+def report_solver_time(seconds):
+    if seconds is not None:
+        _solver_times.append(float(seconds))
+
+# "time" statistic of a z3 Solver/Optimize
+def z3_time(statistics):
+    return statistics.get_key_value("time") if "time" in statistics.keys() else None
+
+# Solving time in a pyomo result: the HiGHS time of the pyomo.contrib.solver interface, else the wallclock time of
+# the solver section (CBC)
+def pyomo_time(result):
+    timing_info = getattr(result, "timing_info", None)
+    if isinstance(timing_info, dict) and timing_info.get("highs_time") is not None:
+        return timing_info["highs_time"]
+    wallclock_time = result.solver.wallclock_time
+    return wallclock_time if isinstance(wallclock_time, (int, float)) else None
+
+# Run a wrapper, record its wall-clock, CPU and solver time and apply the time limit rule
+def timed_run(solver, n):
+    _solver_times.clear()
+    wall_start = time.perf_counter()
+    cpu_start = cpu_time()
+    results = solver(n)
+    if results is None:
+        return None
+    results["wall_time"] = round(time.perf_counter()-wall_start, 3)
+    results["cpu_time"] = round(cpu_time()-cpu_start, 3)
+    if _solver_times:
+        results["solver_time"] = round(sum(_solver_times), 3)
+    return apply_time_limit(results)
+
+
+def _isolated_worker(solver, n, results_queue):
+    # own process group, so that the solver subprocesses (MiniZinc) are killed with the worker
+    os.setpgrp()
+    results_queue.put(timed_run(solver, n))
+
+# timed_run in a separate process group with a hard time limit; returns None if it did not return within the budget
+# and raises SolverCrash as soon as the process exits without results (the process is polled, so a crash does not
+# wait for the budget)
+def run_isolated(solver, n, budget):
+    context = mp.get_context("fork")
+    results_queue = context.Queue()
+    process = context.Process(target=_isolated_worker, args=(solver, n, results_queue))
+    process.start()
+    deadline = time.perf_counter() + budget
+    try:
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return None
+            exited = process.exitcode is not None
+            try:
+                # after an exit the results may still be in the pipe
+                return results_queue.get(timeout=POLL_INTERVAL if exited else min(POLL_INTERVAL, remaining))
+            except queue.Empty:
+                if exited:
+                    raise SolverCrash(f"the solver process exited with code {process.exitcode} without results")
+    finally:
+        process.join(1)
+        # the solver subprocesses are in the process group even when the process itself is gone
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        process.join()
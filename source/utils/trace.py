@@ -0,0 +1,123 @@
+import os
+import sys
+import json
+import time
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+# Run-level instrumentation: spans for the phases of a run (import, encode, flatten, solve, decode, save) and
+# counters (variables, clauses, constraints, conflicts, nodes, ... as exposed by each solver).
+# Tracing is enabled by the TRACE_DIR environment variable: every event is appended as one JSON line to
+# TRACE_DIR/trace.jsonl (safe with several processes, so a whole sweep goes in the same file), and the runners
+# convert it to TRACE_DIR/trace.chrome.json, which can be opened in chrome://tracing or Perfetto.
+# When TRACE_DIR is not set every call returns immediately.
+#
+# The wrappers mark their phases with one-line calls: phase("encode") ... phase("solve") ... phase("decode");
+# each call closes the previous phase, and the runner closes the last one when the wrapper returns.
+# python -m utils.trace [trace.jsonl] [output json] converts a trace by hand.
+
+TRACE_DIR = os.environ.get("TRACE_DIR")
+
+_context = {}
+_open_phase = threading.local()
+_lock = threading.Lock()
+
+
+def enabled():
+    return TRACE_DIR is not None
+
+# Attributes added to every following event (e.g. model key and number of teams)
+def set_context(**attrs):
+    _context.clear()
+    _context.update(attrs)
+
+def _emit(event):
+    event.update(pid=os.getpid(), tid=threading.get_ident())
+    event["args"] = {**_context, **event.get("args", {})}
+    line = json.dumps(event, default=str) + "\n"
+    with _lock:
+        Path(TRACE_DIR).mkdir(parents=True, exist_ok=True)
+        with open(Path(TRACE_DIR) / "trace.jsonl", "a") as f:
+            f.write(line)
+
+# Record a span that started at the perf_counter() value start and ends now
+def record(name, start, **attrs):
+    if not enabled():
+        return
+    duration = time.perf_counter()-start
+    end_us = time.time_ns()//1000
+    _emit({"type": "span", "name": name, "ts": end_us-int(duration*1e6), "dur": int(duration*1e6), "args": attrs})
+
+@contextmanager
+def span(name, **attrs):
+    if not enabled():
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, start, **attrs)
+
+# Close the current phase of this thread (if any) and open a new one
+def phase(name, **attrs):
+    if not enabled():
+        return
+    end_phases()
+    _open_phase.current = (name, time.perf_counter(), attrs)
+
+def end_phases():
+    if not enabled():
+        return
+    current = getattr(_open_phase, "current", None)
+    if current is not None:
+        _open_phase.current = None
+        name, start, attrs = current
+        record(name, start, **attrs)
+
+def count(name, value, **attrs):
+    if not enabled() or value is None:
+        return
+    _emit({"type": "counter", "name": name, "ts": time.time_ns()//1000, "value": value, "args": attrs})
+
+def counts(values, **attrs):
+    for name, value in values.items():
+        count(name, value, **attrs)
+
+
+# Search counters of a z3 Solver/Optimize statistics object, and the size of the CNF built by its SAT core
+def z3_counters(statistics):
+    names = ("conflicts", "decisions", "propagations", "restarts", "mk var", "mk clause 2ary", "mk clause nary")
+    return {key.replace(" ", "_"): statistics.get_key_value(key) for key in statistics.keys() if key.endswith(names)}
+
+
+# Convert the JSON lines trace to the Chrome trace event format
+def to_chrome_trace(jsonl_path, chrome_path):
+    events = []
+    with open(jsonl_path, "r") as f:
+        for line in f:
+            event = json.loads(line)
+            label = "/".join(str(event["args"][k]) for k in ("model", "n") if k in event["args"])
+            if event["type"] == "span":
+                events.append({"name": event["name"], "cat": label or "run", "ph": "X", "ts": event["ts"],
+                               "dur": event["dur"], "pid": event["pid"], "tid": event["tid"], "args": event["args"]})
+            else:
+                events.append({"name": f"{label} {event['name']}".strip(), "ph": "C", "ts": event["ts"],
+                               "pid": event["pid"], "tid": event["tid"], "args": {event["name"]: event["value"]}})
+    with open(chrome_path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+def write_chrome_trace():
+    if not enabled():
+        return
+    jsonl_path = Path(TRACE_DIR) / "trace.jsonl"
+    if jsonl_path.exists():
+        to_chrome_trace(jsonl_path, Path(TRACE_DIR) / "trace.chrome.json")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3 or sys.argv[1] in ("-h", "--help"):
+        print("Use: python -m utils.trace [trace.jsonl] [output chrome trace json]")
+        sys.exit(1)
+    to_chrome_trace(sys.argv[1], sys.argv[2])